@@ -1,9 +1,30 @@
-from pydantic_ai import Agent, RunContext
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
-from dataclasses import dataclass
-import re
-from IPython.display import Markdown
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import TYPE_CHECKING, Any, Callable, List, Dict, Optional
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache, partial
+from contextlib import nullcontext
+import asyncio
+import atexit
+import json
+import logging
+import time
+
+from cache import CachedResult, LLMCache, agent_cache_key, model_name
+from cascade import CascadeConfig, CascadeStats
+from checkpoint import CHECKPOINT_STAGES, CheckpointStore, checkpoint_key, text_hash
+from clause_index import ClauseIndex, ClauseIndexStats, IndexedVerdict
+from hedging import HedgeConfig, HedgeStats, hedge
+from instrumentation import ReviewMetrics, stage_timer
+from policy import SECTION_NOT_FOUND, get_policy_index
+from prescreen import PrescreenStats, get_policy_rules
+from report import aggregate_report
+from retrieval import ContextSavings, get_policy_retriever
+from segmentation import chunk_contract, normalize_text
+
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
+
+logger = logging.getLogger(__name__)
 
 # Define models for structured outputs
 class ClauseExtraction(BaseModel):
@@ -43,11 +64,36 @@ class ContractReviewDeps:
     extracted_clauses: Optional[List[ClauseExtraction]] = None
     policy_matches: Optional[List[PolicyMatch]] = None
     clause_suggestions: Optional[List[ClauseSuggestion]] = None
-
-# Create the agents with specific roles
-extractor_agent = Agent(
-    model='openai:gpt-4.1-mini',
-    system="""You are a legal document analysis specialist focusing on contract clause extraction.
+    # Optional semaphore shared across reviews to cap in-flight agent calls
+    limiter: Optional[asyncio.Semaphore] = None
+    # Optional persistent cache for agent outputs
+    cache: Optional[LLMCache] = None
+    # Attach only the top-k retrieved policy sections per clause instead of the full policy
+    policy_top_k: Optional[int] = None
+    context_savings: ContextSavings = field(default_factory=ContextSavings)
+    # Optional per-call timing, token usage and cost records
+    metrics: Optional[ReviewMetrics] = None
+    # Check policy on a small model first and escalate only uncertain clauses
+    cascade: Optional[CascadeConfig] = None
+    cascade_stats: CascadeStats = field(default_factory=CascadeStats)
+    # Resolve mechanically checkable clauses with policy rules before calling policy_agent
+    prescreen: bool = False
+    prescreen_stats: PrescreenStats = field(default_factory=PrescreenStats)
+    # Optional store of completed stage outputs, so a rerun resumes after the last completed stage
+    checkpoints: Optional[CheckpointStore] = None
+    resumed_stages: List[str] = field(default_factory=list)
+    # Also send calls slower than the usual latency to a secondary provider
+    hedge: Optional[HedgeConfig] = None
+    hedge_stats: HedgeStats = field(default_factory=HedgeStats)
+    # Reuse the verdicts of near-identical clauses reviewed before against the same policy
+    clause_index: Optional[ClauseIndex] = None
+    clause_index_stats: ClauseIndexStats = field(default_factory=ClauseIndexStats)
+    reused_verdicts: Dict[str, IndexedVerdict] = field(default_factory=dict)
+    # Model to run each agent on instead of its own, by agent name, e.g. on a pooled HTTP client
+    models: Dict[str, Any] = field(default_factory=dict)
+
+# System prompts of the agents with specific roles
+EXTRACTOR_SYSTEM_PROMPT = """You are a legal document analysis specialist focusing on contract clause extraction.
 Your job is to identify and extract key clauses from Non-Disclosure Agreements (NDAs).
 
 Extract clauses that are most legally significant, focusing on:
@@ -60,13 +106,9 @@ Extract clauses that are most legally significant, focusing on:
 - Remedies for breach
 - Personal data protection
 
-Be precise and thorough. Extract exact text and provide accurate section references.""",
-    output_type=List[ClauseExtraction]
-)
+Be precise and thorough. Extract exact text and provide accurate section references."""
 
-policy_agent = Agent(
-    model='openai:gpt-4.1',
-    system="""You are a legal compliance specialist focusing on NDA policy alignment.
+POLICY_SYSTEM_PROMPT = """You are a legal compliance specialist focusing on NDA policy alignment.
 Your job is to compare contract clauses against a company's NDA policy to identify compliance issues.
 
 For each clause, analyze:
@@ -75,13 +117,9 @@ For each clause, analyze:
 3. List specific issues or discrepancies
 4. Determine if the clause is ultimately compliant
 
-Be thorough in your analysis and focus on substantive legal issues.""",
-    output_type=List[PolicyMatch]
-)
+Be thorough in your analysis and focus on substantive legal issues."""
 
-suggestion_agent = Agent(
-    model='openai:gpt-4.1-mini',
-    system="""You are a legal drafting specialist focusing on contract improvement.
+SUGGESTION_SYSTEM_PROMPT = """You are a legal drafting specialist focusing on contract improvement.
 Your job is to suggest improved language for contract clauses that don't align with company policy.
 
 For each non-compliant clause:
@@ -89,82 +127,493 @@ For each non-compliant clause:
 2. Explain why this change is recommended
 3. Rate the importance of making this change (1-10)
 
-Write in clear, precise legal language. Focus on legally significant changes.""",
-    output_type=List[ClauseSuggestion]
-)
+Write in clear, precise legal language. Focus on legally significant changes."""
 
-# Main orchestrator agent with tools to call other agents
-orchestrator = Agent(
-    model='openai:gpt-4.1',
-    system="""You are a legal contract review coordinator overseeing the review of an NDA.
+ORCHESTRATOR_SYSTEM_PROMPT = """You are a legal contract review coordinator overseeing the review of an NDA.
 You will:
 1. Extract key clauses from the contract
 2. Analyze each clause against company policy
 3. Generate suggestions for improvement
 4. Produce a final comprehensive review
 
-Work systematically and ensure all important clauses are reviewed thoroughly.""",
-    output_type=FinalReview,
-    deps_type=ContractReviewDeps
-)
-
-# Define tools for the orchestrator
-@orchestrator.tool
-async def extract_clauses(ctx: RunContext[ContractReviewDeps]) -> List[ClauseExtraction]:
-    """Extract key clauses from the contract"""
-    result = extractor_agent.run_sync(
-        f"Extract the key clauses from this NDA contract:\n\n{ctx.deps.contract_text}"
+Work systematically and ensure all important clauses are reviewed thoroughly."""
+
+NARRATOR_SYSTEM_PROMPT = """You are a legal contract review coordinator summarizing a completed NDA review.
+You receive the extracted clauses, their policy analysis and the suggested improvements.
+Write the overall assessment a reviewer would give: a compliance score, the key strengths,
+the key issues and specific recommendations. Base it only on the analysis provided."""
+
+# System prompt of each agent by name, from which its cache keys are built
+SYSTEM_PROMPTS = {
+    "extractor_agent": EXTRACTOR_SYSTEM_PROMPT,
+    "policy_agent": POLICY_SYSTEM_PROMPT,
+    "suggestion_agent": SUGGESTION_SYSTEM_PROMPT,
+    "orchestrator": ORCHESTRATOR_SYSTEM_PROMPT,
+    "narrator": NARRATOR_SYSTEM_PROMPT,
+}
+
+# The agents are built on first use and resolve their models on their first
+# run, so importing this module needs neither API keys, pydantic-ai nor the
+# provider SDKs.
+@lru_cache(maxsize=None)
+def get_extractor_agent() -> "Agent":
+    """Return the clause extraction agent"""
+    from pydantic_ai import Agent
+
+    return Agent(
+        name="extractor_agent",
+        model='openai:gpt-4.1-mini',
+        system_prompt=EXTRACTOR_SYSTEM_PROMPT,
+        output_type=List[ClauseExtraction],
+        defer_model_check=True,
     )
-    ctx.deps.extracted_clauses = result.output
-    return result.output
 
-@orchestrator.tool
-async def analyze_policy_compliance(ctx: RunContext[ContractReviewDeps]) -> List[PolicyMatch]:
-    """Analyze how well each clause complies with company policy"""
-    if not ctx.deps.extracted_clauses:
-        raise ValueError("No clauses extracted yet. Run extract_clauses first.")
+@lru_cache(maxsize=None)
+def get_policy_agent() -> "Agent":
+    """Return the policy compliance agent"""
+    from pydantic_ai import Agent
+
+    return Agent(
+        name="policy_agent",
+        model='openai:gpt-4.1',
+        system_prompt=POLICY_SYSTEM_PROMPT,
+        output_type=List[PolicyMatch],
+        defer_model_check=True,
+    )
+
+@lru_cache(maxsize=None)
+def get_suggestion_agent() -> "Agent":
+    """Return the clause drafting agent"""
+    from pydantic_ai import Agent
+
+    return Agent(
+        name="suggestion_agent",
+        model='openai:gpt-4.1-mini',
+        system_prompt=SUGGESTION_SYSTEM_PROMPT,
+        output_type=List[ClauseSuggestion],
+        defer_model_check=True,
+    )
+
+@lru_cache(maxsize=None)
+def get_orchestrator() -> "Agent":
+    """Return the main orchestrator agent with tools to call the other agents"""
+    from pydantic_ai import Agent, RunContext
+
+    orchestrator = Agent(
+        name="orchestrator",
+        model='openai:gpt-4.1',
+        system_prompt=ORCHESTRATOR_SYSTEM_PROMPT,
+        output_type=FinalReview,
+        deps_type=ContractReviewDeps,
+        defer_model_check=True,
+    )
+
+    @orchestrator.tool
+    async def extract_clauses(ctx: RunContext[ContractReviewDeps]) -> List[ClauseExtraction]:
+        """Extract key clauses from the contract"""
+        return await run_extraction_stage(ctx.deps)
+
+    @orchestrator.tool
+    async def analyze_policy_compliance(ctx: RunContext[ContractReviewDeps]) -> List[PolicyMatch]:
+        """Analyze how well each clause complies with company policy"""
+        return await run_policy_stage(ctx.deps)
+
+    @orchestrator.tool
+    async def generate_suggestions(ctx: RunContext[ContractReviewDeps]) -> List[ClauseSuggestion]:
+        """Generate suggestions for improving non-compliant clauses"""
+        return await run_suggestion_stage(ctx.deps)
+
+    return orchestrator
+
+@lru_cache(maxsize=None)
+def get_narrator() -> "Agent":
+    """Return the agent writing the optional narrative review, without tools or deps"""
+    from pydantic_ai import Agent
+
+    return Agent(
+        name="narrator",
+        model='openai:gpt-4.1',
+        system_prompt=NARRATOR_SYSTEM_PROMPT,
+        output_type=FinalReview,
+        defer_model_check=True,
+    )
+
+_AGENT_GETTERS = {
+    "extractor_agent": get_extractor_agent,
+    "policy_agent": get_policy_agent,
+    "suggestion_agent": get_suggestion_agent,
+    "orchestrator": get_orchestrator,
+    "narrator": get_narrator,
+}
+
+def __getattr__(name):
+    # Keep `agents.policy_agent` and friends working, building the agent on first access
+    if name in _AGENT_GETTERS:
+        return _AGENT_GETTERS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Pipeline stages shared by the orchestrator tools and review_contract_with_agents.
+# Each stage awaits its agent and stores the output on the deps.
+async def run_agent(agent: "Agent", prompt: str, deps: ContractReviewDeps, stage: str, **kwargs):
+    """Run an agent call for a pipeline stage, configured by the review deps
+    
+    The stage agents have no tools, so the deps are not passed to the agent.
+    
+    Runs the agent on its model in deps.models unless `model` is given,
+    serves the output from deps.cache when possible, holds the deps' shared
+    limiter (if one is set) for the duration of the call, hedges the call
+    on deps.hedge's secondary model (if set), and records the call in
+    deps.metrics (if set).
+    """
+    queued_at = time.perf_counter()
+    if kwargs.get("model") is None and agent.name in deps.models:
+        kwargs["model"] = deps.models[agent.name]
+    model = kwargs.get("model")
+    key = None
+    if deps.cache is not None:
+        key = agent_cache_key(agent, SYSTEM_PROMPTS[agent.name], prompt, model)
+        # The cache blocks on SQLite, so keep it off the event loop
+        output = await asyncio.to_thread(deps.cache.get_output, key, agent.output_type)
+        if output is not None:
+            result = CachedResult(output)
+            if deps.metrics is not None:
+                deps.metrics.record_run(stage, agent, result, wall_time=time.perf_counter() - queued_at, model=model)
+            return result
+    
+    async with deps.limiter or nullcontext():
+        started_at = time.perf_counter()
+        if deps.hedge is None:
+            result = await agent.run(prompt, **kwargs)
+        else:
+            # A hedged call holds one limiter slot for both providers
+            result, secondary_won = await hedge(
+                lambda: agent.run(prompt, **kwargs),
+                lambda: agent.run(prompt, **{**kwargs, "model": deps.hedge.secondary_model}),
+                deps.hedge, f"{stage}:{model_name(model or agent.model)}", deps.hedge_stats,
+            )
+            if secondary_won:
+                model = deps.hedge.secondary_model
+    
+    if deps.metrics is not None:
+        deps.metrics.record_run(
+            stage, agent, result,
+            wall_time=time.perf_counter() - started_at,
+            queue_time=started_at - queued_at,
+            model=model,
+        )
+    if key is not None:
+        await asyncio.to_thread(deps.cache.set_output, key, result.output, agent.output_type)
+    return result
+
+def merge_clauses(chunk_clauses: List[List[ClauseExtraction]], kept: List[ClauseExtraction] = ()) -> List[ClauseExtraction]:
+    """Merge clauses extracted from separate chunks into one list
+    
+    Clauses with the same text are deduplicated, keeping the higher
+    importance. Distinct clauses that share a name get their section
+    reference appended, since later stages match clauses by name.
+    Clauses in `kept` (e.g. reused from an earlier review) are left out of
+    the result but take precedence: new clauses with their text are
+    dropped and new clauses with their names are renamed.
+    """
+    merged: List[ClauseExtraction] = []
+    by_text: Dict[str, int] = {}
+    kept_texts = {normalize_text(clause.clause_text) for clause in kept}
+    for clauses in chunk_clauses:
+        for clause in clauses:
+            key = normalize_text(clause.clause_text)
+            if key in kept_texts:
+                continue
+            if key in by_text:
+                index = by_text[key]
+                if clause.importance > merged[index].importance:
+                    merged[index] = merged[index].model_copy(update={"importance": clause.importance})
+                continue
+            by_text[key] = len(merged)
+            merged.append(clause)
+    
+    names = {clause.clause_name for clause in kept}
+    for i, clause in enumerate(merged):
+        if clause.clause_name in names:
+            merged[i] = clause.model_copy(
+                update={"clause_name": f"{clause.clause_name} (Section {clause.section_reference})"}
+            )
+        names.add(merged[i].clause_name)
+    return merged
+
+async def run_extraction_stage(
+    deps: ContractReviewDeps,
+    chunk_size: Optional[int] = None,
+    max_concurrency: int = 8,
+) -> List[ClauseExtraction]:
+    """Extract key clauses from the contract
+    
+    Args:
+        deps: The shared review state
+        chunk_size: If set, split contracts longer than this many characters
+            into section-aligned chunks and extract from them concurrently
+        max_concurrency: Maximum number of concurrent chunk extraction calls
+    """
+    chunks = chunk_contract(deps.contract_text, chunk_size) if chunk_size else [deps.contract_text]
+    
+    if len(chunks) == 1:
+        result = await run_agent(
+            get_extractor_agent(),
+            f"Extract the key clauses from this NDA contract:\n\n{deps.contract_text}",
+            deps,
+            stage="extract",
+        )
+        deps.extracted_clauses = result.output
+        return result.output
+    
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def extract_chunk(index: int, chunk: str) -> List[ClauseExtraction]:
+        async with semaphore:
+            result = await run_agent(
+                get_extractor_agent(),
+                f"Extract the key clauses from this excerpt (part {index} of {len(chunks)}) of an NDA contract. "
+                f"Use the section numbers shown in the excerpt as section references:\n\n{chunk}",
+                deps,
+                stage="extract",
+            )
+        return result.output
+    
+    results = await asyncio.gather(*(extract_chunk(i, chunk) for i, chunk in enumerate(chunks, 1)))
+    extracted_clauses = merge_clauses(results)
     
-    clauses_text = "\n\n".join([
+    deps.extracted_clauses = extracted_clauses
+    return extracted_clauses
+
+def format_clauses(clauses: List[ClauseExtraction]) -> str:
+    """Format extracted clauses for inclusion in a prompt"""
+    return "\n\n".join([
         f"Clause: {c.clause_name}\nReference: {c.section_reference}\nText: {c.clause_text}"
-        for c in ctx.deps.extracted_clauses
+        for c in clauses
     ])
+
+def build_policy_prompt(clauses: List[ClauseExtraction], policy_text: str) -> str:
+    """Build the policy_agent prompt for a batch of clauses
     
-    result = policy_agent.run_sync(
-        f"""Analyze these contract clauses against our company policy:
+    The policy comes first so that, after the system prompt, every call
+    against the same policy shares a byte-identical prefix that providers
+    can serve from their prompt cache.
+    """
+    return f"""Company NDA Policy:
+{policy_text}
 
-Contract Clauses:
-{clauses_text}
+Analyze these contract clauses against the company policy above:
 
-Company NDA Policy:
-{ctx.deps.policy_text}"""
+Contract Clauses:
+{format_clauses(clauses)}"""
+
+def clause_query(clause: ClauseExtraction) -> str:
+    """Retrieval query for the policy sections relevant to a clause"""
+    return f"{clause.clause_name} {clause.clause_text}"
+
+def select_policy_context(deps: ContractReviewDeps, clauses: List[ClauseExtraction]) -> str:
+    """Return the policy text to send with clauses, narrowed to retrieved sections if enabled"""
+    if deps.policy_top_k is None:
+        return deps.policy_text
+    context = get_policy_retriever(deps.policy_text).context(
+        [clause_query(c) for c in clauses], deps.policy_top_k
+    )
+    # Fall back to the full policy rather than sending no policy at all
+    context = context or deps.policy_text
+    deps.context_savings.record(deps.policy_text, context)
+    return context
+
+async def check_clauses_against_policy(
+    deps: ContractReviewDeps,
+    clauses: List[ClauseExtraction],
+    per_clause: bool = False,
+    max_concurrency: int = 8,
+    stage: str = "policy",
+    **kwargs,
+) -> List[PolicyMatch]:
+    """Run policy_agent over clauses, in one call or one concurrent call per clause
+    
+    Extra keyword arguments (e.g. model) are passed on to the agent run.
+    """
+    if not per_clause:
+        policy_context = select_policy_context(deps, clauses)
+        result = await run_agent(get_policy_agent(), build_policy_prompt(clauses, policy_context), deps, stage=stage, **kwargs)
+        return result.output
+    
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def check_clause(clause: ClauseExtraction) -> List[PolicyMatch]:
+        policy_context = select_policy_context(deps, [clause])
+        async with semaphore:
+            result = await run_agent(get_policy_agent(), build_policy_prompt([clause], policy_context), deps, stage=stage, **kwargs)
+        # Keep the clause name stable so suggestions can find the original clause
+        return [m.model_copy(update={"clause_name": clause.clause_name}) for m in result.output]
+    
+    # gather preserves clause order, so the merged list matches the batch mode layout
+    results = await asyncio.gather(*(check_clause(c) for c in clauses))
+    return [match for matches in results for match in matches]
+
+def order_matches(clauses: List[ClauseExtraction], matches: List[PolicyMatch]) -> List[PolicyMatch]:
+    """Order policy matches by their clause, keeping matches for unknown clause names at the end"""
+    by_clause: Dict[str, List[PolicyMatch]] = {}
+    for match in matches:
+        by_clause.setdefault(match.clause_name, []).append(match)
+    ordered = [m for c in clauses for m in by_clause.pop(c.clause_name, [])]
+    return ordered + [m for remaining in by_clause.values() for m in remaining]
+
+def prescreen_clauses(deps: ContractReviewDeps, clauses: List[ClauseExtraction]):
+    """Split clauses into PolicyMatches the policy rules are certain about and clauses left for policy_agent"""
+    rules = get_policy_rules(deps.policy_text)
+    stats = deps.prescreen_stats
+    resolved, remaining = [], []
+    for clause in clauses:
+        verdict = rules.evaluate(clause.clause_name, clause.clause_text)
+        if verdict is None:
+            remaining.append(clause)
+            continue
+        resolved.append(PolicyMatch(
+            clause_name=clause.clause_name,
+            policy_alignment=verdict.alignment,
+            policy_reference=verdict.policy_reference,
+            issues=verdict.issues,
+            compliant=verdict.compliant,
+        ))
+        stats.rules[verdict.rule] += 1
+    stats.clauses += len(clauses)
+    stats.resolved += len(resolved)
+    return resolved, remaining
+
+def reuse_indexed_verdicts(deps: ContractReviewDeps, clauses: List[ClauseExtraction]):
+    """Split clauses into PolicyMatches reused from near-identical indexed clauses and clauses left for policy_agent"""
+    policy_hash = text_hash(deps.policy_text)
+    stats = deps.clause_index_stats
+    reused, remaining = [], []
+    for clause in clauses:
+        verdict = deps.clause_index.lookup(policy_hash, clause.clause_text, PolicyMatch, ClauseSuggestion, stats)
+        if verdict is None:
+            remaining.append(clause)
+            stats.unseen.append(clause.clause_name)
+            continue
+        reused.extend(m.model_copy(update={"clause_name": clause.clause_name}) for m in verdict.matches)
+        deps.reused_verdicts[clause.clause_name] = verdict
+        stats.reused[clause.clause_name] = verdict.similarity
+    return reused, remaining
+
+def index_reviewed_clauses(deps: ContractReviewDeps) -> None:
+    """Add the clauses policy_agent judged in this review to deps.clause_index, with their suggestions"""
+    policy_hash = text_hash(deps.policy_text)
+    clauses = {c.clause_name: c for c in deps.extracted_clauses}
+    suggestions = {s.clause_name: s for s in deps.clause_suggestions or []}
+    for name in deps.clause_index_stats.unseen:
+        matches = [m for m in deps.policy_matches if m.clause_name == name]
+        if name in clauses and matches:
+            deps.clause_index.add(policy_hash, clauses[name].clause_text, matches, suggestions.get(name))
+
+async def run_cascade_policy_check(
+    deps: ContractReviewDeps,
+    clauses: List[ClauseExtraction],
+    per_clause: bool = False,
+    max_concurrency: int = 8,
+) -> List[PolicyMatch]:
+    """Check clauses on deps.cascade.small_model, then re-check uncertain ones on policy_agent's model
+    
+    Escalated clauses are recorded under the "policy_escalation" stage in the
+    metrics, and counts and timings accumulate in deps.cascade_stats.
+    """
+    stats = deps.cascade_stats
+    start = time.perf_counter()
+    small_matches = await check_clauses_against_policy(
+        deps, clauses, per_clause=per_clause, max_concurrency=max_concurrency, model=deps.cascade.small_model
+    )
+    stats.small_time += time.perf_counter() - start
+    stats.clauses += len(clauses)
+    
+    by_clause: Dict[str, List[PolicyMatch]] = {}
+    for match in small_matches:
+        by_clause.setdefault(match.clause_name, []).append(match)
+    escalate = []
+    for clause in clauses:
+        reason = deps.cascade.escalation_reason(by_clause.get(clause.clause_name))
+        if reason is not None:
+            escalate.append(clause)
+            stats.reasons[reason] += 1
+    stats.escalated += len(escalate)
+    if not escalate:
+        return small_matches
+    
+    start = time.perf_counter()
+    large_matches = await check_clauses_against_policy(
+        deps, escalate, per_clause=per_clause, max_concurrency=max_concurrency, stage="policy_escalation"
     )
+    stats.escalation_time += time.perf_counter() - start
     
-    ctx.deps.policy_matches = result.output
-    return result.output
+    # Replace the escalated clauses' verdicts
+    escalated_names = {c.clause_name for c in escalate}
+    kept = [m for m in small_matches if m.clause_name not in escalated_names]
+    return order_matches(clauses, kept + large_matches)
 
-@orchestrator.tool
-async def generate_suggestions(ctx: RunContext[ContractReviewDeps]) -> List[ClauseSuggestion]:
-    """Generate suggestions for improving non-compliant clauses"""
-    if not ctx.deps.policy_matches:
-        raise ValueError("No policy analysis completed. Run analyze_policy_compliance first.")
+async def run_policy_stage(
+    deps: ContractReviewDeps,
+    per_clause: bool = False,
+    max_concurrency: int = 8,
+) -> List[PolicyMatch]:
+    """Analyze how well each extracted clause complies with company policy
     
-    # Identify non-compliant clauses
-    non_compliant = [m for m in ctx.deps.policy_matches if not m.compliant]
+    Args:
+        deps: The shared review state, with extracted clauses populated
+        per_clause: Check each clause in its own concurrent policy_agent call
+            instead of sending all clauses in one call
+        max_concurrency: Maximum number of concurrent per-clause calls
+    """
+    if deps.extracted_clauses is None:
+        raise ValueError("No clauses extracted yet. Run extract_clauses first.")
+    if not deps.extracted_clauses:
+        # Nothing to check; the final report says no clauses were found
+        deps.policy_matches = []
+        return deps.policy_matches
+    
+    clauses = deps.extracted_clauses
+    resolved = []
+    if deps.prescreen:
+        with stage_timer(deps.metrics, "prescreen"):
+            resolved, clauses = prescreen_clauses(deps, clauses)
+    if deps.clause_index is not None:
+        with stage_timer(deps.metrics, "clause_index"):
+            # MinHash signatures and sqlite queries are blocking, so keep them off the event loop
+            reused, clauses = await asyncio.to_thread(reuse_indexed_verdicts, deps, clauses)
+        resolved += reused
+    
+    checked = []
+    if clauses and deps.cascade is not None:
+        checked = await run_cascade_policy_check(deps, clauses, per_clause=per_clause, max_concurrency=max_concurrency)
+    elif clauses:
+        checked = await check_clauses_against_policy(
+            deps, clauses, per_clause=per_clause, max_concurrency=max_concurrency
+        )
     
-    if not non_compliant:
-        return []  # No improvements needed
+    policy_matches = order_matches(deps.extracted_clauses, resolved + checked) if resolved else checked
+    deps.policy_matches = policy_matches
+    return policy_matches
+
+def build_suggestion_prompt(deps: ContractReviewDeps) -> Optional[str]:
+    """Build the suggestion prompt for the non-compliant clauses, or None if there are none"""
+    # Identify non-compliant clauses
+    non_compliant = [m for m in deps.policy_matches if not m.compliant and not _reused_suggestion(deps, m.clause_name)]
     
     # Prepare the input for the suggestion agent
     non_compliant_details = []
     for match in non_compliant:
         # Find the original clause text
         original = next(
-            (c for c in ctx.deps.extracted_clauses if c.clause_name == match.clause_name), 
+            (c for c in deps.extracted_clauses if c.clause_name == match.clause_name), 
             None
         )
         
         if original:
-            policy_section = find_policy_section(ctx.deps.policy_text, match.policy_reference)
+            policy_section = find_policy_section(deps.policy_text, match.policy_reference)
+            if policy_section == SECTION_NOT_FOUND and deps.policy_top_k is not None:
+                # Use the best retrieved section when the model's reference doesn't resolve
+                retriever = get_policy_retriever(deps.policy_text)
+                policy_section = retriever.context([clause_query(original)], top_k=1) or policy_section
             
             non_compliant_details.append(
                 f"Clause: {match.clause_name}\n"
@@ -175,86 +624,298 @@ async def generate_suggestions(ctx: RunContext[ContractReviewDeps]) -> List[Clau
             )
     
     if not non_compliant_details:
-        return []
+        return None
     
     separator = "=" * 50
     formatted_details = "\n".join([f"{separator}\n{detail}\n{separator}" for detail in non_compliant_details])
     
-    prompt = f"""Generate suggested improvements for these non-compliant clauses:
+    return f"""Generate suggested improvements for the non-compliant clauses below.
+For each clause, suggest revised text that would make it compliant with our policy.
+
+{formatted_details}"""
+
+def _reused_suggestion(deps: ContractReviewDeps, clause_name: str) -> Optional[ClauseSuggestion]:
+    verdict = deps.reused_verdicts.get(clause_name)
+    if verdict is None or verdict.suggestion is None:
+        return None
+    return verdict.suggestion.model_copy(update={"clause_name": clause_name})
+
+async def run_suggestion_stage(deps: ContractReviewDeps) -> List[ClauseSuggestion]:
+    """Generate suggestions for improving non-compliant clauses
+    
+    Non-compliant clauses whose verdict came from deps.clause_index reuse
+    the indexed suggestion; afterwards the clauses judged in this review
+    are added to the index.
+    """
+    if deps.policy_matches is None:
+        raise ValueError("No policy analysis completed. Run analyze_policy_compliance first.")
+    
+    reused = []
+    for name in dict.fromkeys(m.clause_name for m in deps.policy_matches if not m.compliant):
+        suggestion = _reused_suggestion(deps, name)
+        if suggestion is not None:
+            reused.append(suggestion)
+    
+    prompt = build_suggestion_prompt(deps)
+    suggestions = reused
+    if prompt is not None:
+        result = await run_agent(get_suggestion_agent(), prompt, deps, stage="suggest")
+        suggestions = reused + result.output
+    deps.clause_suggestions = suggestions
+    if deps.clause_index is not None:
+        await asyncio.to_thread(index_reviewed_clauses, deps)
+    return suggestions
+
+def build_final_review_prompt(deps: ContractReviewDeps) -> str:
+    """Build the orchestrator prompt summarizing all completed stages"""
+    # Prepare data for final review
+    final_review_data = {
+        "extracted_clauses": [c.model_dump() for c in deps.extracted_clauses],
+        "policy_matches": [m.model_dump() for m in deps.policy_matches],
+        "suggestions": [s.model_dump() for s in deps.clause_suggestions or []]
+    }
+    
+    return f"""Create a comprehensive review of this NDA contract based on the analysis performed.
+
+Please provide:
+1. An overall compliance score (0-100)
+2. Key strengths of the contract
+3. Key issues that need addressing
+4. Specific recommendations for improvement
 
-{formatted_details}
+Here is the summary of analysis performed:
+```json
+{json.dumps(final_review_data, indent=2)}
+```
+"""
 
-For each clause, suggest revised text that would make it compliant with our policy."""
+async def run_final_stage(deps: ContractReviewDeps) -> FinalReview:
+    """Aggregate the final review from the completed stages, without a model call
     
-    result = suggestion_agent.run_sync(prompt)
-    ctx.deps.clause_suggestions = result.output
+    The score is the risk-weighted mean policy alignment; see report.aggregate_report.
+    """
+    report = aggregate_report(get_policy_index(deps.policy_text), deps.policy_matches or [], deps.clause_suggestions or [])
+    return FinalReview(**asdict(report))
+
+async def run_narrative_stage(deps: ContractReviewDeps, prompt: Optional[str] = None) -> FinalReview:
+    """Have the narrator write a narrative review from the completed stages"""
+    result = await run_agent(get_narrator(), prompt or build_final_review_prompt(deps), deps, stage="narrative")
     return result.output
 
+def _log_narrative_failure(task: "asyncio.Task") -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Narrative review failed: %r", task.exception())
+
+def start_narrative(deps: ContractReviewDeps) -> "asyncio.Task":
+    """Start the narrative review in the background, off the review's critical path
+    
+    The prompt is built from the stage outputs before returning, and the
+    narrator has no tools, so the task cannot change the review. A failure
+    is logged if nobody awaits the task.
+    """
+    task = asyncio.ensure_future(run_narrative_stage(deps, build_final_review_prompt(deps)))
+    task.add_done_callback(_log_narrative_failure)
+    return task
+
 # Helper function to find relevant policy section
 def find_policy_section(policy_text, section_reference):
-    # Simple implementation - in a real system this would be more sophisticated
-    pattern = f"##\\s*{re.escape(section_reference)}"
-    match = re.search(pattern, policy_text)
-    if not match:
-        return "Policy section not found"
-    
-    start_idx = match.start()
-    next_section = re.search("##", policy_text[start_idx + 2:])
+    """Return the markdown of the policy section a clause's policy_reference points to
     
-    if next_section:
-        end_idx = start_idx + 2 + next_section.start()
-        return policy_text[start_idx:end_idx].strip()
-    else:
-        return policy_text[start_idx:].strip()
+    Uses the PolicyIndex shared by every review of the same policy text, so the
+    policy is parsed once and references like "Section 3" or "Term" resolve
+    to "## 3. Term of Agreement".
+    """
+    return get_policy_index(policy_text).section_text(section_reference)
 
-# Main function to run the multi-agent review
-def review_contract_with_agents(contract_text, policy_text, verbose=True):
-    """Run a complete multi-agent contract review with detailed intermediate outputs
+_runner: Optional[asyncio.Runner] = None
+
+def run_sync(coro):
+    """Run a coroutine to completion from synchronous code
     
-    Args:
-        contract_text: The contract text to analyze
-        policy_text: The policy text to compare against
-        verbose: Whether to display detailed outputs for each step
+    Calls share one event loop, like Agent.run_sync, so provider HTTP clients
+    stay usable between them. Inside a running loop (a notebook, with
+    nest_asyncio applied) the coroutine runs on that loop.
     """
-    from pprint import pprint
-    import json
-    
-    # Step 1: Extract clauses directly with extractor agent
-    print("Step 1: Extracting key clauses...")
-    extraction_result = extractor_agent.run_sync(
-        f"Extract the key clauses from this NDA contract:\n\n{contract_text}"
+    global _runner
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        if _runner is None:
+            _runner = asyncio.Runner()
+            atexit.register(_runner.close)
+        return _runner.run(coro)
+    return loop.run_until_complete(coro)
+
+def build_review_results(deps: ContractReviewDeps, final_report: FinalReview) -> Dict:
+    """Collect the stage outputs into the review results dict"""
+    results = {
+        "final_report": final_report,
+        "extracted_clauses": deps.extracted_clauses,
+        "policy_matches": deps.policy_matches,
+        "clause_suggestions": deps.clause_suggestions
+    }
+    if deps.policy_top_k is not None:
+        results["context_savings"] = deps.context_savings
+    if deps.metrics is not None:
+        results["metrics"] = deps.metrics
+    if deps.cascade is not None:
+        results["cascade"] = deps.cascade_stats
+    if deps.prescreen:
+        results["prescreen"] = deps.prescreen_stats
+    if deps.checkpoints is not None:
+        results["resumed_stages"] = deps.resumed_stages
+    if deps.hedge is not None:
+        results["hedge"] = deps.hedge_stats
+    if deps.clause_index is not None:
+        results["clause_index"] = deps.clause_index_stats
+    return results
+
+# Deps attribute and output type of each checkpointed stage
+STAGE_OUTPUTS = {
+    "extract": ("extracted_clauses", List[ClauseExtraction]),
+    "policy": ("policy_matches", List[PolicyMatch]),
+    "suggest": ("clause_suggestions", List[ClauseSuggestion]),
+    "final": (None, FinalReview),
+}
+
+def review_checkpoint_key(deps: ContractReviewDeps, per_clause_policy=False, chunk_size=None) -> str:
+    """Checkpoint key of a review: contract and policy hashes plus every setting that changes stage outputs"""
+    agents = (get_extractor_agent(), get_policy_agent(), get_suggestion_agent())
+    cascade = deps.cascade
+    return checkpoint_key(
+        deps.contract_text, deps.policy_text,
+        models=[model_name(agent.model) for agent in agents], final="aggregate",
+        per_clause_policy=per_clause_policy, chunk_size=chunk_size,
+        policy_top_k=deps.policy_top_k, prescreen=deps.prescreen,
+        cascade=None if cascade is None else [model_name(cascade.small_model), cascade.low, cascade.high],
     )
-    extracted_clauses = extraction_result.output
+
+def restore_checkpoints(deps: ContractReviewDeps, key: str) -> Optional[FinalReview]:
+    """Fill the deps with the stage outputs saved by an earlier run
+    
+    Stages are restored in order up to the first one without a checkpoint
+    and listed in deps.resumed_stages. Returns the saved final review if
+    the whole review had completed.
+    """
+    saved = deps.checkpoints.load(key)
+    final_report = None
+    for stage in CHECKPOINT_STAGES:
+        if stage not in saved:
+            break
+        attribute, output_type = STAGE_OUTPUTS[stage]
+        output = TypeAdapter(output_type).validate_json(saved[stage])
+        if attribute is None:
+            final_report = output
+        else:
+            setattr(deps, attribute, output)
+        deps.resumed_stages.append(stage)
+    return final_report
+
+def save_checkpoint(deps: ContractReviewDeps, key: Optional[str], stage: str, output) -> None:
+    """Save a completed stage's output, if the deps have a checkpoint store"""
+    if key is None:
+        return
+    _, output_type = STAGE_OUTPUTS[stage]
+    deps.checkpoints.save(key, stage, TypeAdapter(output_type).dump_json(output).decode())
+
+async def run_review_pipeline(
+    deps: ContractReviewDeps,
+    per_clause_policy=False,
+    max_concurrency=8,
+    chunk_size=None,
+    narrative=False,
+    progress: Optional[Callable[[str, ContractReviewDeps, bool], None]] = None,
+) -> Dict:
+    """Run all review stages on the deps
     
-    if verbose:
+    Args:
+        deps: The shared review state for one contract
+        per_clause_policy: Check each clause against policy in its own concurrent call
+        max_concurrency: Maximum number of concurrent per-clause or per-chunk calls
+        chunk_size: Extract clauses from section-aligned chunks of this many characters
+        narrative: Also have the narrator agent write a narrative review, returned as
+            a still-running task in results["narrative"]
+        progress: Optional callback, called as progress(stage, deps, done) before
+            and after each of the extract, policy, suggest and final stages
+    
+    With deps.checkpoints set, stages completed by an earlier run are
+    restored instead of rerun and every completed stage is saved.
+    """
+    key = review_checkpoint_key(deps, per_clause_policy, chunk_size) if deps.checkpoints is not None else None
+    final_report = restore_checkpoints(deps, key) if key is not None else None
+    
+    async def run_stage(stage: str):
+        if stage == "extract":
+            await run_extraction_stage(deps, chunk_size=chunk_size, max_concurrency=max_concurrency)
+            return deps.extracted_clauses
+        if stage == "policy":
+            await run_policy_stage(deps, per_clause=per_clause_policy, max_concurrency=max_concurrency)
+            return deps.policy_matches
+        if stage == "suggest":
+            return await run_suggestion_stage(deps)
+        return await run_final_stage(deps)
+    
+    for stage in CHECKPOINT_STAGES:
+        if progress is not None:
+            progress(stage, deps, False)
+        if stage not in deps.resumed_stages:
+            with stage_timer(deps.metrics, stage):
+                output = await run_stage(stage)
+            save_checkpoint(deps, key, stage, output)
+            if stage == "final":
+                final_report = output
+        if progress is not None:
+            progress(stage, deps, True)
+    
+    results = build_review_results(deps, final_report)
+    if narrative:
+        results["narrative"] = start_narrative(deps)
+    return results
+
+STAGE_HEADINGS = {
+    "extract": "Step 1: Extracting key clauses...",
+    "policy": "\nStep 2: Analyzing policy compliance...",
+    "suggest": "\nStep 3: Generating improvement suggestions...",
+    "final": "\nStep 4: Aggregating final report...",
+}
+
+def print_progress(stage: str, deps: ContractReviewDeps, done: bool, verbose: bool = True) -> None:
+    """Print a review's progress and, if verbose, each stage's outputs; a run_review_pipeline progress callback"""
+    if not done:
+        print(STAGE_HEADINGS[stage])
+        if stage in deps.resumed_stages:
+            print("(resumed from checkpoint)")
+        if verbose and stage == "final":
+            non_compliant = [m for m in deps.policy_matches if not m.compliant]
+            print("\n----- ANALYSIS SUMMARY -----")
+            print(f"• Clauses extracted: {len(deps.extracted_clauses)}")
+            print(f"• Non-compliant clauses: {len(non_compliant)}")
+            print(f"• Suggestions provided: {len(deps.clause_suggestions)}")
+            if deps.policy_top_k is not None:
+                print(f"• Policy tokens saved by retrieval: ~{deps.context_savings.saved_tokens}")
+            if deps.cascade is not None:
+                print(f"• Clauses escalated to the large model: {deps.cascade_stats.escalated}/{deps.cascade_stats.clauses}")
+            if deps.prescreen:
+                print(f"• Clauses resolved by policy rules: {deps.prescreen_stats.resolved}/{deps.prescreen_stats.clauses}")
+            if deps.hedge is not None:
+                print(f"• Calls hedged on the secondary provider: {deps.hedge_stats.hedged}/{deps.hedge_stats.calls}")
+            if deps.clause_index is not None:
+                print(f"• Clause verdicts reused from similar clauses: {deps.clause_index_stats.hits}/{deps.clause_index_stats.lookups}")
+            print("-" * 50)
+        return
+    if not verbose:
+        return
+    
+    if stage == "extract":
         print("\n----- EXTRACTED CLAUSES -----")
-        for i, clause in enumerate(extracted_clauses, 1):
+        for i, clause in enumerate(deps.extracted_clauses, 1):
             print(f"\n{i}. {clause.clause_name} (Section {clause.section_reference})")
             print(f"   Importance: {clause.importance}/10")
             print(f"   Text: {clause.clause_text[:150]}..." if len(clause.clause_text) > 150 else f"   Text: {clause.clause_text}")
         print("\n" + "-" * 50)
-    
-    # Step 2: Analyze policy compliance
-    print("\nStep 2: Analyzing policy compliance...")
-    clauses_text = "\n\n".join([
-        f"Clause: {c.clause_name}\nReference: {c.section_reference}\nText: {c.clause_text}"
-        for c in extracted_clauses
-    ])
-    
-    policy_result = policy_agent.run_sync(
-        f"""Analyze these contract clauses against our company policy:
-
-Contract Clauses:
-{clauses_text}
-
-Company NDA Policy:
-{policy_text}"""
-    )
-    policy_matches = policy_result.output
-    
-    if verbose:
+    elif stage == "policy":
         print("\n----- POLICY COMPLIANCE ANALYSIS -----")
-        for i, match in enumerate(policy_matches, 1):
+        for i, match in enumerate(deps.policy_matches, 1):
             compliance = "✅ Compliant" if match.compliant else "❌ Non-compliant"
             print(f"\n{i}. {match.clause_name} - {compliance}")
             print(f"   Alignment: {match.policy_alignment}/100")
@@ -264,159 +925,94 @@ Company NDA Policy:
                 for issue in match.issues:
                     print(f"     • {issue}")
         print("\n" + "-" * 50)
-    
-    # Step 3: Generate suggestions for non-compliant clauses
-    print("\nStep 3: Generating improvement suggestions...")
-    # Identify non-compliant clauses
-    non_compliant = [m for m in policy_matches if not m.compliant]
-    
-    clause_suggestions = []
-    if non_compliant:
-        # Prepare the input for the suggestion agent
-        non_compliant_details = []
-        for match in non_compliant:
-            # Find the original clause text
-            original = next(
-                (c for c in extracted_clauses if c.clause_name == match.clause_name), 
-                None
-            )
-            
-            if original:
-                policy_section = find_policy_section(policy_text, match.policy_reference)
-                
-                non_compliant_details.append(
-                    f"Clause: {match.clause_name}\n"
-                    f"Section: {original.section_reference}\n"
-                    f"Original Text: {original.clause_text}\n"
-                    f"Issues: {', '.join(match.issues)}\n"
-                    f"Policy Section: {policy_section}"
-                )
-        
-        if non_compliant_details:
-            separator = "=" * 50
-            formatted_details = "\n".join([f"{separator}\n{detail}\n{separator}" for detail in non_compliant_details])
-            
-            suggestion_prompt = f"""Generate suggested improvements for these non-compliant clauses:
-
-{formatted_details}
-
-For each clause, suggest revised text that would make it compliant with our policy."""
-            
-            suggestion_result = suggestion_agent.run_sync(suggestion_prompt)
-            clause_suggestions = suggestion_result.output
-    
-    if verbose and clause_suggestions:
-        print("\n----- SUGGESTED IMPROVEMENTS -----")
-        for i, suggestion in enumerate(clause_suggestions, 1):
-            print(f"\n{i}. {suggestion.clause_name}")
-            print(f"   Importance: {suggestion.importance}/10")
-            print(f"   Explanation: {suggestion.explanation}")
-            print(f"   Suggested Text:")
-            print(f"   ```\n   {suggestion.suggested_text}\n   ```")
-        print("\n" + "-" * 50)
-    elif verbose:
-        print("\nNo suggestions needed - all clauses comply with policy")
-    
-    # Step 4: Create final review
-    print("\nStep 4: Generating final report...")
-    
-    # Prepare data for final review
-    final_review_data = {
-        "extracted_clauses": [c.model_dump() for c in extracted_clauses],
-        "policy_matches": [m.model_dump() for m in policy_matches],
-        "suggestions": [s.model_dump() for s in clause_suggestions]
-    }
-    
-    if verbose:
-        print("\n----- ANALYSIS SUMMARY -----")
-        print(f"• Clauses extracted: {len(extracted_clauses)}")
-        print(f"• Non-compliant clauses: {len(non_compliant)}")
-        print(f"• Suggestions provided: {len(clause_suggestions)}")
-        print("-" * 50)
-    
-    review_prompt = f"""Create a comprehensive review of this NDA contract based on the analysis performed.
-
-Here is the summary of analysis performed:
-```json
-{json.dumps(final_review_data, indent=2)}
-```
+    elif stage == "suggest":
+        if deps.clause_suggestions:
+            print("\n----- SUGGESTED IMPROVEMENTS -----")
+            for i, suggestion in enumerate(deps.clause_suggestions, 1):
+                print(f"\n{i}. {suggestion.clause_name}")
+                print(f"   Importance: {suggestion.importance}/10")
+                print(f"   Explanation: {suggestion.explanation}")
+                print(f"   Suggested Text:")
+                print(f"   ```\n   {suggestion.suggested_text}\n   ```")
+            print("\n" + "-" * 50)
+        else:
+            print("\nNo suggestions needed - all clauses comply with policy")
 
-Please provide:
-1. An overall compliance score (0-100)
-2. Key strengths of the contract
-3. Key issues that need addressing
-4. Specific recommendations for improvement
-"""
-    
-    result = orchestrator.run_sync(review_prompt)
-    
-    return {
-        "final_report": result.output,
-        "extracted_clauses": extracted_clauses,
-        "policy_matches": policy_matches,
-        "clause_suggestions": clause_suggestions
-    }
-
-def format_multi_agent_results(review_results):
-    """Format multi-agent review results as markdown for display"""
-    final_report = review_results["final_report"]
-    extracted_clauses = review_results["extracted_clauses"]
-    policy_matches = review_results["policy_matches"]
-    clause_suggestions = review_results["clause_suggestions"]
-    
-    # Prepare markdown sections
-    final_report_md = f"""## Contract Review Summary
-
-**Overall Compliance Score: {final_report.overall_score}/100**
-
-### Key Strengths
-{chr(10).join([f"- {strength}" for strength in final_report.key_strengths])}
-
-### Key Issues
-{chr(10).join([f"- {issue}" for issue in final_report.key_issues])}
-
-### Recommendations
-{chr(10).join([f"- {rec}" for rec in final_report.recommendations])}
-"""
-    
-    # Format key metrics for display
-    metrics_md = f"""## Review Process Metrics
-
-| Metric | Value |
-|--------|-------|
-| Clauses Extracted | {len(extracted_clauses)} |
-| Non-Compliant Clauses | {len([m for m in policy_matches if not m.compliant])} |
-| Suggestions Made | {len(clause_suggestions)} |
-"""
+# Main function to run the multi-agent review
+async def review_contract_with_agents_async(
+    contract_text,
+    policy_text,
+    verbose=True,
+    per_clause_policy=False,
+    max_concurrency=8,
+    cache=None,
+    chunk_size=None,
+    policy_top_k=None,
+    metrics=None,
+    cascade=None,
+    prescreen=False,
+    checkpoints=None,
+    hedge=None,
+    clause_index=None,
+    narrative=False,
+):
+    """Run a complete multi-agent contract review without blocking the event loop
     
-    # Sample suggestion if available
-    suggestions_md = ""
-    if clause_suggestions and len(clause_suggestions) > 0:
-        suggestion = clause_suggestions[0]
-        suggestions_md = f"""## Sample Suggestion
-
-**Clause:** {suggestion.clause_name}
-
-**Suggested Revision:**
-```
-{suggestion.suggested_text}
-```
+    Args:
+        contract_text: The contract text to analyze
+        policy_text: The policy text to compare against
+        verbose: Whether to display detailed outputs for each step
+        per_clause_policy: Check each clause against policy in its own concurrent call
+        max_concurrency: Maximum number of concurrent per-clause or per-chunk calls
+        cache: Optional LLMCache used to serve repeated agent calls
+        chunk_size: Extract clauses from section-aligned chunks of this many characters
+        policy_top_k: Send only the top-k retrieved policy sections per clause
+        metrics: Optional ReviewMetrics that records every agent call, returned as results["metrics"]
+        cascade: Optional CascadeConfig to check policy on a small model first,
+            with escalation stats returned as results["cascade"]
+        prescreen: Resolve mechanically checkable clauses with policy rules
+            instead of policy_agent, with stats returned as results["prescreen"]
+        checkpoints: Optional CheckpointStore; stages completed by an earlier run
+            are restored instead of rerun, listed in results["resumed_stages"]
+        hedge: Optional HedgeConfig to also send slow calls to a secondary provider,
+            with hedge rates returned as results["hedge"]
+        clause_index: Optional ClauseIndex whose near-identical clauses' verdicts are
+            reused, with the hit rate and similarities returned as results["clause_index"]
+        narrative: Also have the narrator agent write a narrative review in the background,
+            returned as a task in results["narrative"]; the final report does not wait for it
+    """
+    deps = ContractReviewDeps(
+        contract_text=contract_text, policy_text=policy_text, cache=cache,
+        policy_top_k=policy_top_k, metrics=metrics, cascade=cascade, prescreen=prescreen,
+        checkpoints=checkpoints, hedge=hedge, clause_index=clause_index,
+    )
+    return await run_review_pipeline(
+        deps, per_clause_policy=per_clause_policy, max_concurrency=max_concurrency, chunk_size=chunk_size,
+        narrative=narrative, progress=partial(print_progress, verbose=verbose),
+    )
 
-**Explanation:** {suggestion.explanation}
-**Importance:** {suggestion.importance}/10
-"""
+def review_contract_with_agents(contract_text, policy_text, verbose=True, **options):
+    """Run a complete multi-agent contract review with detailed intermediate outputs
     
-    # Combine all sections
-    full_markdown = f"""# Multi-Agent Contract Review
-
-{final_report_md}
-
-{metrics_md}
-
-{suggestions_md}
-
----
-*Review performed using a multi-agent system with specialized legal AI roles*
-"""
+    Synchronous wrapper around review_contract_with_agents_async. With
+    narrative=True, the call waits for the narrative: results["narrative"]
+    is the finished FinalReview, or None if the narrator failed, which is
+    logged rather than failing the review.
     
-    return Markdown(full_markdown)
\ No newline at end of file
+    Args:
+        contract_text: The contract text to analyze
+        policy_text: The policy text to compare against
+        verbose: Whether to display detailed outputs for each step
+        **options: Pipeline options forwarded to review_contract_with_agents_async
+    """
+    async def review():
+        results = await review_contract_with_agents_async(contract_text, policy_text, verbose=verbose, **options)
+        if "narrative" in results:
+            try:
+                results["narrative"] = await results["narrative"]
+            except Exception:
+                # The report is complete without the optional narrative; start_narrative logged the failure
+                results["narrative"] = None
+        return results
+
+    return run_sync(review())
@@ -0,0 +1,392 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from agents import ContractReviewDeps, run_review_pipeline
+from cache import LLMCache
+from cascade import CascadeConfig, merge_cascade_stats
+from checkpoint import CheckpointStore
+from clause_index import ClauseIndex, merge_clause_index_stats
+from hedging import HedgeConfig, merge_hedge_stats
+from instrumentation import ReviewMetrics, merge_metrics
+from deadlines import DeadlineIndex
+from metadata import effective_date, extract_local_metadata
+from result_store import ResultStore
+from segmentation import chunk_size
+from utils import load_markdown_file
+
+# A contract to review, identified by a job id (e.g. the file name)
+ContractSource = Union[Iterable[Tuple[str, str]], AsyncIterable[Tuple[str, str]]]
+
+@dataclass
+class BatchResult:
+    """Outcome of reviewing a single contract in a batch"""
+    job_id: str
+    review: Optional[Dict] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    elapsed: float = 0.0
+    metrics: Optional[ReviewMetrics] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> Dict:
+        """Serialize the result for JSON lines output"""
+        review = narrative = None
+        if self.review is not None:
+            review = {
+                "final_report": self.review["final_report"].model_dump(),
+                "extracted_clauses": [c.model_dump() for c in self.review["extracted_clauses"]],
+                "policy_matches": [m.model_dump() for m in self.review["policy_matches"]],
+                "clause_suggestions": [s.model_dump() for s in self.review["clause_suggestions"]],
+            }
+            # The narrative runs off the critical path; only a finished one is written out
+            task = self.review.get("narrative")
+            if task is not None and task.done() and not task.cancelled() and task.exception() is None:
+                narrative = task.result().model_dump()
+        return {
+            "job_id": self.job_id,
+            "ok": self.ok,
+            "error": self.error,
+            "attempts": self.attempts,
+            "elapsed": round(self.elapsed, 3),
+            "review": review,
+            "metrics": self.metrics.summary() if self.metrics is not None else None,
+            "cascade": self.review["cascade"].to_dict() if self.review and "cascade" in self.review else None,
+            "prescreen": self.review["prescreen"].to_dict() if self.review and "prescreen" in self.review else None,
+            "resumed_stages": self.review.get("resumed_stages") if self.review else None,
+            "hedge": self.review["hedge"].to_dict() if self.review and "hedge" in self.review else None,
+            "clause_index": self.review["clause_index"].to_dict() if self.review and "clause_index" in self.review else None,
+            "narrative": narrative,
+        }
+
+@dataclass
+class BatchStats:
+    """Running counters for a batch review"""
+    started_at: float = field(default_factory=time.perf_counter)
+    completed: int = 0
+    failed: int = 0
+    retries: int = 0
+
+    @property
+    def contracts_per_minute(self) -> float:
+        elapsed = time.perf_counter() - self.started_at
+        return 60 * (self.completed + self.failed) / elapsed if elapsed > 0 else 0.0
+
+def load_contracts(directory, pattern="*.md") -> Iterator[Tuple[str, str]]:
+    """Lazily yield (job_id, contract_text) pairs for every matching file in a directory"""
+    for path in sorted(Path(directory).glob(pattern)):
+        yield path.name, load_markdown_file(path)
+
+async def _iterate(contracts: ContractSource) -> AsyncIterator[Tuple[str, str]]:
+    if hasattr(contracts, "__aiter__"):
+        async for item in contracts:
+            yield item
+    else:
+        for item in contracts:
+            yield item
+
+async def review_contract(
+    job_id: str,
+    contract_text: str,
+    policy_text: str,
+    limiter: Optional[asyncio.Semaphore] = None,
+    stats: Optional[BatchStats] = None,
+    max_retries: int = 2,
+    retry_backoff: float = 1.0,
+    cache: Optional[LLMCache] = None,
+    policy_top_k: Optional[int] = None,
+    collect_metrics: bool = False,
+    cascade: Optional[CascadeConfig] = None,
+    prescreen: bool = False,
+    checkpoints: Optional[CheckpointStore] = None,
+    hedge: Optional[HedgeConfig] = None,
+    clause_index: Optional[ClauseIndex] = None,
+    models: Optional[Dict[str, Any]] = None,
+    **options,
+) -> BatchResult:
+    """Review one contract, retrying failed attempts with jittered exponential backoff
+
+    Errors are returned in the BatchResult rather than raised. See
+    review_batch for the arguments; `limiter` caps in-flight agent calls
+    and is usually shared with other reviews. Without a checkpoint store,
+    an in-memory one kept for this job's retries makes each retry resume
+    from the stage that failed.
+    """
+    start = time.perf_counter()
+    metrics = ReviewMetrics(contract_id=job_id) if collect_metrics else None
+    job_checkpoints = checkpoints if checkpoints is not None else CheckpointStore(":memory:")
+    try:
+        for attempt in range(1, max_retries + 2):
+            deps = ContractReviewDeps(
+                contract_text=contract_text, policy_text=policy_text,
+                limiter=limiter, cache=cache, policy_top_k=policy_top_k, metrics=metrics,
+                cascade=cascade, prescreen=prescreen, checkpoints=job_checkpoints, hedge=hedge,
+                clause_index=clause_index, models=models or {},
+            )
+            try:
+                review = await run_review_pipeline(deps, **options)
+                if checkpoints is None:
+                    del review["resumed_stages"]
+                return BatchResult(
+                    job_id, review=review, attempts=attempt,
+                    elapsed=time.perf_counter() - start, metrics=metrics,
+                )
+            except Exception as e:
+                if attempt > max_retries:
+                    return BatchResult(
+                        job_id, error=f"{type(e).__name__}: {e}", attempts=attempt,
+                        elapsed=time.perf_counter() - start, metrics=metrics,
+                    )
+                if stats is not None:
+                    stats.retries += 1
+                # Full jitter so retries from many workers don't synchronize
+                await asyncio.sleep(random.uniform(0, retry_backoff * 2 ** (attempt - 1)))
+    finally:
+        if checkpoints is None:
+            job_checkpoints.close()
+
+async def review_batch(
+    contracts: ContractSource,
+    policy_text: str,
+    concurrency: int = 16,
+    max_retries: int = 2,
+    retry_backoff: float = 1.0,
+    stats: Optional[BatchStats] = None,
+    cache: Optional[LLMCache] = None,
+    policy_top_k: Optional[int] = None,
+    collect_metrics: bool = False,
+    cascade: Optional[CascadeConfig] = None,
+    prescreen: bool = False,
+    checkpoints: Optional[CheckpointStore] = None,
+    hedge: Optional[HedgeConfig] = None,
+    clause_index: Optional[ClauseIndex] = None,
+    models: Optional[Dict[str, Any]] = None,
+    **options,
+) -> AsyncIterator[BatchResult]:
+    """Review many contracts concurrently, yielding each result as soon as it finishes
+
+    Contracts are pulled lazily into a bounded job queue and processed by
+    `concurrency` workers. All workers share one limiter, so the total
+    number of in-flight agent calls (including per-clause fan-out) never
+    exceeds `concurrency`.
+
+    Args:
+        contracts: Iterable or async iterable of (job_id, contract_text) pairs
+        policy_text: The policy text to compare against
+        concurrency: Global cap on concurrent contracts and agent calls
+        max_retries: Number of times a failed job is retried before giving up
+        retry_backoff: Base delay in seconds for exponential backoff between retries
+        stats: Optional counters updated as jobs finish
+        cache: Optional LLMCache shared by all jobs
+        policy_top_k: Send only the top-k retrieved policy sections per clause
+        collect_metrics: Record every agent call in a ReviewMetrics per contract,
+            including calls from failed attempts
+        cascade: Optional CascadeConfig to check policy on a small model first
+        prescreen: Resolve mechanically checkable clauses with policy rules first
+        checkpoints: Optional CheckpointStore shared by all jobs, so a rerun of the
+            batch resumes every contract from its last completed stage; retries
+            within the batch resume from the failed stage either way
+        hedge: Optional HedgeConfig to also send slow calls to a secondary provider;
+            its latency percentiles are learned across the whole batch
+        clause_index: Optional ClauseIndex shared by all jobs, so clauses near-identical
+            to ones judged earlier in the batch (or in earlier runs) reuse their verdicts
+        models: Model to run each agent on instead of its own, by agent name,
+            e.g. from service.review_agent_models
+        **options: Pipeline options forwarded to run_review_pipeline
+    """
+    stats = stats if stats is not None else BatchStats()
+    limiter = asyncio.Semaphore(concurrency)
+    jobs: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    results: asyncio.Queue = asyncio.Queue()
+
+    async def produce():
+        try:
+            async for job in _iterate(contracts):
+                await jobs.put(job)
+        finally:
+            for _ in range(concurrency):
+                await jobs.put(None)
+
+    async def work():
+        while (job := await jobs.get()) is not None:
+            job_id, contract_text = job
+            await results.put(await review_contract(
+                job_id, contract_text, policy_text, limiter=limiter, stats=stats,
+                max_retries=max_retries, retry_backoff=retry_backoff, cache=cache, policy_top_k=policy_top_k,
+                collect_metrics=collect_metrics, cascade=cascade, prescreen=prescreen,
+                checkpoints=checkpoints, hedge=hedge, clause_index=clause_index, models=models, **options,
+            ))
+        await results.put(None)
+
+    producer = asyncio.create_task(produce())
+    workers = [asyncio.create_task(work()) for _ in range(concurrency)]
+    try:
+        remaining = len(workers)
+        while remaining:
+            result = await results.get()
+            if result is None:
+                remaining -= 1
+                continue
+            if result.ok:
+                stats.completed += 1
+            else:
+                stats.failed += 1
+            yield result
+        # Surface errors raised while reading the contract source
+        await producer
+    finally:
+        for task in [producer, *workers]:
+            task.cancel()
+        await asyncio.gather(producer, *workers, return_exceptions=True)
+
+async def _run_cli(args) -> int:
+    policy_text = load_markdown_file(args.policy)
+    stats = BatchStats()
+    cache = LLMCache(args.cache) if args.cache else None
+    all_metrics = []
+    cascade_stats = []
+    hedge_stats = []
+    index_stats = []
+    cascade = CascadeConfig(small_model=args.cascade_model) if args.cascade_model else None
+    checkpoints = CheckpointStore(args.checkpoints) if args.checkpoints else None
+    hedge = HedgeConfig(secondary_model=args.hedge_model, percentile=args.hedge_percentile) if args.hedge_model else None
+    store = ResultStore(args.store) if args.store else None
+    clause_index = ClauseIndex(args.clause_index, threshold=args.clause_similarity) if args.clause_index else None
+    contracts = load_contracts(args.directory, args.pattern)
+    metadata = {}
+    deadlines = DeadlineIndex() if args.deadlines is not None else None
+    if store is not None or deadlines is not None:
+        def with_metadata(jobs):
+            # Parse metadata locally as each contract is read, so the texts need not be kept
+            for job_id, contract_text in jobs:
+                local = extract_local_metadata(contract_text).metadata
+                if store is not None:
+                    metadata[job_id] = local
+                if deadlines is not None:
+                    deadlines.add_metadata(job_id, local, effective_date(contract_text))
+                yield job_id, contract_text
+        contracts = with_metadata(contracts)
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        async for result in review_batch(
+            contracts,
+            policy_text,
+            concurrency=args.concurrency,
+            max_retries=args.retries,
+            stats=stats,
+            cache=cache,
+            policy_top_k=args.policy_top_k,
+            collect_metrics=bool(args.metrics),
+            cascade=cascade,
+            prescreen=args.prescreen,
+            checkpoints=checkpoints,
+            hedge=hedge,
+            clause_index=clause_index,
+            per_clause_policy=args.per_clause_policy,
+            chunk_size=args.chunk_size,
+        ):
+            output.write(json.dumps(result.to_dict()) + "\n")
+            output.flush()
+            if result.metrics is not None:
+                result.metrics.to_jsonl(args.metrics)
+                all_metrics.append(result.metrics)
+            if result.ok and cascade is not None:
+                cascade_stats.append(result.review["cascade"])
+            if result.ok and hedge is not None:
+                hedge_stats.append(result.review["hedge"])
+            if result.ok and clause_index is not None:
+                index_stats.append(result.review["clause_index"])
+            if store is not None:
+                store.append(result.job_id, result.review, metadata.pop(result.job_id, None))
+            status = "ok" if result.ok else f"failed ({result.error})"
+            print(f"{result.job_id}: {status} in {result.elapsed:.1f}s", file=sys.stderr)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if cache is not None:
+            cache.close()
+        if checkpoints is not None:
+            checkpoints.close()
+        if store is not None:
+            store.flush()
+        if clause_index is not None:
+            clause_index.close()
+
+    print(
+        f"Reviewed {stats.completed} contracts, {stats.failed} failed, "
+        f"{stats.retries} retries, {stats.contracts_per_minute:.1f} contracts/minute",
+        file=sys.stderr,
+    )
+    if cache is not None:
+        print(f"Cache: {cache.stats.hits} hits, {cache.stats.misses} misses", file=sys.stderr)
+    if cascade_stats:
+        merged = merge_cascade_stats(cascade_stats)
+        print(
+            f"Cascade: {merged.escalated}/{merged.clauses} clauses escalated "
+            f"({merged.escalation_rate:.0%}), reasons {dict(merged.reasons)}",
+            file=sys.stderr,
+        )
+    if hedge_stats:
+        merged = merge_hedge_stats(hedge_stats)
+        print(
+            f"Hedging: {merged.hedged}/{merged.calls} calls hedged ({merged.hedge_rate:.0%}), "
+            f"{merged.secondary_wins} won by the secondary, p99 {merged.percentile(0.99):.2f}s",
+            file=sys.stderr,
+        )
+    if index_stats:
+        merged = merge_clause_index_stats(index_stats)
+        print(
+            f"Clause index: {merged.hits}/{merged.lookups} clause verdicts reused ({merged.hit_rate:.0%})",
+            file=sys.stderr,
+        )
+    if deadlines is not None:
+        due = deadlines.due_within(args.deadlines)
+        print(f"Notice deadlines in the next {args.deadlines} days: {len(due)}", file=sys.stderr)
+        for job_id, deadline in due:
+            print(f"  {deadline.isoformat()}  {job_id}", file=sys.stderr)
+    if all_metrics:
+        for stage, summary in merge_metrics(all_metrics).by_stage().items():
+            print(
+                f"  {stage}: {summary.calls} calls, {summary.call_time:.1f}s in calls, "
+                f"{summary.input_tokens} in / {summary.output_tokens} out tokens "
+                f"({summary.cached_token_ratio:.0%} of input cached), ${summary.cost:.4f}",
+                file=sys.stderr,
+            )
+    return 1 if stats.failed else 0
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Review a directory of NDA contracts against a policy")
+    parser.add_argument("directory", help="Directory containing the contracts to review")
+    parser.add_argument("--policy", default="data/nda_policy.md", help="Path to the NDA policy")
+    parser.add_argument("--pattern", default="*.md", help="Glob pattern for contract files")
+    parser.add_argument("--concurrency", type=int, default=16, help="Maximum concurrent agent calls")
+    parser.add_argument("--retries", type=int, default=2, help="Retries per failed contract")
+    parser.add_argument("--per-clause-policy", action="store_true", help="Check each clause in its own call")
+    parser.add_argument("--chunk-size", type=chunk_size, help="Extract clauses from chunks of this many characters")
+    parser.add_argument("--policy-top-k", type=int, help="Send only the top-k relevant policy sections per clause")
+    parser.add_argument("--prescreen", action="store_true", help="Resolve mechanically checkable clauses with policy rules")
+    parser.add_argument("--cascade-model", help="Check policy on this small model first, e.g. openai:gpt-4.1-mini")
+    parser.add_argument("--hedge-model", help="Also send slow calls to this model, e.g. google-gla:gemini-2.5-flash-preview-04-17")
+    parser.add_argument("--hedge-percentile", type=float, default=0.95, help="Latency percentile after which calls are hedged")
+    parser.add_argument("--cache", help="Path to an SQLite cache for agent outputs")
+    parser.add_argument("--clause-index", help="Path to an SQLite index of reviewed clauses whose verdicts near-duplicates reuse")
+    parser.add_argument("--clause-similarity", type=float, default=0.8, help="Minimum similarity for a clause to reuse a verdict")
+    parser.add_argument("--checkpoints", help="Path to an SQLite store of completed stages, to resume interrupted runs")
+    parser.add_argument("--store", help="Append reviews and locally parsed metadata to a ResultStore in this directory")
+    parser.add_argument("--deadlines", type=int, metavar="DAYS", help="List contracts whose notice deadline falls in the next DAYS days")
+    parser.add_argument("--metrics", help="Append per-call timing and token usage JSON lines here")
+    parser.add_argument("--output", help="Write JSON lines results here instead of stdout")
+    args = parser.parse_args(argv)
+    return asyncio.run(_run_cli(args))
+
+if __name__ == "__main__":
+    sys.exit(main())
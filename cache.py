@@ -0,0 +1,214 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pydantic import TypeAdapter
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for an LLMCache"""
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+@dataclass
+class CachedResult:
+    """Stand-in for an agent run result served from the cache"""
+    output: Any
+    cached: bool = field(default=True, repr=False)
+
+    def usage(self):
+        from pydantic_ai.usage import Usage
+
+        # A cache hit costs no tokens
+        return Usage()
+
+@lru_cache(maxsize=None)
+def schema_hash(output_type) -> str:
+    """Hash the JSON schema of an output type so schema changes invalidate entries"""
+    schema = TypeAdapter(output_type).json_schema()
+    return hashlib.sha256(json.dumps(schema, sort_keys=True).encode()).hexdigest()
+
+def model_name(model) -> str:
+    """Return a stable name for a pydantic-ai model or a LangChain chat model"""
+    if model is None or isinstance(model, str):
+        return str(model)
+    if hasattr(model, "system") and hasattr(model, "model_name"):
+        return f"{model.system}:{model.model_name}"
+    return getattr(model, "model_name", None) or getattr(model, "model", None) or type(model).__name__
+
+# Cache hits whose access times are buffered before they are written back in one transaction
+TOUCH_BATCH = 256
+
+class LLMCache:
+    """Content-addressed, SQLite-backed cache for structured LLM outputs
+
+    Entries are keyed on the model name, system prompt, rendered user prompt
+    and a hash of the output schema, and store the validated output as JSON.
+    The least recently used entries are evicted once `max_entries` is
+    exceeded, and entries older than `ttl` seconds are treated as misses.
+    Access times of hits are written back in batches rather than one commit
+    per hit. The methods block on SQLite, so async callers run them in a
+    thread.
+    """
+
+    def __init__(self, path=".llm_cache.sqlite", max_entries: int = 10_000, ttl: Optional[float] = None):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        # Access times of hits not yet written to the table, by key
+        self._touched: Dict[str, float] = {}
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, prompt: str, output_schema_hash: str) -> str:
+        """Build the content address for a call"""
+        payload = json.dumps([model, system_prompt, prompt, output_schema_hash])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached JSON for a key, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            value, created_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            self._touched[key] = now
+            if len(self._touched) >= TOUCH_BATCH:
+                self._flush_touched()
+                self._conn.commit()
+            self.stats.hits += 1
+            return value
+
+    def _flush_touched(self) -> None:
+        """Write buffered access times, holding the lock, without committing"""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", [(t, key) for key, t in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def set(self, key: str, value: str) -> None:
+        """Store the JSON for a key, evicting least recently used entries if over capacity"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self.stats.writes += 1
+            self._touched.pop(key, None)
+            # Eviction order needs the latest access times
+            self._flush_touched()
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            if count > self.max_entries:
+                excess = count - self.max_entries
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN "
+                    "(SELECT key FROM llm_cache ORDER BY accessed_at ASC LIMIT ?)",
+                    (excess,),
+                )
+                self.stats.evictions += excess
+            self._conn.commit()
+
+    def get_output(self, key: str, output_type):
+        """Return the cached output validated as output_type, or None on a miss"""
+        value = self.get(key)
+        if value is None:
+            return None
+        return TypeAdapter(output_type).validate_json(value)
+
+    def set_output(self, key: str, output, output_type) -> None:
+        """Store an output serialized through its output type"""
+        self.set(key, TypeAdapter(output_type).dump_json(output).decode())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_touched()
+            self._conn.commit()
+        self._conn.close()
+
+def agent_cache_key(agent, system_prompt: str, prompt: str, model=None) -> str:
+    """Build the cache key for a pydantic-ai agent call with the given system prompt, optionally run on another model"""
+    return LLMCache.make_key(model_name(model or agent.model), system_prompt, prompt, schema_hash(agent.output_type))
+
+def cached_structured_chain(prompt, llm, output_type, cache: LLMCache):
+    """Build `prompt | llm.with_structured_output(output_type)` with a cache in front of it
+
+    The cache key uses the fully rendered prompt messages, so two invocations
+    with the same inputs (e.g. the same contract and schema) share an entry.
+    """
+    from langchain_core.runnables import RunnableLambda
+
+    chain = prompt | llm.with_structured_output(output_type)
+    name = model_name(llm)
+    output_hash = schema_hash(output_type)
+
+    def key_for(inputs) -> str:
+        messages: List = prompt.format_messages(**inputs)
+        system_prompt = "\n".join(m.content for m in messages if m.type == "system")
+        rendered = "\n".join(f"{m.type}: {m.content}" for m in messages if m.type != "system")
+        return LLMCache.make_key(name, system_prompt, rendered, output_hash)
+
+    def invoke(inputs):
+        key = key_for(inputs)
+        output = cache.get_output(key, output_type)
+        if output is None:
+            output = chain.invoke(inputs)
+            cache.set_output(key, output, output_type)
+        return output
+
+    async def ainvoke(inputs):
+        key = key_for(inputs)
+        output = await asyncio.to_thread(cache.get_output, key, output_type)
+        if output is None:
+            output = await chain.ainvoke(inputs)
+            await asyncio.to_thread(cache.set_output, key, output, output_type)
+        return output
+
+    return RunnableLambda(invoke, afunc=ainvoke)
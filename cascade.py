@@ -0,0 +1,80 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+
+if TYPE_CHECKING:
+    from pydantic_ai.models import Model
+
+# Alignment score from which a clause is expected to be flagged compliant; a
+# verdict on the other side of it contradicts the model's own score
+COMPLIANCE_THRESHOLD = 70
+
+@dataclass
+class CascadeConfig:
+    """When to escalate a policy check from the small model to policy_agent's own model
+
+    Clauses scored inside [low, high) are borderline; clauses whose
+    `compliant` flag contradicts their score, and clauses the small model
+    returned no verdict for, are escalated as well.
+    """
+    small_model: Union[str, "Model"] = "openai:gpt-4.1-mini"
+    low: int = 50
+    high: int = 85
+
+    def escalation_reason(self, matches) -> Optional[str]:
+        """Why a clause's small-model matches need the large model, or None if they can stand"""
+        if not matches:
+            return "missing"
+        for match in matches:
+            if match.compliant != (match.policy_alignment >= COMPLIANCE_THRESHOLD):
+                return "inconsistent"
+            if self.low <= match.policy_alignment < self.high:
+                return "borderline"
+        return None
+
+@dataclass
+class CascadeStats:
+    """Escalations and timings of the policy cascade, accumulated over a review"""
+    clauses: int = 0
+    escalated: int = 0
+    reasons: Counter = field(default_factory=Counter)
+    small_time: float = 0.0
+    escalation_time: float = 0.0
+
+    @property
+    def escalation_rate(self) -> float:
+        return self.escalated / self.clauses if self.clauses else 0.0
+
+    @property
+    def estimated_savings(self) -> Optional[float]:
+        """Seconds saved against checking every clause on the large model
+
+        Extrapolates the escalation pass's time per clause to all clauses,
+        so it is only available once something was escalated.
+        """
+        if not self.escalated:
+            return None
+        large_only = self.escalation_time / self.escalated * self.clauses
+        return large_only - self.small_time - self.escalation_time
+
+    def to_dict(self) -> Dict:
+        return {
+            "clauses": self.clauses,
+            "escalated": self.escalated,
+            "escalation_rate": round(self.escalation_rate, 3),
+            "reasons": dict(self.reasons),
+            "small_time": round(self.small_time, 3),
+            "escalation_time": round(self.escalation_time, 3),
+            "estimated_savings": None if self.estimated_savings is None else round(self.estimated_savings, 3),
+        }
+
+def merge_cascade_stats(stats: List[CascadeStats]) -> CascadeStats:
+    """Combine the cascade stats of many reviews"""
+    merged = CascadeStats()
+    for s in stats:
+        merged.clauses += s.clauses
+        merged.escalated += s.escalated
+        merged.reasons.update(s.reasons)
+        merged.small_time += s.small_time
+        merged.escalation_time += s.escalation_time
+    return merged
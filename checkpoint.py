@@ -0,0 +1,86 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+# Pipeline stages whose outputs are checkpointed, in order
+CHECKPOINT_STAGES = ("extract", "policy", "suggest", "final")
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+def checkpoint_key(contract_text: str, policy_text: str, **config) -> str:
+    """Key of a review's checkpoints: the contract and policy hashes plus the pipeline config
+
+    `config` holds whatever changes the stage outputs (models, chunking,
+    per-clause checks, ...), so a review run with other settings does not
+    resume from these checkpoints.
+    """
+    payload = json.dumps([text_hash(contract_text), text_hash(policy_text), config], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class CheckpointStore:
+    """SQLite-backed store of completed stage outputs per review
+
+    Each completed stage of a review is saved as JSON under the review's
+    checkpoint_key, so a rerun after a failure or timeout resumes from the
+    last completed stage instead of paying for the earlier stages again.
+    Use ":memory:" for checkpoints that only need to survive retries
+    within one process.
+    """
+
+    def __init__(self, path=".review_checkpoints.sqlite"):
+        self.path = path if path == ":memory:" else Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS checkpoints (
+                key TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (key, stage)
+            )"""
+        )
+        self._conn.commit()
+
+    def load(self, key: str) -> Dict[str, str]:
+        """Return the saved JSON output of every completed stage of a review, by stage"""
+        with self._lock:
+            rows = self._conn.execute("SELECT stage, value FROM checkpoints WHERE key = ?", (key,)).fetchall()
+        return dict(rows)
+
+    def save(self, key: str, stage: str, value: str) -> None:
+        """Save the JSON output of a completed stage"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (key, stage, value, created_at) VALUES (?, ?, ?, ?)",
+                (key, stage, value, time.time()),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str, stage: Optional[str] = None) -> None:
+        """Drop the checkpoints of a review, or of one of its stages"""
+        with self._lock:
+            if stage is None:
+                self._conn.execute("DELETE FROM checkpoints WHERE key = ?", (key,))
+            else:
+                self._conn.execute("DELETE FROM checkpoints WHERE key = ? AND stage = ?", (key, stage))
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(DISTINCT key) FROM checkpoints").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoints")
+            self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
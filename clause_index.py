@@ -0,0 +1,245 @@
+import hashlib
+import json
+import random
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pydantic import TypeAdapter
+
+from segmentation import normalize_text
+
+# Mersenne prime modulus of the MinHash permutations
+MERSENNE_PRIME = (1 << 61) - 1
+NUMBER_WORDS = frozenset(
+    "one two three four five six seven eight nine ten eleven twelve fifteen twenty "
+    "thirty forty forty-five fifty sixty ninety hundred thousand".split()
+)
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?:;])\s+|\n+")
+NAME_PATTERN = re.compile(r"\b[A-Z][A-Za-z]+\b")
+NEGATION_PATTERN = re.compile(r"\b(?:not|no|never|nor|neither|none|cannot|without|unless|except|non)\b|n't")
+# Bumped when the stored columns change; an index of another version is rebuilt empty
+SCHEMA_VERSION = 2
+
+@dataclass
+class IndexedVerdict:
+    """Verdicts of an earlier, near-identical clause, as found by ClauseIndex.lookup"""
+    matches: List
+    suggestion: Optional[object]
+    similarity: float
+
+@dataclass
+class ClauseIndexStats:
+    """Lookups and reused verdicts of a ClauseIndex, for a review or across a portfolio"""
+    lookups: int = 0
+    hits: int = 0
+    similarities: List[float] = field(default_factory=list, repr=False)
+    # Per review: similarity of each reused clause, and clauses left for the LLM, by clause name
+    reused: Dict[str, float] = field(default_factory=dict)
+    unseen: List[str] = field(default_factory=list, repr=False)
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": round(self.hit_rate, 3),
+            "mean_similarity": round(sum(self.similarities) / len(self.similarities), 3) if self.similarities else None,
+            "reused": {name: round(similarity, 3) for name, similarity in self.reused.items()},
+        }
+
+def merge_clause_index_stats(stats: List[ClauseIndexStats]) -> ClauseIndexStats:
+    """Combine the clause index stats of many reviews"""
+    merged = ClauseIndexStats()
+    for s in stats:
+        merged.lookups += s.lookups
+        merged.hits += s.hits
+        merged.similarities.extend(s.similarities)
+    return merged
+
+def clause_tokens(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9]+(?:-[a-z]+)?", normalize_text(text))
+
+def shingles(text: str, size: int = 3) -> set:
+    """Word n-grams of a clause, after normalizing whitespace, case and markdown"""
+    tokens = clause_tokens(text)
+    if len(tokens) <= size:
+        return {" ".join(tokens)}
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+def numbers(text: str) -> str:
+    """The clause's numbers, which must match exactly: "3 years" and "5 years" differ by one shingle"""
+    return " ".join(t for t in clause_tokens(text) if t.isdigit() or t in NUMBER_WORDS)
+
+def names(text: str) -> str:
+    """Capitalized words not starting a sentence: parties, places, jurisdictions and defined terms"""
+    found = []
+    for sentence in SENTENCE_PATTERN.split(re.sub(r"[*_`]", "", text)):
+        found.extend(word.lower() for word in NAME_PATTERN.findall(sentence)[1 if sentence[:1].isupper() else 0:])
+    return " ".join(found)
+
+def negations(text: str) -> str:
+    """Negations and exceptions, which flip a clause's meaning while barely changing its shingles"""
+    return " ".join(NEGATION_PATTERN.findall(normalize_text(text)))
+
+def guard_key(text: str) -> str:
+    """Terms a reused clause must share exactly, as a few changed words can change the verdict"""
+    return "|".join((numbers(text), names(text), negations(text)))
+
+def text_key(text: str) -> str:
+    """Hash of the normalized clause text, so a clause reviewed again is stored once"""
+    return hashlib.sha256(normalize_text(text).encode()).hexdigest()
+
+class MinHasher:
+    """MinHash signatures whose agreement estimates the Jaccard similarity of shingle sets"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.permutations = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(MERSENNE_PRIME)) for _ in range(num_perm)]
+
+    def signature(self, text: str) -> array:
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little") for s in shingles(text)]
+        return array("Q", (min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in self.permutations))
+
+    @staticmethod
+    def similarity(first: array, second: array) -> float:
+        return sum(x == y for x, y in zip(first, second)) / len(first)
+
+class ClauseIndex:
+    """SQLite-backed MinHash/LSH index of reviewed clauses and their verdicts
+
+    Each reviewed clause is stored with its PolicyMatches (and
+    ClauseSuggestion, if it needed one) under the hash of the policy it was
+    judged against. A new clause whose estimated Jaccard similarity to a
+    stored one reaches `threshold`, with the same numbers, names and
+    negations in it (see guard_key), reuses those verdicts instead of
+    another policy_agent call. LSH with `bands`
+    bands keeps lookups to a handful of candidates.
+    """
+
+    def __init__(self, path=".clause_index.sqlite", threshold: float = 0.8, num_perm: int = 128, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.path = path if path == ":memory:" else Path(path)
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+        self.stats = ClauseIndexStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+        if version != SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS clauses")
+            self._conn.execute("DROP TABLE IF EXISTS clause_bands")
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS clauses (
+                id INTEGER PRIMARY KEY,
+                policy TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                guard TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                matches TEXT NOT NULL,
+                suggestion TEXT,
+                created_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS clause_bands (
+                policy TEXT NOT NULL,
+                bucket TEXT NOT NULL,
+                clause_id INTEGER NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS clauses_text ON clauses (policy, text_hash)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS clause_bands_bucket ON clause_bands (policy, bucket)")
+        self._conn.commit()
+
+    def _buckets(self, signature: array) -> List[str]:
+        rows = self.rows
+        return [
+            f"{band}:" + hashlib.blake2b(signature[band * rows:(band + 1) * rows].tobytes(), digest_size=8).hexdigest()
+            for band in range(self.bands)
+        ]
+
+    def lookup(self, policy_hash: str, clause_text: str, match_type, suggestion_type, stats: Optional[ClauseIndexStats] = None) -> Optional[IndexedVerdict]:
+        """Verdicts of the most similar stored clause at or above the threshold, or None"""
+        signature = self.hasher.signature(clause_text)
+        buckets = self._buckets(signature)
+        with self._lock:
+            rows = self._conn.execute(
+                f"""SELECT id, signature, matches, suggestion FROM clauses WHERE policy = ? AND guard = ? AND id IN (
+                    SELECT clause_id FROM clause_bands WHERE policy = ? AND bucket IN ({",".join("?" * len(buckets))}))""",
+                (policy_hash, guard_key(clause_text), policy_hash, *buckets),
+            ).fetchall()
+        best, best_similarity = None, 0.0
+        for _, blob, matches, suggestion in rows:
+            stored = array("Q")
+            stored.frombytes(blob)
+            similarity = MinHasher.similarity(signature, stored)
+            if similarity > best_similarity:
+                best, best_similarity = (matches, suggestion), similarity
+        for s in (self.stats, stats):
+            if s is not None:
+                s.lookups += 1
+        if best is None or best_similarity < self.threshold:
+            return None
+        for s in (self.stats, stats):
+            if s is not None:
+                s.hits += 1
+                s.similarities.append(best_similarity)
+        matches, suggestion = best
+        return IndexedVerdict(
+            matches=TypeAdapter(List[match_type]).validate_json(matches),
+            suggestion=None if suggestion is None else TypeAdapter(suggestion_type).validate_json(suggestion),
+            similarity=best_similarity,
+        )
+
+    def add(self, policy_hash: str, clause_text: str, matches: List, suggestion=None) -> None:
+        """Store a reviewed clause with its PolicyMatches and optional ClauseSuggestion
+
+        A clause whose normalized text is already stored under the policy is skipped.
+        """
+        signature = self.hasher.signature(clause_text)
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO clauses (policy, text_hash, guard, signature, matches, suggestion, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    policy_hash, text_key(clause_text), guard_key(clause_text), signature.tobytes(),
+                    json.dumps([m.model_dump() for m in matches]),
+                    None if suggestion is None else suggestion.model_dump_json(),
+                    time.time(),
+                ),
+            )
+            if cursor.rowcount:
+                self._conn.executemany(
+                    "INSERT INTO clause_bands (policy, bucket, clause_id) VALUES (?, ?, ?)",
+                    [(policy_hash, bucket, cursor.lastrowid) for bucket in self._buckets(signature)],
+                )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM clauses").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM clauses")
+            self._conn.execute("DELETE FROM clause_bands")
+            self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
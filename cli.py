@@ -0,0 +1,99 @@
+"""Command line entry point for reviewing contracts
+
+    review contract.md                         # text summary per contract
+    review data/*.md --prescreen --json        # one JSON line per contract
+
+Installed as the `review` console script; `python cli.py` works the same.
+For whole directories with retries and metrics use batch.py.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Dict
+
+from batch import BatchResult, review_batch
+from cache import LLMCache
+from cascade import CascadeConfig
+from checkpoint import CheckpointStore
+from clause_index import ClauseIndex
+from hedging import HedgeConfig
+from segmentation import chunk_size
+from utils import load_markdown_file
+
+def format_review(result: BatchResult) -> str:
+    """Plain text summary of a reviewed contract for the terminal"""
+    if not result.ok:
+        return f"# {result.job_id}\n\nReview failed: {result.error}\n"
+    review: Dict = result.review
+    report = review["final_report"]
+    lines = [f"# {result.job_id}", "", f"Overall compliance score: {report.overall_score}/100", ""]
+    for match in review["policy_matches"]:
+        status = "compliant" if match.compliant else "NON-COMPLIANT"
+        lines.append(f"- {match.clause_name}: {status} ({match.policy_alignment}/100, {match.policy_reference})")
+        lines.extend(f"    * {issue}" for issue in match.issues)
+    for title, items in (("Key issues", report.key_issues), ("Recommendations", report.recommendations)):
+        if items:
+            lines.extend(["", f"{title}:"])
+            lines.extend(f"- {item}" for item in items)
+    lines.append("")
+    return "\n".join(lines)
+
+async def _run_cli(args) -> int:
+    policy_text = load_markdown_file(args.policy)
+    cache = LLMCache(args.cache) if args.cache else None
+    cascade = CascadeConfig(small_model=args.cascade_model) if args.cascade_model else None
+    checkpoints = CheckpointStore(args.checkpoints) if args.checkpoints else None
+    hedge = HedgeConfig(secondary_model=args.hedge_model, percentile=args.hedge_percentile) if args.hedge_model else None
+    clause_index = ClauseIndex(args.clause_index, threshold=args.clause_similarity) if args.clause_index else None
+    jobs = ((Path(path).name, load_markdown_file(path)) for path in args.contracts)
+    failed = 0
+    try:
+        async for result in review_batch(
+            jobs,
+            policy_text,
+            concurrency=args.concurrency,
+            cache=cache,
+            policy_top_k=args.policy_top_k,
+            cascade=cascade,
+            prescreen=args.prescreen,
+            checkpoints=checkpoints,
+            hedge=hedge,
+            clause_index=clause_index,
+            per_clause_policy=args.per_clause_policy,
+            chunk_size=args.chunk_size,
+        ):
+            failed += not result.ok
+            print(json.dumps(result.to_dict()) if args.json else format_review(result), flush=True)
+    finally:
+        if cache is not None:
+            cache.close()
+        if checkpoints is not None:
+            checkpoints.close()
+        if clause_index is not None:
+            clause_index.close()
+    return 1 if failed else 0
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="review", description="Review NDA contracts against a policy")
+    parser.add_argument("contracts", nargs="+", help="Contract markdown files to review")
+    parser.add_argument("--policy", default="data/nda_policy.md", help="Path to the NDA policy")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum concurrent agent calls")
+    parser.add_argument("--per-clause-policy", action="store_true", help="Check each clause in its own call")
+    parser.add_argument("--chunk-size", type=chunk_size, help="Extract clauses from chunks of this many characters")
+    parser.add_argument("--policy-top-k", type=int, help="Send only the top-k relevant policy sections per clause")
+    parser.add_argument("--prescreen", action="store_true", help="Resolve mechanically checkable clauses with policy rules")
+    parser.add_argument("--cascade-model", help="Check policy on this small model first, e.g. openai:gpt-4.1-mini")
+    parser.add_argument("--hedge-model", help="Also send slow calls to this model, e.g. google-gla:gemini-2.5-flash-preview-04-17")
+    parser.add_argument("--hedge-percentile", type=float, default=0.95, help="Latency percentile after which calls are hedged")
+    parser.add_argument("--cache", help="Path to an SQLite cache for agent outputs")
+    parser.add_argument("--clause-index", help="Path to an SQLite index of reviewed clauses whose verdicts near-duplicates reuse")
+    parser.add_argument("--clause-similarity", type=float, default=0.8, help="Minimum similarity for a clause to reuse a verdict")
+    parser.add_argument("--checkpoints", help="Path to an SQLite store of completed stages, to resume interrupted runs")
+    parser.add_argument("--json", action="store_true", help="Print one JSON line per contract instead of a summary")
+    args = parser.parse_args(argv)
+    return asyncio.run(_run_cli(args))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+import re
+from array import array
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from metadata import TEXT_DATE_PATTERN, add_months, parse_date
+from models import ContractMetadata
+from prescreen import DAYS_PATTERN, YEARS_PATTERN, parse_count
+
+if TYPE_CHECKING:
+    import numpy as np
+
+MONTHS_PATTERN = re.compile(r"\b(\d+)\s*(?:\(\d+\)\s*)?(?:calendar\s+)?months?", re.IGNORECASE)
+# Days since 1970-01-01, the datetime64[D] epoch
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# Stand-in for an unknown date or period; the same bit pattern is NaT in datetime64 and timedelta64
+NULL_DAYS = -(2 ** 63)
+DATE_KINDS = ("notice", "termination", "effective")
+
+@dataclass
+class ContractDates:
+    """Dates of a contract normalized from the free-text DateInfo strings of its ContractMetadata"""
+    effective_date: Optional[date] = None
+    termination_date: Optional[date] = None
+    # A stated date by which notice must be given, or else the notice period before termination
+    notice_date: Optional[date] = None
+    notice_days: Optional[int] = None
+
+    @property
+    def notice_deadline(self) -> Optional[date]:
+        """Last day to give notice: the stated notice date, or the notice period before termination"""
+        if self.notice_date is not None:
+            return self.notice_date
+        if self.termination_date is not None and self.notice_days is not None:
+            return self.termination_date - timedelta(days=self.notice_days)
+        return None
+
+def resolve_date(text: Optional[str], effective_date: Optional[date] = None) -> Optional[date]:
+    """Parse an absolute date, or a period such as "3 years after the Effective Date" counted from effective_date"""
+    if not text:
+        return None
+    absolute = parse_date(text)
+    if absolute is None:
+        found = TEXT_DATE_PATTERN.search(text)
+        absolute = parse_date(found.group(1)) if found else None
+    if absolute is not None or effective_date is None:
+        return absolute
+    years, months, days = YEARS_PATTERN.search(text), MONTHS_PATTERN.search(text), DAYS_PATTERN.search(text)
+    if not (years or months or days):
+        return None
+    resolved = add_months(effective_date, 12 * (parse_count(years) if years else 0) + (int(months.group(1)) if months else 0))
+    return resolved + timedelta(days=parse_count(days) if days else 0)
+
+def normalize_dates(metadata: ContractMetadata, effective_date: Optional[date] = None) -> ContractDates:
+    """Parse a contract's notice and termination dates once, instead of a date tool call per date
+
+    Relative termination dates are counted from `effective_date`, see
+    metadata.effective_date. A notice_date that states a period ("30 days
+    written notice") rather than a date becomes notice_days.
+    """
+    notice_text = metadata.notice_date.date if metadata.notice_date is not None else None
+    termination_text = metadata.termination_date.date if metadata.termination_date is not None else None
+    notice_date = notice_days = None
+    if notice_text:
+        notice_date = resolve_date(notice_text)
+        period = DAYS_PATTERN.search(notice_text) if notice_date is None else None
+        notice_days = parse_count(period) if period else None
+    return ContractDates(
+        effective_date=effective_date,
+        termination_date=resolve_date(termination_text, effective_date),
+        notice_date=notice_date,
+        notice_days=notice_days,
+    )
+
+def _days(value: Optional[date]) -> int:
+    return NULL_DAYS if value is None else value.toordinal() - EPOCH_ORDINAL
+
+class DeadlineIndex:
+    """Portfolio-wide index of normalized contract dates for deadline range queries
+
+    Dates are kept as days since the epoch in typed arrays and viewed as
+    NumPy datetime64[D] columns, so notice deadlines are computed for the
+    whole portfolio at once and a query such as
+
+        index.due_within(30)                      # notice deadlines in the next 30 days
+        index.between(date(2026, 1, 1), date(2026, 3, 31), kind="termination")
+
+    is a vectorized scan rather than a date calculation per contract.
+    Adding a contract id again replaces its dates.
+    """
+
+    def __init__(self):
+        self.contracts: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._columns = {name: array("q") for name in ("effective", "termination", "notice_date", "notice_days")}
+
+    def __len__(self) -> int:
+        return len(self.contracts)
+
+    def add(self, contract_id: str, dates: ContractDates) -> None:
+        values = {
+            "effective": _days(dates.effective_date),
+            "termination": _days(dates.termination_date),
+            "notice_date": _days(dates.notice_date),
+            "notice_days": NULL_DAYS if dates.notice_days is None else dates.notice_days,
+        }
+        row = self._rows.get(contract_id)
+        if row is None:
+            self._rows[contract_id] = len(self.contracts)
+            self.contracts.append(contract_id)
+            for name, value in values.items():
+                self._columns[name].append(value)
+        else:
+            for name, value in values.items():
+                self._columns[name][row] = value
+
+    def add_metadata(self, contract_id: str, metadata: ContractMetadata, effective_date: Optional[date] = None) -> ContractDates:
+        """Normalize a contract's metadata dates and add them, returning the parsed dates"""
+        dates = normalize_dates(metadata, effective_date)
+        self.add(contract_id, dates)
+        return dates
+
+    def dates(self, kind: str = "notice") -> "np.ndarray":
+        """datetime64[D] array of one date per contract, NaT where unknown
+
+        The "notice" kind is the notice deadline, computed for all contracts
+        at once as the stated notice date or termination minus the notice period.
+        """
+        import numpy as np
+
+        if kind not in DATE_KINDS:
+            raise ValueError(f"Unknown date kind {kind!r}, expected one of {DATE_KINDS}")
+        # Views of the arrays are dropped before returning, so the arrays can still grow
+        if kind != "notice":
+            return np.frombuffer(self._columns[kind], dtype="datetime64[D]").copy()
+        notice_date = np.frombuffer(self._columns["notice_date"], dtype="datetime64[D]")
+        termination = np.frombuffer(self._columns["termination"], dtype="datetime64[D]")
+        notice_days = np.frombuffer(self._columns["notice_days"], dtype="timedelta64[D]")
+        return np.where(np.isnat(notice_date), termination - notice_days, notice_date)
+
+    def between(self, start: date, end: date, kind: str = "notice") -> List[Tuple[str, date]]:
+        """(contract id, date) pairs with the date in [start, end], earliest first"""
+        import numpy as np
+
+        values = self.dates(kind)
+        matches = np.flatnonzero((values >= np.datetime64(start, "D")) & (values <= np.datetime64(end, "D")))
+        matches = matches[np.argsort(values[matches], kind="stable")]
+        return [(self.contracts[i], values[i].item()) for i in matches]
+
+    def due_within(self, days: int, today: Optional[date] = None, kind: str = "notice") -> List[Tuple[str, date]]:
+        """Contracts whose deadline falls in the next `days` days, today included"""
+        today = today or date.today()
+        return self.between(today, today + timedelta(days=days), kind)
@@ -0,0 +1,205 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar, Union
+
+from cache import model_name
+
+if TYPE_CHECKING:
+    from pydantic_ai.models import Model
+
+T = TypeVar("T")
+
+@dataclass
+class HedgeConfig:
+    """When to send a call to the secondary provider as well
+
+    A call that has not returned after the `percentile` latency of recent
+    calls of the same kind is sent to `secondary_model` too, and whichever
+    validated result arrives first wins. Until `min_samples` latencies have
+    been seen, calls are hedged after `initial_delay` seconds.
+    """
+    secondary_model: Union[str, "Model"] = "google-gla:gemini-2.5-flash-preview-04-17"
+    percentile: float = 0.95
+    initial_delay: float = 10.0
+    min_samples: int = 20
+    window: int = 500
+    latencies: Dict[str, Deque[float]] = field(default_factory=dict, repr=False)
+
+    def delay(self, key: str) -> float:
+        """Seconds to wait for the primary before hedging a call of this kind"""
+        latencies = self.latencies.get(key)
+        if latencies is None or len(latencies) < self.min_samples:
+            return self.initial_delay
+        ordered = sorted(latencies)
+        return ordered[min(len(ordered) - 1, int(self.percentile * len(ordered)))]
+
+    def observe(self, key: str, latency: float) -> None:
+        self.latencies.setdefault(key, deque(maxlen=self.window)).append(latency)
+
+@dataclass
+class HedgeStats:
+    """Hedged and secondary-won calls, accumulated over a review or a chain"""
+    calls: int = 0
+    hedged: int = 0
+    secondary_wins: int = 0
+    # End-to-end latency of every call, hedged or not
+    latencies: List[float] = field(default_factory=list, repr=False)
+
+    @property
+    def hedge_rate(self) -> float:
+        return self.hedged / self.calls if self.calls else 0.0
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def to_dict(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_rate": round(self.hedge_rate, 3),
+            "secondary_wins": self.secondary_wins,
+            "p50": round(self.percentile(0.5), 4),
+            "p99": round(self.percentile(0.99), 4),
+        }
+
+def merge_hedge_stats(stats: List[HedgeStats]) -> HedgeStats:
+    """Combine the hedge stats of many reviews"""
+    merged = HedgeStats()
+    for s in stats:
+        merged.calls += s.calls
+        merged.hedged += s.hedged
+        merged.secondary_wins += s.secondary_wins
+        merged.latencies.extend(s.latencies)
+    return merged
+
+def _record(config: HedgeConfig, stats: Optional[HedgeStats], key: str, elapsed: float, hedged: bool, secondary_won: bool) -> None:
+    # When the secondary won, the primary latency is only known to exceed `elapsed`;
+    # recording it as is keeps the threshold from drifting up on a few stuck calls
+    config.observe(key, elapsed)
+    if stats is not None:
+        stats.calls += 1
+        stats.hedged += hedged
+        stats.secondary_wins += secondary_won
+        stats.latencies.append(elapsed)
+
+async def hedge(
+    primary: Callable[[], Awaitable[T]],
+    secondary: Callable[[], Awaitable[T]],
+    config: HedgeConfig,
+    key: str,
+    stats: Optional[HedgeStats] = None,
+) -> Tuple[T, bool]:
+    """Await primary(), starting secondary() as well if primary is slower than the hedge delay
+
+    Returns the first successful result and whether it came from the
+    secondary; the other call is cancelled. A failed call only loses if the
+    other one succeeds, so the primary's error is raised when both fail.
+    """
+    start = time.perf_counter()
+    primary_task = asyncio.ensure_future(primary())
+    tasks = [primary_task]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=config.delay(key))
+        if done:
+            result = primary_task.result()
+            _record(config, stats, key, time.perf_counter() - start, hedged=False, secondary_won=False)
+            return result, False
+
+        secondary_task = asyncio.ensure_future(secondary())
+        tasks.append(secondary_task)
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in (primary_task, secondary_task):
+                if task in done and task.exception() is None:
+                    secondary_won = task is secondary_task
+                    _record(config, stats, key, time.perf_counter() - start, hedged=True, secondary_won=secondary_won)
+                    return task.result(), secondary_won
+        return primary_task.result(), False
+    finally:
+        for task in tasks:
+            task.cancel()
+
+# Threads for hedging synchronous chain invocations
+_executor = ThreadPoolExecutor(thread_name_prefix="hedge")
+
+def hedge_sync(
+    primary: Callable[[], T],
+    secondary: Callable[[], T],
+    config: HedgeConfig,
+    key: str,
+    stats: Optional[HedgeStats] = None,
+) -> Tuple[T, bool]:
+    """Blocking version of hedge for synchronous calls
+
+    Calls run on a thread pool, so the losing call cannot be interrupted;
+    its result is discarded when it finishes.
+    """
+    start = time.perf_counter()
+    primary_future = _executor.submit(primary)
+    futures = [primary_future]
+    try:
+        done, _ = wait(futures, timeout=config.delay(key))
+        if done:
+            result = primary_future.result()
+            _record(config, stats, key, time.perf_counter() - start, hedged=False, secondary_won=False)
+            return result, False
+
+        secondary_future = _executor.submit(secondary)
+        futures.append(secondary_future)
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in (primary_future, secondary_future):
+                if future in done and future.exception() is None:
+                    secondary_won = future is secondary_future
+                    _record(config, stats, key, time.perf_counter() - start, hedged=True, secondary_won=secondary_won)
+                    return future.result(), secondary_won
+        return primary_future.result(), False
+    finally:
+        for future in futures:
+            future.cancel()
+
+class HedgedChatModel:
+    """Pair of LangChain chat models used as one in `prompt | llm.with_structured_output(...)` chains
+
+    Each structured call goes to `primary`, and also to `secondary` once it
+    is slower than the config's hedge delay; the first validated output
+    wins. Stats accumulate on `stats` across calls.
+    """
+
+    def __init__(self, primary, secondary, config: Optional[HedgeConfig] = None, stats: Optional[HedgeStats] = None):
+        self.primary = primary
+        self.secondary = secondary
+        self.config = config if config is not None else HedgeConfig()
+        self.stats = stats if stats is not None else HedgeStats()
+        self.model_name = f"hedged:{model_name(primary)}|{model_name(secondary)}"
+
+    def with_structured_output(self, schema, **kwargs):
+        from langchain_core.runnables import RunnableLambda
+
+        primary = self.primary.with_structured_output(schema, **kwargs)
+        secondary = self.secondary.with_structured_output(schema, **kwargs)
+        key = f"{model_name(self.primary)}:{getattr(schema, '__name__', schema)}"
+
+        def invoke(prompt_value):
+            output, _ = hedge_sync(
+                lambda: primary.invoke(prompt_value), lambda: secondary.invoke(prompt_value),
+                self.config, key, self.stats,
+            )
+            return output
+
+        async def ainvoke(prompt_value):
+            output, _ = await hedge(
+                lambda: primary.ainvoke(prompt_value), lambda: secondary.ainvoke(prompt_value),
+                self.config, key, self.stats,
+            )
+            return output
+
+        return RunnableLambda(invoke, afunc=ainvoke)
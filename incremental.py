@@ -0,0 +1,213 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from agents import (
+    ClauseExtraction,
+    ContractReviewDeps,
+    build_review_results,
+    merge_clauses,
+    order_matches,
+    run_extraction_stage,
+    run_final_stage,
+    run_policy_stage,
+    run_suggestion_stage,
+    run_sync,
+)
+from segmentation import ContractSection, normalize_text, split_contract
+
+# Length of the clause text prefix used to locate a clause in a contract,
+# long enough to be unique but tolerant of the model trimming the clause end
+CLAUSE_SNIPPET_LENGTH = 200
+
+@dataclass
+class ContractDiff:
+    """Section-level difference between two revisions of a contract"""
+    unchanged: List[str] = field(default_factory=list)
+    changed: List[ContractSection] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.changed or self.removed)
+
+@dataclass
+class IncrementalStats:
+    """What an incremental re-review reused and what it re-ran"""
+    reused_clauses: int = 0
+    rerun_clauses: int = 0
+    changed_sections: List[str] = field(default_factory=list)
+    removed_sections: List[str] = field(default_factory=list)
+
+def diff_contracts(previous_text: str, contract_text: str) -> ContractDiff:
+    """Compare two contract revisions section by section
+
+    Sections are matched by title, so renumbering alone does not count as a
+    change, and bodies are compared after normalizing whitespace and
+    markdown emphasis.
+    """
+    previous = {section.key: section for section in split_contract(previous_text)}
+    diff = ContractDiff()
+    seen = set()
+    for section in split_contract(contract_text):
+        seen.add(section.key)
+        old = previous.get(section.key)
+        if old is not None and normalize_text(old.body) == normalize_text(section.body):
+            diff.unchanged.append(section.key)
+        else:
+            diff.changed.append(section)
+    diff.removed = [key for key in previous if key not in seen]
+    return diff
+
+def _snippet(clause: ClauseExtraction) -> str:
+    return normalize_text(clause.clause_text)[:CLAUSE_SNIPPET_LENGTH]
+
+def locate_clause(clause: ClauseExtraction, sections: List[ContractSection]) -> Optional[str]:
+    """Return the key of the section a clause was extracted from, if it can be found"""
+    snippet = _snippet(clause)
+    if snippet:
+        for section in sections:
+            if snippet in normalize_text(section.text):
+                return section.key
+    # Fall back to the section number the extractor cited, e.g. "5.2" -> section 5
+    number = re.match(r"\D*(\d+)", clause.section_reference or "")
+    if number:
+        for section in sections:
+            if section.number == int(number.group(1)):
+                return section.key
+    return None
+
+def renumber_clause(clause: ClauseExtraction, section: Optional[ContractSection]) -> ClauseExtraction:
+    """Point a reused clause's section reference at its section's number in the revised contract, e.g. "5.2" -> "7.2" """
+    number = re.match(r"(\D*)(\d+)", clause.section_reference or "")
+    if section is None or section.number is None or number is None or int(number.group(2)) == section.number:
+        return clause
+    reference = f"{number.group(1)}{section.number}{clause.section_reference[number.end():]}"
+    return clause.model_copy(update={"section_reference": reference})
+
+def order_clauses(clauses: List[ClauseExtraction], sections: List[ContractSection]) -> List[ClauseExtraction]:
+    """Sort clauses into document order by where their text, or else their section, appears in the contract"""
+    normalized = normalize_text("\n\n".join(section.text for section in sections))
+    starts = {section.key: normalized.find(normalize_text(section.text)) for section in sections}
+
+    def position(clause: ClauseExtraction) -> int:
+        snippet = _snippet(clause)
+        found = normalized.find(snippet) if snippet else -1
+        if found >= 0:
+            return found
+        return starts.get(locate_clause(clause, sections), len(normalized))
+
+    return sorted(clauses, key=position)
+
+async def rereview_contract_async(
+    contract_text,
+    policy_text,
+    previous_contract_text,
+    previous_review,
+    per_clause_policy=False,
+    max_concurrency=8,
+    cache=None,
+    chunk_size=None,
+    policy_top_k=None,
+    metrics=None,
+    cascade=None,
+    prescreen=False,
+):
+    """Re-review a revised contract, re-running only the clauses in changed sections
+
+    Clauses from sections that are unchanged since the previous review keep
+    their ClauseExtraction, PolicyMatch and ClauseSuggestion, with section
+    references updated if the section was renumbered. Changed and added
+    sections are re-extracted and re-analyzed; new clauses named like a
+    reused one are renamed. The merged clauses are put in document order
+    and the final report is regenerated from them.
+
+    Args:
+        contract_text: The revised contract text
+        policy_text: The policy text to compare against
+        previous_contract_text: The contract text the previous review was run on
+        previous_review: The results dict returned by the previous review
+        per_clause_policy: Check each clause against policy in its own concurrent call
+        max_concurrency: Maximum number of concurrent per-clause or per-chunk calls
+        cache: Optional LLMCache used to serve repeated agent calls
+        chunk_size: Extract clauses from section-aligned chunks of this many characters
+        policy_top_k: Send only the top-k retrieved policy sections per clause
+        metrics: Optional ReviewMetrics that records every agent call
+        cascade: Optional CascadeConfig to check policy on a small model first
+        prescreen: Resolve mechanically checkable clauses with policy rules first
+
+    Returns:
+        The review results dict, with an extra "incremental" IncrementalStats entry
+    """
+    diff = diff_contracts(previous_contract_text, contract_text)
+    stats = IncrementalStats(
+        changed_sections=[section.title for section in diff.changed],
+        removed_sections=diff.removed,
+    )
+
+    if not diff.has_changes:
+        stats.reused_clauses = len(previous_review["extracted_clauses"])
+        return {**previous_review, "incremental": stats}
+
+    previous_sections = split_contract(previous_contract_text)
+    sections = split_contract(contract_text)
+    by_key = {section.key: section for section in sections}
+    unchanged = set(diff.unchanged)
+    normalized_contract = normalize_text(contract_text)
+    reused_clauses = []
+    for clause in previous_review["extracted_clauses"]:
+        key = locate_clause(clause, previous_sections)
+        # Clauses we cannot place are kept only if their text survived verbatim
+        if key in unchanged or (key is None and _snippet(clause) in normalized_contract):
+            section = by_key.get(key) if key is not None else by_key.get(locate_clause(clause, sections))
+            reused_clauses.append(renumber_clause(clause, section))
+    reused_names = {c.clause_name for c in reused_clauses}
+
+    deps = ContractReviewDeps(
+        contract_text=contract_text, policy_text=policy_text, cache=cache,
+        policy_top_k=policy_top_k, metrics=metrics, cascade=cascade, prescreen=prescreen,
+    )
+    deps.extracted_clauses = list(reused_clauses)
+    deps.policy_matches = [m for m in previous_review["policy_matches"] if m.clause_name in reused_names]
+    deps.clause_suggestions = [s for s in previous_review["clause_suggestions"] if s.clause_name in reused_names]
+
+    if diff.changed:
+        # Run the first three stages on just the changed sections
+        partial = ContractReviewDeps(
+            contract_text="\n\n".join(section.text for section in diff.changed),
+            policy_text=policy_text,
+            cache=cache,
+            policy_top_k=policy_top_k,
+            context_savings=deps.context_savings,
+            metrics=metrics,
+            cascade=cascade,
+            cascade_stats=deps.cascade_stats,
+            prescreen=prescreen,
+            prescreen_stats=deps.prescreen_stats,
+        )
+        await run_extraction_stage(partial, chunk_size=chunk_size, max_concurrency=max_concurrency)
+        # Drop re-extracted copies of reused clauses and keep clause names unique, as matches are joined by name
+        new_clauses = partial.extracted_clauses = merge_clauses([partial.extracted_clauses], kept=reused_clauses)
+        if new_clauses:
+            await run_policy_stage(partial, per_clause=per_clause_policy, max_concurrency=max_concurrency)
+            await run_suggestion_stage(partial)
+            deps.extracted_clauses += new_clauses
+            deps.policy_matches += partial.policy_matches
+            deps.clause_suggestions += partial.clause_suggestions
+        stats.rerun_clauses = len(new_clauses)
+    stats.reused_clauses = len(reused_clauses)
+
+    deps.extracted_clauses = order_clauses(deps.extracted_clauses, sections)
+    deps.policy_matches = order_matches(deps.extracted_clauses, deps.policy_matches)
+    position = {clause.clause_name: i for i, clause in enumerate(deps.extracted_clauses)}
+    deps.clause_suggestions.sort(key=lambda suggestion: position.get(suggestion.clause_name, len(position)))
+    final_report = await run_final_stage(deps)
+    results = build_review_results(deps, final_report)
+    results["incremental"] = stats
+    return results
+
+def rereview_contract(contract_text, policy_text, previous_contract_text, previous_review, **options) -> Dict:
+    """Synchronous wrapper around rereview_contract_async"""
+    return run_sync(rereview_contract_async(
+        contract_text, policy_text, previous_contract_text, previous_review, **options
+    ))
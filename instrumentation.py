@@ -0,0 +1,224 @@
+import json
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from cache import model_name
+
+# List prices in USD per million tokens (input, output), used for cost estimates only
+MODEL_PRICES = {
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4o": (2.50, 10.00),
+    "gemini-2.5-flash-preview-04-17": (0.15, 0.60),
+}
+
+# USD per million input tokens served from the provider's prompt cache
+CACHED_INPUT_PRICES = {
+    "gpt-4.1": 0.50,
+    "gpt-4.1-mini": 0.10,
+    "gpt-4.1-nano": 0.025,
+    "gpt-4o": 1.25,
+    "gemini-2.5-flash-preview-04-17": 0.0375,
+}
+
+# Usage detail keys under which providers report cached prompt tokens (OpenAI, Gemini)
+CACHED_TOKEN_DETAILS = ("cached_tokens", "cached_content_token_count")
+
+# Date suffix of provider model snapshots, e.g. "-2025-04-14" in "gpt-4.1-2025-04-14"
+SNAPSHOT_PATTERN = re.compile(r"-\d{4}-\d{2}-\d{2}$")
+
+def canonical_model(configured: str, responded: Optional[str] = None) -> str:
+    """One name per model, whether a call was live or cached: "openai:gpt-4.1" for "gpt-4.1-2025-04-14"
+
+    `configured` is the "provider:model" name the call was made with and
+    `responded` the model name in the response, which reflects
+    Agent.override and fallbacks but drops the provider and adds the snapshot date.
+    """
+    provider, _, name = configured.rpartition(":")
+    name = SNAPSHOT_PATTERN.sub("", responded or name)
+    return f"{provider}:{name}" if provider else name
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int, cached_tokens: int = 0) -> float:
+    """Estimate the USD cost of a call from MODEL_PRICES, or 0.0 for unknown models
+
+    `cached_tokens` of the input tokens are charged at the cached input price.
+    """
+    # Providers report dated snapshots such as "gpt-4.1-mini-2025-04-14", so match the longest prefix
+    name = model.split(":")[-1]
+    matches = [known for known in MODEL_PRICES if name.startswith(known)]
+    if not matches:
+        return 0.0
+    known = max(matches, key=len)
+    prices = MODEL_PRICES[known]
+    cached_price = CACHED_INPUT_PRICES.get(known, prices[0])
+    return ((input_tokens - cached_tokens) * prices[0] + cached_tokens * cached_price + output_tokens * prices[1]) / 1_000_000
+
+def cached_tokens(usage) -> int:
+    """Prompt tokens a provider served from its prompt cache, from the usage details"""
+    details = usage.details or {}
+    return sum(details.get(key, 0) for key in CACHED_TOKEN_DETAILS)
+
+@dataclass
+class AgentCallRecord:
+    """Timing and usage of a single agent call"""
+    stage: str
+    model: str
+    wall_time: float
+    queue_time: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    # Input tokens served from the provider's prompt cache
+    cached_tokens: int = 0
+    requests: int = 0
+    # Model requests after the first: tool round-trips or output validation retries
+    extra_requests: int = 0
+    cached: bool = False
+    cost: float = 0.0
+    contract_id: Optional[str] = None
+    started_at: float = field(default_factory=time.time)
+
+@dataclass
+class StageSummary:
+    """Agent calls aggregated over one stage (or one model)"""
+    calls: int = 0
+    wall_time: float = 0.0
+    call_time: float = 0.0
+    queue_time: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    extra_requests: int = 0
+    cache_hits: int = 0
+    cost: float = 0.0
+    models: Counter = field(default_factory=Counter)
+
+    @property
+    def cached_token_ratio(self) -> float:
+        """Share of input tokens served from the provider's prompt cache"""
+        return self.cached_tokens / self.input_tokens if self.input_tokens else 0.0
+
+    def add(self, record: AgentCallRecord) -> None:
+        self.calls += 1
+        self.call_time += record.wall_time
+        self.queue_time += record.queue_time
+        self.input_tokens += record.input_tokens
+        self.output_tokens += record.output_tokens
+        self.cached_tokens += record.cached_tokens
+        self.extra_requests += record.extra_requests
+        self.cache_hits += record.cached
+        self.cost += record.cost
+        self.models[record.model] += 1
+
+class ReviewMetrics:
+    """Collects an AgentCallRecord for every agent call in a review
+
+    `wall_time` of a stage is measured around the whole stage, so concurrent
+    per-clause or per-chunk calls count once; `call_time` is the sum over the
+    individual calls.
+    """
+
+    def __init__(self, contract_id: Optional[str] = None):
+        self.contract_id = contract_id
+        self.records: List[AgentCallRecord] = []
+        self.stage_times: Dict[str, float] = {}
+
+    def record_run(self, stage: str, agent, result, wall_time: float, queue_time: float = 0.0, model=None) -> AgentCallRecord:
+        """Record an agent run result (or a cache hit) with its timings
+
+        `model` is the model the call was run on when it overrides the agent's own.
+        """
+        usage = result.usage()
+        cached = getattr(result, "cached", False)
+        responded = None
+        if not cached:
+            responses = [m for m in result.new_messages() if m.kind == "response"]
+            if responses:
+                responded = responses[-1].model_name
+        name = canonical_model(model_name(model or agent.model), responded)
+        input_tokens = usage.request_tokens or 0
+        output_tokens = usage.response_tokens or 0
+        prompt_cached = cached_tokens(usage)
+        record = AgentCallRecord(
+            stage=stage,
+            model=name,
+            wall_time=wall_time,
+            queue_time=queue_time,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cached_tokens=prompt_cached,
+            requests=usage.requests,
+            # Usage doesn't tell tool round-trips from retries, so only the count is recorded
+            extra_requests=max(usage.requests - 1, 0),
+            cached=cached,
+            cost=estimate_cost(name, input_tokens, output_tokens, prompt_cached),
+            contract_id=self.contract_id,
+        )
+        self.records.append(record)
+        return record
+
+    @contextmanager
+    def time_stage(self, stage: str):
+        """Measure the wall time of a whole stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_times[stage] = self.stage_times.get(stage, 0.0) + time.perf_counter() - start
+
+    def by_stage(self) -> Dict[str, StageSummary]:
+        summaries: Dict[str, StageSummary] = {}
+        for record in self.records:
+            summaries.setdefault(record.stage, StageSummary()).add(record)
+        for stage, wall_time in self.stage_times.items():
+            summaries.setdefault(stage, StageSummary()).wall_time = wall_time
+        return summaries
+
+    def by_model(self) -> Dict[str, StageSummary]:
+        summaries: Dict[str, StageSummary] = {}
+        for record in self.records:
+            summaries.setdefault(record.model, StageSummary()).add(record)
+        return summaries
+
+    def total(self) -> StageSummary:
+        summary = StageSummary(wall_time=sum(self.stage_times.values()))
+        for record in self.records:
+            summary.add(record)
+        return summary
+
+    def summary(self) -> Dict:
+        """JSON-serializable per-stage, per-model and total aggregates"""
+        def as_dict(s: StageSummary) -> Dict:
+            return {**asdict(s), "models": dict(s.models), "cached_token_ratio": round(s.cached_token_ratio, 3)}
+        return {
+            "contract_id": self.contract_id,
+            "total": as_dict(self.total()),
+            "stages": {stage: as_dict(s) for stage, s in self.by_stage().items()},
+            "models": {model: as_dict(s) for model, s in self.by_model().items()},
+        }
+
+    def to_jsonl(self, file) -> None:
+        """Write one JSON line per agent call to a path or open file"""
+        if isinstance(file, (str, bytes)) or hasattr(file, "__fspath__"):
+            with open(file, "a") as f:
+                self.to_jsonl(f)
+            return
+        for record in self.records:
+            file.write(json.dumps(asdict(record)) + "\n")
+
+def merge_metrics(metrics: Iterable[ReviewMetrics]) -> ReviewMetrics:
+    """Combine the metrics of many reviews, e.g. to aggregate per stage across a portfolio"""
+    merged = ReviewMetrics()
+    for m in metrics:
+        merged.records.extend(m.records)
+        for stage, wall_time in m.stage_times.items():
+            merged.stage_times[stage] = merged.stage_times.get(stage, 0.0) + wall_time
+    return merged
+
+def stage_timer(metrics: Optional[ReviewMetrics], stage: str):
+    """time_stage on the metrics, or a no-op when metrics are not collected"""
+    return metrics.time_stage(stage) if metrics is not None else nullcontext()
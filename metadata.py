@@ -0,0 +1,260 @@
+import re
+from calendar import monthrange
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import create_model
+
+from models import ContractMetadata, ContractValue, DateInfo, Party, PersonalDataInfo
+from prescreen import DAYS_PATTERN, YEARS_PATTERN, parse_count
+from segmentation import split_clauses, split_contract
+
+METADATA_FIELDS = list(ContractMetadata.model_fields)
+
+# Fields with at least this confidence are taken from the local extractor without asking the LLM
+DEFAULT_CONFIDENCE_THRESHOLD = 0.7
+
+PARTIES_BLOCK_PATTERN = re.compile(r"by and between:?(.*?)\(each a \"?Party", re.IGNORECASE | re.DOTALL)
+PARTY_PATTERN = re.compile(r"\*\*([^*]+?)\*\*,?([^\n]*)")
+DEFINED_TERM_PATTERN = re.compile(r"\(\s*(?:collectively,\s*)?\"([^\"]+)\"\s*\)\s*$")
+EFFECTIVE_DATE_PATTERN = re.compile(r"as of ([A-Z][a-z]+ \d{1,2}, \d{4}|\d{4}-\d{2}-\d{2})\s*\(the \"Effective Date\"\)")
+# Absolute date formats found in contracts and returned by the metadata LLM
+DATE_FORMATS = ("%Y-%m-%d", "%B %d, %Y", "%B %d %Y", "%d %B %Y", "%m/%d/%Y")
+TEXT_DATE_PATTERN = re.compile(r"\b([A-Z][a-z]+ \d{1,2}, \d{4}|\d{4}-\d{2}-\d{2})\b")
+NO_VALUE_PATTERN = re.compile(r"no monetary value|no payment shall be made", re.IGNORECASE)
+AMOUNT_PATTERN = re.compile(r"([$€£])\s?(\d[\d,]*(?:\.\d+)?)|\b(USD|EUR|GBP)\s?(\d[\d,]*(?:\.\d+)?)")
+CURRENCIES = {"$": "USD", "€": "EUR", "£": "GBP"}
+PERSONAL_DATA_PATTERN = re.compile(r"personal data|personally identifiable|personal information|\bGDPR\b|\bCCPA\b", re.IGNORECASE)
+TERM_PATTERN = re.compile(r"(?:term of this agreement|shall continue(?: in effect)?) [^.]{0,120}?for a period of ", re.IGNORECASE)
+
+@dataclass
+class LocalMetadata:
+    """ContractMetadata filled by the local parser, with a 0-1 confidence per field
+
+    A field the parser could not find has confidence 0.0 and is left at its
+    default in `metadata`.
+    """
+    metadata: ContractMetadata
+    confidence: Dict[str, float] = field(default_factory=dict)
+
+    def unresolved(self, threshold: float = DEFAULT_CONFIDENCE_THRESHOLD) -> List[str]:
+        """Fields whose confidence is below the threshold"""
+        return [name for name in METADATA_FIELDS if self.confidence.get(name, 0.0) < threshold]
+
+@dataclass
+class HybridMetadata:
+    """Result of extract_metadata_hybrid"""
+    metadata: ContractMetadata
+    confidence: Dict[str, float]
+    llm_fields: List[str] = field(default_factory=list)
+
+def parse_date(text: str) -> Optional[date]:
+    """Parse an absolute date such as "2025-04-23", "April 23, 2025" or "04/23/2025", or None"""
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text.strip(), fmt).date()
+        except ValueError:
+            continue
+    return None
+
+def add_months(start: date, months: int) -> date:
+    """Same day `months` later, clamped to the end of shorter months (January 31st + 1 is February 28th)"""
+    year, month = divmod(start.month - 1 + months, 12)
+    year += start.year
+    return start.replace(year=year, month=month + 1, day=min(start.day, monthrange(year, month + 1)[1]))
+
+def effective_date(contract_text: str) -> Optional[date]:
+    """The contract's "Effective Date" from its preamble, if stated"""
+    effective = EFFECTIVE_DATE_PATTERN.search(contract_text)
+    return parse_date(effective.group(1)) if effective else None
+
+class _ClauseLocator:
+    """Maps character offsets in a contract to "Section 5.2" style references"""
+
+    def __init__(self, contract_text: str):
+        self.contract_text = contract_text
+        self.spans: List[Tuple[int, int, str]] = []
+        for section in split_contract(contract_text):
+            start = contract_text.find(section.text)
+            if section.number is None:
+                self.spans.append((start, start + len(section.text), section.title))
+                continue
+            for clause in split_clauses(section):
+                clause_start = contract_text.find(clause.text, start)
+                if clause_start >= 0:
+                    self.spans.append((clause_start, clause_start + len(clause.text), f"Section {clause.reference}"))
+            # The heading and any text the clauses don't cover fall back to the section itself
+            self.spans.append((start, start + len(section.text), f"Section {section.number}"))
+
+    def reference(self, offset: int) -> Optional[str]:
+        for start, end, reference in self.spans:
+            if start <= offset < end:
+                return reference
+        return None
+
+def _clause_text(text: str) -> str:
+    """Clause text without markdown emphasis, its leading clause number or line breaks"""
+    text = re.sub(r"^\s*\**\d+(?:\.\d+)*\**\s*", "", text.replace("**", ""))
+    return re.sub(r"\s+", " ", text).strip()
+
+def _parties(contract_text: str, locator: _ClauseLocator) -> Tuple[List[Party], float]:
+    block = PARTIES_BLOCK_PATTERN.search(contract_text)
+    if not block:
+        return [], 0.0
+    parties = []
+    for match in PARTY_PATTERN.finditer(block.group(1)):
+        term = DEFINED_TERM_PATTERN.search(match.group(2).strip())
+        parties.append(Party(
+            name=match.group(1).strip().rstrip(","),
+            role=term.group(1) if term else None,
+            clause_reference=locator.reference(block.start(1) + match.start()),
+        ))
+    # A bilateral NDA has two parties; anything else is worth a second look
+    return parties, 0.95 if len(parties) == 2 else (0.6 if parties else 0.0)
+
+def _notice(contract_text: str, locator: _ClauseLocator) -> Tuple[Optional[DateInfo], float]:
+    for match in re.finditer(r"\bnotice\b", contract_text, re.IGNORECASE):
+        window = contract_text[max(0, match.start() - 80):match.start()]
+        if "terminat" not in contract_text[max(0, match.start() - 200):match.end()].lower():
+            continue
+        days = None
+        for days in DAYS_PATTERN.finditer(window):
+            pass
+        if days is None:
+            continue
+        offset = match.start() - len(window) + days.start()
+        description = f"{parse_count(days)} days {window[days.end():].strip()} notice".replace("  ", " ")
+        description = re.sub(r"['’]\s*", "", description)
+        return DateInfo(date=description, clause_reference=locator.reference(offset)), 0.85
+    return None, 0.0
+
+def _termination(contract_text: str, locator: _ClauseLocator) -> Tuple[Optional[DateInfo], float]:
+    term = TERM_PATTERN.search(contract_text)
+    if not term:
+        return None, 0.0
+    years = YEARS_PATTERN.match(contract_text, term.end())
+    if not years:
+        return None, 0.0
+    reference = locator.reference(term.start())
+    start = effective_date(contract_text)
+    if start is None:
+        return DateInfo(date=f"{parse_count(years)} years after the Effective Date", clause_reference=reference), 0.6
+    return DateInfo(date=add_months(start, 12 * parse_count(years)).isoformat(), clause_reference=reference), 0.9
+
+def _contract_value(contract_text: str, locator: _ClauseLocator) -> Tuple[Optional[ContractValue], float]:
+    no_value = NO_VALUE_PATTERN.search(contract_text)
+    amounts = list(AMOUNT_PATTERN.finditer(contract_text))
+    if no_value and not amounts:
+        return ContractValue(amount="0", currency=None, clause_reference=locator.reference(no_value.start())), 0.9
+    if len(amounts) == 1 and not no_value:
+        symbol, value, code, code_value = amounts[0].groups()
+        return ContractValue(
+            amount=(value or code_value).replace(",", ""),
+            currency=CURRENCIES.get(symbol) if symbol else code,
+            clause_reference=locator.reference(amounts[0].start()),
+        ), 0.85
+    # Several amounts (fees, caps, damages) need reading to tell which one is the contract value
+    return None, 0.0
+
+def _personal_data(contract_text: str) -> Tuple[Optional[PersonalDataInfo], float]:
+    if not PERSONAL_DATA_PATTERN.search(contract_text):
+        return PersonalDataInfo(processing="No"), 0.8
+    # Describe processing with the clauses of the first section that deals with personal data
+    for section in split_contract(contract_text):
+        clauses = [c.text for c in split_clauses(section) if PERSONAL_DATA_PATTERN.search(c.text)]
+        if clauses:
+            return PersonalDataInfo(
+                processing="Yes",
+                details=" ".join(_clause_text(c) for c in clauses),
+                clause_reference=f"Section {section.reference}",
+            ), 0.85
+    return PersonalDataInfo(processing="Yes"), 0.6
+
+def extract_local_metadata(contract_text: str) -> LocalMetadata:
+    """Fill ContractMetadata fields that can be parsed from the contract text
+
+    Parties come from the "by and between" block, the termination date from
+    the effective date plus the initial term, the notice period from the
+    termination clause, the contract value from a "no monetary value"
+    statement or a single currency amount, and personal data from
+    GDPR/CCPA/personal data mentions. Every field gets a confidence.
+    """
+    locator = _ClauseLocator(contract_text)
+    parties, parties_confidence = _parties(contract_text, locator)
+    notice, notice_confidence = _notice(contract_text, locator)
+    termination, termination_confidence = _termination(contract_text, locator)
+    value, value_confidence = _contract_value(contract_text, locator)
+    personal_data, personal_data_confidence = _personal_data(contract_text)
+    return LocalMetadata(
+        metadata=ContractMetadata(
+            parties=parties, notice_date=notice, termination_date=termination,
+            contract_value=value, personal_data=personal_data,
+        ),
+        confidence={
+            "parties": parties_confidence,
+            "notice_date": notice_confidence,
+            "termination_date": termination_confidence,
+            "contract_value": value_confidence,
+            "personal_data": personal_data_confidence,
+        },
+    )
+
+def partial_metadata_model(fields: List[str]):
+    """A ContractMetadata variant with only the given fields, as the LLM output schema"""
+    return _partial_metadata_model(tuple(fields))
+
+@lru_cache(maxsize=None)
+def _partial_metadata_model(fields: Tuple[str, ...]):
+    # One class per field set, so its schema string and prompt are built once
+    return create_model(
+        "ContractMetadataFields",
+        __doc__=ContractMetadata.__doc__,
+        **{name: (ContractMetadata.model_fields[name].annotation, ContractMetadata.model_fields[name]) for name in fields},
+    )
+
+def _metadata_chain(llm, fields: List[str], contract_text: str):
+    from prompts import get_metadata_fields_extraction_prompt, get_schema_str
+
+    output_type = partial_metadata_model(fields)
+    chain = get_metadata_fields_extraction_prompt(fields) | llm.with_structured_output(output_type)
+    inputs = {
+        "schema_str": get_schema_str(output_type),
+        "contract_text": contract_text,
+        "chat_history": [],
+    }
+    return chain, inputs
+
+def _merge(local: LocalMetadata, fields: List[str], output) -> HybridMetadata:
+    metadata = local.metadata.model_copy(update={name: getattr(output, name) for name in fields})
+    confidence = {**local.confidence, **{name: 1.0 for name in fields}}
+    return HybridMetadata(metadata=metadata, confidence=confidence, llm_fields=fields)
+
+def extract_metadata_hybrid(contract_text: str, llm, threshold: float = DEFAULT_CONFIDENCE_THRESHOLD) -> HybridMetadata:
+    """Extract ContractMetadata locally, calling the LLM only for the fields the parser could not resolve
+
+    The LLM prompt and output schema are trimmed to the unresolved fields.
+    If every field clears the threshold no LLM call is made. LLM-filled
+    fields are reported in `llm_fields` with confidence 1.0.
+
+    Args:
+        contract_text: The contract text to analyze
+        llm: A LangChain chat model supporting with_structured_output
+        threshold: Minimum local confidence for a field to skip the LLM
+    """
+    local = extract_local_metadata(contract_text)
+    fields = local.unresolved(threshold)
+    if not fields:
+        return HybridMetadata(metadata=local.metadata, confidence=local.confidence)
+    chain, inputs = _metadata_chain(llm, fields, contract_text)
+    return _merge(local, fields, chain.invoke(inputs))
+
+async def extract_metadata_hybrid_async(contract_text: str, llm, threshold: float = DEFAULT_CONFIDENCE_THRESHOLD) -> HybridMetadata:
+    """Async version of extract_metadata_hybrid"""
+    local = extract_local_metadata(contract_text)
+    fields = local.unresolved(threshold)
+    if not fields:
+        return HybridMetadata(metadata=local.metadata, confidence=local.confidence)
+    chain, inputs = _metadata_chain(llm, fields, contract_text)
+    return _merge(local, fields, await chain.ainvoke(inputs))
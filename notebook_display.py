@@ -0,0 +1,105 @@
+"""Notebook display helpers
+
+Kept apart from the review pipeline so that the core modules import without
+IPython; only the notebook needs this module.
+"""
+from IPython.display import HTML, Markdown, display
+
+def display_formatted_sample(content, title, num_lines=10):
+    lines = content.split("\n")
+    sample = "\n".join(lines[:num_lines])
+
+    html = f"""
+    <div style="background-color: #2c3033; color: white; padding: 15px; border-radius: 6px; margin-bottom: 20px;">
+        <h3 style="color: #ffd43b; border-bottom: 1px solid #555; padding-bottom: 5px;">{title}</h3>
+        <pre style="background-color: #3a3f45; padding: 10px; border-radius: 4px; white-space: pre-wrap;">{sample}
+        ...</pre>
+        <p style="color: #aaa; margin-top: 10px; font-size: 0.9em;">
+            Total length: {len(lines)} lines, {len(content)} characters
+        </p>
+    </div>
+    """
+
+    display(HTML(html))
+
+
+def display_agent_review(result):
+    """
+    Formats agent output as Markdown code for display in the notebook.
+    
+    Args:
+        result: The AgentRunResult object containing the review
+    """
+    review_text = result.output
+    
+    markdown = f"""
+```markdown
+{review_text}
+```
+"""
+    
+    return Markdown(markdown)
+
+def format_multi_agent_results(review_results):
+    """Format multi-agent review results as markdown for display"""
+    final_report = review_results["final_report"]
+    extracted_clauses = review_results["extracted_clauses"]
+    policy_matches = review_results["policy_matches"]
+    clause_suggestions = review_results["clause_suggestions"]
+    
+    # Prepare markdown sections
+    final_report_md = f"""## Contract Review Summary
+
+**Overall Compliance Score: {final_report.overall_score}/100**
+
+### Key Strengths
+{chr(10).join([f"- {strength}" for strength in final_report.key_strengths])}
+
+### Key Issues
+{chr(10).join([f"- {issue}" for issue in final_report.key_issues])}
+
+### Recommendations
+{chr(10).join([f"- {rec}" for rec in final_report.recommendations])}
+"""
+    
+    # Format key metrics for display
+    metrics_md = f"""## Review Process Metrics
+
+| Metric | Value |
+|--------|-------|
+| Clauses Extracted | {len(extracted_clauses)} |
+| Non-Compliant Clauses | {len([m for m in policy_matches if not m.compliant])} |
+| Suggestions Made | {len(clause_suggestions)} |
+"""
+    
+    # Sample suggestion if available
+    suggestions_md = ""
+    if clause_suggestions and len(clause_suggestions) > 0:
+        suggestion = clause_suggestions[0]
+        suggestions_md = f"""## Sample Suggestion
+
+**Clause:** {suggestion.clause_name}
+
+**Suggested Revision:**
+```
+{suggestion.suggested_text}
+```
+
+**Explanation:** {suggestion.explanation}
+**Importance:** {suggestion.importance}/10
+"""
+    
+    # Combine all sections
+    full_markdown = f"""# Multi-Agent Contract Review
+
+{final_report_md}
+
+{metrics_md}
+
+{suggestions_md}
+
+---
+*Review performed using a multi-agent system with specialized legal AI roles*
+"""
+    
+    return Markdown(full_markdown)
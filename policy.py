@@ -0,0 +1,168 @@
+import re
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from segmentation import SECTION_HEADING_PATTERN
+
+SECTION_NOT_FOUND = "Policy section not found"
+
+ASPECT_ROW_PATTERN = re.compile(r"^\|\s*\*\*(.+?)\*\*\s*\|\s*(.*?)\s*\|\s*$", re.MULTILINE)
+REFERENCE_NUMBER_PATTERN = re.compile(r"^(?:policy\s+)?(?:section|sec\.?|§)?\s*(\d+)(?:[.:)\-\s]|$)")
+RISK_LEVEL_PATTERN = re.compile(r"\b(High|Medium|Low)\b", re.IGNORECASE)
+
+# Words that carry no meaning when matching a reference against section titles
+STOPWORDS = {"a", "an", "and", "of", "or", "the", "to", "for", "in", "on", "section", "policy", "clause", "nda"}
+# Resolved references memoized per PolicyIndex, which is shared across reviews and sees open-ended LLM references
+RESOLVED_CACHE_SIZE = 1024
+
+def normalize_reference(text: str) -> str:
+    """Lowercase a reference and strip markdown and punctuation noise"""
+    text = re.sub(r"[#*`_\"']", "", text.lower())
+    return re.sub(r"\s+", " ", text).strip(" .:-")
+
+def _stem(token: str) -> str:
+    # Plural folding is enough to match "Remedy" to "Remedies" or "Party" to "Parties"
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    if token.endswith("s") and not token.endswith("ss") and len(token) > 3:
+        return token[:-1]
+    return token
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase, plural-folded terms without stopwords"""
+    return [_stem(t) for t in re.findall(r"[a-z0-9]+", text.lower()) if t not in STOPWORDS]
+
+def _tokens(text: str) -> frozenset:
+    return frozenset(tokenize(text))
+
+@dataclass
+class PolicySection:
+    """A single `## ` section of the policy playbook"""
+    title: str
+    text: str
+    number: Optional[int] = None
+    description: Optional[str] = None
+    aspects: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def heading(self) -> str:
+        return f"{self.number}. {self.title}" if self.number is not None else self.title
+
+    @property
+    def preferred_position(self) -> Optional[str]:
+        return self.aspects.get("Preferred Position")
+
+    @property
+    def alternative_position(self) -> Optional[str]:
+        return self.aspects.get("Alternative Position")
+
+    @property
+    def risk_rating(self) -> Optional[str]:
+        return self.aspects.get("Risk Rating")
+
+    @property
+    def risk_level(self) -> Optional[str]:
+        """Risk rating without the emoji, e.g. "High" """
+        if not self.risk_rating:
+            return None
+        match = RISK_LEVEL_PATTERN.search(self.risk_rating)
+        return match.group(1).capitalize() if match else None
+
+    @property
+    def risk_description(self) -> Optional[str]:
+        return self.aspects.get("Risk Description")
+
+class PolicyIndex:
+    """NDA policy playbook parsed once into sections for fast lookup
+
+    Sections can be looked up by number ("3", "Section 3"), by title
+    ("Term of Agreement"), by full heading ("3. Term of Agreement") or by a
+    loose reference that shares words with a title ("term clause").
+    The last RESOLVED_CACHE_SIZE resolved references are memoized, so
+    repeated lookups are O(1).
+    """
+
+    def __init__(self, policy_text: str):
+        self.policy_text = policy_text
+        self.sections: List[PolicySection] = self._parse(policy_text)
+        self._by_number: Dict[int, PolicySection] = {
+            s.number: s for s in self.sections if s.number is not None
+        }
+        self._by_name: Dict[str, PolicySection] = {}
+        for section in self.sections:
+            self._by_name.setdefault(normalize_reference(section.title), section)
+            self._by_name.setdefault(normalize_reference(section.heading), section)
+        self._title_tokens = [(_tokens(s.title), s) for s in self.sections]
+        self._resolved = lru_cache(maxsize=RESOLVED_CACHE_SIZE)(self._resolve)
+
+    @staticmethod
+    def _parse(policy_text: str) -> List[PolicySection]:
+        headings = list(SECTION_HEADING_PATTERN.finditer(policy_text))
+        sections = []
+        for i, heading in enumerate(headings):
+            end = headings[i + 1].start() if i + 1 < len(headings) else len(policy_text)
+            body = policy_text[heading.start():end].strip()
+            description = re.search(r"\*\*Description:\*\*\s*(.+)", body)
+            sections.append(PolicySection(
+                title=heading.group(2).strip(),
+                text=body,
+                number=int(heading.group(1)) if heading.group(1) else None,
+                description=description.group(1).strip() if description else None,
+                aspects={name.strip(): value for name, value in ASPECT_ROW_PATTERN.findall(body)},
+            ))
+        return sections
+
+    def __len__(self) -> int:
+        return len(self.sections)
+
+    def __iter__(self):
+        return iter(self.sections)
+
+    def get(self, number: int) -> Optional[PolicySection]:
+        """Return the numbered section, if present"""
+        return self._by_number.get(number)
+
+    def lookup(self, reference: str) -> Optional[PolicySection]:
+        """Resolve a free-form policy reference to a section"""
+        return self._resolved(normalize_reference(reference or ""))
+
+    def _resolve(self, key: str) -> Optional[PolicySection]:
+        if not key:
+            return None
+        if key in self._by_name:
+            return self._by_name[key]
+
+        number = REFERENCE_NUMBER_PATTERN.match(key)
+        if number and int(number.group(1)) in self._by_number:
+            return self._by_number[int(number.group(1))]
+
+        # Fall back to word overlap with the section titles, then character similarity
+        tokens = _tokens(key)
+        best, best_score = None, 0.0
+        for title_tokens, section in self._title_tokens:
+            if not title_tokens:
+                continue
+            score = len(tokens & title_tokens) / len(title_tokens)
+            if score > best_score:
+                best, best_score = section, score
+        if best_score >= 0.5:
+            return best
+
+        best, best_score = None, 0.0
+        for section in self.sections:
+            score = SequenceMatcher(None, key, normalize_reference(section.title)).ratio()
+            if score > best_score:
+                best, best_score = section, score
+        return best if best_score >= 0.75 else None
+
+    def section_text(self, reference: str) -> str:
+        """Return the full markdown of the referenced section"""
+        section = self.lookup(reference)
+        return section.text if section else SECTION_NOT_FOUND
+
+@lru_cache(maxsize=8)
+def get_policy_index(policy_text: str) -> PolicyIndex:
+    """Return the PolicyIndex for a policy text, shared across all reviews using it"""
+    return PolicyIndex(policy_text)
@@ -0,0 +1,257 @@
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+from policy import PolicyIndex, PolicySection, get_policy_index
+
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8,
+    "nine": 9, "ten": 10, "fifteen": 15, "twenty": 20, "thirty": 30, "forty-five": 45,
+    "sixty": 60, "ninety": 90,
+}
+_NUMBER = r"(?:\((\d+)\)|\b(\d+)|\b(" + "|".join(NUMBER_WORDS) + r"))"
+# "three (3) years" matches on the number word and skips the parenthesized digit; "3 years" and "(3) years" directly
+YEARS_PATTERN = re.compile(_NUMBER + r"\s*(?:\(\d+\)\s*)?(?:calendar\s+)?years?", re.IGNORECASE)
+DAYS_PATTERN = re.compile(_NUMBER + r"\s*(?:\(\d+\)\s*)?(?:calendar\s+|business\s+)?days?", re.IGNORECASE)
+RANGE_PATTERN = r"(\d+)(?:\s*-\s*(\d+))?"
+# Wording that places a year count as the survival period of the obligations or as the initial term
+SURVIVAL_PATTERN = re.compile(r"surviv|thereafter|post-termination|(?:after|following|from)\s+(?:the\s+)?(?:date\s+of\s+)?(?:any\s+)?(?:termination|expiration|expiry|disclosure)", re.IGNORECASE)
+CONTEXT_END_PATTERN = re.compile(r"[.;,]|$")
+TERM_PATTERN = re.compile(r"\bterm\b|\bcommenc|in (?:full )?(?:force|effect)|\bduration\b|\bexpire", re.IGNORECASE)
+PERPETUAL_PATTERN = re.compile(r"perpetu|indefinite|in no event expire", re.IGNORECASE)
+ORAL_CONFIRMATION_PATTERN = re.compile(r"\borally\b.{0,200}?confirmed in writing within", re.IGNORECASE | re.DOTALL)
+ORAL_EXCLUDED_PATTERN = re.compile(r"disclosed orally shall not|oral disclosures? shall not", re.IGNORECASE)
+GOVERNING_LAW_PATTERN = re.compile(r"laws of (?:the State of )?([A-Z][A-Za-z ]+?)(?:,|\.| without| and the| and shall)", re.IGNORECASE)
+
+# Alignment scores for mechanically certain verdicts
+PREFERRED_ALIGNMENT = 95
+ALTERNATIVE_ALIGNMENT = 75
+DEVIATION_ALIGNMENT = 30
+
+@dataclass
+class RuleVerdict:
+    """A certain policy verdict produced without a model call"""
+    compliant: bool
+    alignment: int
+    policy_reference: str
+    issues: List[str] = field(default_factory=list)
+    rule: str = ""
+
+@dataclass
+class PrescreenStats:
+    """How many clauses the pre-screen resolved, and by which rules"""
+    clauses: int = 0
+    resolved: int = 0
+    rules: Counter = field(default_factory=Counter)
+
+    @property
+    def resolved_rate(self) -> float:
+        return self.resolved / self.clauses if self.clauses else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "clauses": self.clauses,
+            "resolved": self.resolved,
+            "resolved_rate": round(self.resolved_rate, 3),
+            "rules": dict(self.rules),
+        }
+
+def parse_count(match: re.Match) -> int:
+    """Integer value of a YEARS_PATTERN or DAYS_PATTERN match, e.g. 3 for "three (3) years" """
+    digits_in_parens, digits, word = match.groups()
+    return int(digits_in_parens or digits) if (digits_in_parens or digits) else NUMBER_WORDS[word.lower()]
+
+def _range(text: Optional[str], pattern: str) -> Optional[Tuple[int, int]]:
+    """Parse "2-3 years" or "30 days" style ranges out of a policy position"""
+    match = re.search(pattern.replace("{range}", RANGE_PATTERN), text or "", re.IGNORECASE)
+    if not match:
+        return None
+    low = int(match.group(1))
+    return low, int(match.group(2) or low)
+
+def _within(value: int, bounds: Optional[Tuple[int, int]]) -> bool:
+    return bounds is not None and bounds[0] <= value <= bounds[1]
+
+def year_periods(text: str) -> Tuple[List[int], List[int], int]:
+    """Year counts of a clause split into initial terms and survival periods, and how many fit neither
+
+    Each count is classified by the words before it in its sentence, back
+    to the previous count, and after it up to the next comma or semicolon,
+    so "remain in effect for two (2) years, and survive for five (5) years
+    after termination" has a term of 2 and a survival period of 5.
+    """
+    terms, survivals, unclear = [], [], 0
+    matches = list(YEARS_PATTERN.finditer(text))
+    for i, match in enumerate(matches):
+        sentence = max(text.rfind(separator, 0, match.start()) for separator in (". ", "; ", ": ")) + 1
+        start = max(sentence, matches[i - 1].end() if i else 0)
+        end = CONTEXT_END_PATTERN.search(text, match.end()).start()
+        context = text[start:end]
+        if SURVIVAL_PATTERN.search(context):
+            survivals.append(parse_count(match))
+        elif TERM_PATTERN.search(context):
+            terms.append(parse_count(match))
+        else:
+            unclear += 1
+    return terms, survivals, unclear
+
+def _reference(section: PolicySection) -> str:
+    return f"Section {section.heading}"
+
+class PolicyRules:
+    """Mechanical checks compiled from the position tables of the policy playbook
+
+    Each rule reads its thresholds from the Preferred and Alternative
+    Position rows (e.g. "Initial term of 2-3 years"), so the rules follow
+    the playbook when it changes. A rule whose section or numbers cannot be
+    found in the policy is disabled. Rules only answer when the clause text
+    makes the verdict certain; everything else is left to policy_agent.
+    """
+
+    def __init__(self, policy_index: PolicyIndex):
+        self.rules: List[Tuple[str, re.Pattern, Callable[[str], Optional[RuleVerdict]]]] = []
+
+        term = policy_index.lookup("Term of Agreement")
+        if term is not None:
+            self.term_section = term
+            self.term_preferred = _range(term.preferred_position, r"term of {range} years")
+            self.term_alternative = _range(term.alternative_position, r"term of {range} years")
+            self.survival_preferred = _range(term.preferred_position, r"surviving for {range} years")
+            self.survival_alternative = _range(term.alternative_position, r"surviving for {range} years")
+            if self.term_preferred and self.term_alternative:
+                self.rules.append(("term", re.compile(r"\bterm\b|duration", re.IGNORECASE), self.check_term))
+
+        termination = policy_index.lookup("Termination")
+        if termination is not None:
+            self.termination_section = termination
+            self.notice_preferred = _range(termination.preferred_position, r"{range} days written notice")
+            self.notice_alternative = _range(termination.alternative_position, r"{range} days written notice")
+            if self.notice_preferred and self.notice_alternative:
+                self.rules.append(("termination", re.compile(r"terminat", re.IGNORECASE), self.check_termination))
+
+        law = policy_index.lookup("Governing Law and Jurisdiction")
+        if law is not None:
+            self.law_section = law
+            preferred = re.match(r"\s*([A-Z][A-Za-z ]+?) law with exclusive jurisdiction in (.+?) courts", law.preferred_position or "")
+            if preferred:
+                self.preferred_law, self.preferred_venue = preferred.group(1), preferred.group(2).replace(" County", "")
+                self.rules.append(("governing_law", re.compile(r"governing law|jurisdiction|dispute", re.IGNORECASE), self.check_governing_law))
+
+        definition = policy_index.lookup("Definition of Confidential Information")
+        if definition is not None:
+            self.definition_section = definition
+            self.confirmation_days = _range(definition.alternative_position, r"in writing within {range} days")
+            if self.confirmation_days:
+                self.rules.append(("oral_disclosure", re.compile(r"definition|confidential information", re.IGNORECASE), self.check_oral_disclosure))
+
+    def check_term(self, text: str) -> Optional[RuleVerdict]:
+        section = self.term_section
+        if PERPETUAL_PATTERN.search(text):
+            return RuleVerdict(False, DEVIATION_ALIGNMENT, _reference(section), ["Perpetual term or obligations"])
+        terms, survivals, unclear = year_periods(text)
+        # A count that is neither a term nor a survival period, or several of either, is left to the model
+        if unclear or len(set(terms)) > 1 or len(set(survivals)) > 1 or not (terms or survivals):
+            return None
+        term = terms[0] if terms else None
+        survival = survivals[0] if survivals else None
+        if term is not None and not _within(term, self.term_alternative):
+            return RuleVerdict(False, DEVIATION_ALIGNMENT, _reference(section), [
+                f"Term of {term} years is outside the acceptable {self.term_alternative[0]}-{self.term_alternative[1]} years"
+            ])
+        if survival is not None and self.survival_alternative is not None and not _within(survival, self.survival_alternative):
+            return RuleVerdict(False, DEVIATION_ALIGNMENT, _reference(section), [
+                f"Survival of {survival} years is outside the acceptable {self.survival_alternative[0]}-{self.survival_alternative[1]} years"
+            ])
+        # Compliance is only certain when the clause states both the term and the survival period
+        if term is None or survival is None or self.survival_alternative is None:
+            return None
+        if _within(term, self.term_preferred) and _within(survival, self.survival_preferred):
+            return RuleVerdict(True, PREFERRED_ALIGNMENT, _reference(section))
+        return RuleVerdict(True, ALTERNATIVE_ALIGNMENT, _reference(section), [
+            "Term or survival period is within the alternative rather than the preferred position"
+        ])
+
+    def check_termination(self, text: str) -> Optional[RuleVerdict]:
+        section = self.termination_section
+        match = re.search(r"terminat\w*.{0,120}?" + DAYS_PATTERN.pattern, text, re.IGNORECASE | re.DOTALL)
+        if not match:
+            if re.search(r"terminat\w* [^.]{0,60}immediately", text, re.IGNORECASE):
+                return RuleVerdict(False, DEVIATION_ALIGNMENT, _reference(section), ["Termination without a notice period"])
+            return None
+        days = parse_count(re.search(DAYS_PATTERN, match.group(0)))
+        written = "writ" in text[match.start():match.end() + 40].lower()
+        if not _within(days, self.notice_alternative):
+            return RuleVerdict(False, DEVIATION_ALIGNMENT, _reference(section), [
+                f"{days} days notice is outside the acceptable {self.notice_alternative[0]}-{self.notice_alternative[1]} days"
+            ])
+        if not written:
+            return None
+        if _within(days, self.notice_preferred):
+            return RuleVerdict(True, PREFERRED_ALIGNMENT, _reference(section))
+        return RuleVerdict(True, ALTERNATIVE_ALIGNMENT, _reference(section), [
+            f"{days} days notice is acceptable but differs from the preferred {self.notice_preferred[0]} days"
+        ])
+
+    def check_governing_law(self, text: str) -> Optional[RuleVerdict]:
+        section = self.law_section
+        law = GOVERNING_LAW_PATTERN.search(text)
+        if not law:
+            return None
+        exclusive = re.search(r"\bexclusive jurisdiction", text, re.IGNORECASE) and not re.search(r"non-exclusive", text, re.IGNORECASE)
+        if law.group(1).strip().lower() == self.preferred_law.lower():
+            if exclusive and self.preferred_venue.lower() in text.lower():
+                return RuleVerdict(True, PREFERRED_ALIGNMENT, _reference(section))
+            return None
+        # The alternative position needs non-exclusive jurisdiction, so another law with exclusive venue fails both
+        if exclusive or re.search(r"\barbitrat", text, re.IGNORECASE):
+            return RuleVerdict(False, DEVIATION_ALIGNMENT, _reference(section), [
+                f"Governed by the laws of {law.group(1).strip()} with a binding forum outside {self.preferred_venue}"
+            ])
+        return None
+
+    def check_oral_disclosure(self, text: str) -> Optional[RuleVerdict]:
+        section = self.definition_section
+        if ORAL_EXCLUDED_PATTERN.search(text):
+            return RuleVerdict(False, DEVIATION_ALIGNMENT, _reference(section), ["Oral disclosures are excluded from protection"])
+        match = ORAL_CONFIRMATION_PATTERN.search(text)
+        if not match:
+            return None
+        days = DAYS_PATTERN.search(text, match.end())
+        if not days:
+            return None
+        limit = self.confirmation_days[1]
+        if parse_count(days) > limit:
+            return RuleVerdict(False, DEVIATION_ALIGNMENT, _reference(section), [
+                f"Oral disclosures must be confirmed in writing within {parse_count(days)} days, more than {limit}"
+            ])
+        return RuleVerdict(True, ALTERNATIVE_ALIGNMENT, _reference(section), [
+            "Marking or written confirmation requirement is the alternative, not the preferred, position"
+        ])
+
+    def evaluate(self, clause_name: str, clause_text: str) -> Optional[RuleVerdict]:
+        """Return a certain verdict for a clause, or None if it needs the policy_agent
+
+        Rules are selected by the clause name. A clause covering several
+        topics (e.g. "Term and Termination") is certain only if every
+        applicable rule is certain; any certain deviation makes it non-compliant.
+        """
+        verdicts = []
+        for name, applies, check in self.rules:
+            if applies.search(clause_name):
+                verdict = check(clause_text)
+                if verdict is not None:
+                    verdict.rule = name
+                verdicts.append(verdict)
+        failures = [v for v in verdicts if v is not None and not v.compliant]
+        if failures:
+            return failures[0]
+        if not verdicts or any(v is None for v in verdicts):
+            return None
+        return min(verdicts, key=lambda v: v.alignment)
+
+@lru_cache(maxsize=8)
+def get_policy_rules(policy_text: str) -> PolicyRules:
+    """Return the PolicyRules compiled from a policy text, shared across all reviews using it"""
+    return PolicyRules(get_policy_index(policy_text))
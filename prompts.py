@@ -1,5 +1,23 @@
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+import json
+from functools import lru_cache
+
+# Prompt layout: providers cache the longest previously seen prompt prefix
+# (OpenAI from 1024 tokens on), so every template puts its static parts --
+# instructions, output schema, company policy -- first and the per-contract
+# text last. The templates and schema strings are built once and reused, so
+# the prefix is byte-identical across calls. LangChain is imported by the
+# getters, so the review pipeline can import this module without it.
+
+@lru_cache(maxsize=None)
+def get_schema_str(model):
+    """
+    Returns the indented JSON schema of a pydantic model, as used for the {schema_str} prompt variable.
+    Args:
+        model: A pydantic model class, e.g. ContractMetadata
+    """
+    return json.dumps(model.model_json_schema(), indent=2)
 
+@lru_cache(maxsize=None)
 def get_legal_metadata_extraction_prompt():
     """
     Returns a LangChain prompt template for extracting key metadata from legal documents.
@@ -32,6 +50,8 @@ Analyze the document thoroughly to find all relevant information. If there are a
 {contract_text}
 """
 
+    from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+
     prompt = ChatPromptTemplate.from_messages([
         ("system", system_message),
         MessagesPlaceholder(variable_name="chat_history"),
@@ -40,9 +60,11 @@ Analyze the document thoroughly to find all relevant information. If there are a
     
     return prompt
 
+@lru_cache(maxsize=None)
 def get_nda_analysis_prompt():
     """
     Returns a LangChain prompt template for analyzing NDA contracts against company policies.
+    The policy is part of the system message, ahead of the contract, so it is cached with the instructions.
     """
     system_message = """You are a legal analysis assistant specializing in Non-Disclosure Agreements (NDAs).
 Your task is to analyze the provided NDA contract and determine if it complies with the company's NDA policy.
@@ -62,21 +84,77 @@ Focus on the following key areas:
 - Remedies for breach
 
 Output your analysis in a structured format with clear recommendations.
+
+Company NDA Policy:
+{policy_text}
 """
 
     human_message = """Please analyze this NDA contract against our company policy:
 
 NDA Contract:
 {contract_text}
-
-Company NDA Policy:
-{policy_text}
 """
 
+    from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+
     prompt = ChatPromptTemplate.from_messages([
         ("system", system_message),
         MessagesPlaceholder(variable_name="chat_history"),
         ("human", human_message),
     ])
     
-    return prompt
\ No newline at end of file
+    return prompt
+
+# Extraction instructions per ContractMetadata field, used to trim the metadata prompt
+METADATA_FIELD_INSTRUCTIONS = {
+    "parties": "Parties: All parties involved in the contract (including full legal names)",
+    "notice_date": "Notice Date: The date by which notice must be given (if specified)",
+    "termination_date": "Termination Date: The date when the contract terminates",
+    "contract_value": "Contract Value: The monetary value of the contract (if specified)",
+    "personal_data": "Personal Data: Whether the contract involves processing personal data (Yes/No), and if Yes, describe what kind",
+}
+
+def get_metadata_fields_extraction_prompt(fields):
+    """
+    Returns a LangChain prompt template that extracts only the given ContractMetadata fields.
+    Used when a local parser has already resolved the other fields.
+    Args:
+        fields (list): ContractMetadata field names, e.g. ["notice_date", "contract_value"]
+    """
+    return _metadata_fields_extraction_prompt(tuple(fields))
+
+@lru_cache(maxsize=None)
+def _metadata_fields_extraction_prompt(fields):
+    entities = "\n".join(
+        f"{i}. {METADATA_FIELD_INSTRUCTIONS[field]}" for i, field in enumerate(fields, 1)
+    )
+    system_message = """You are a legal analysis assistant specializing in metadata extraction from contracts.
+Extract only the following entities from the provided contract text:
+
+""" + entities.replace("{", "{{").replace("}", "}}") + """
+
+For each entity:
+- Extract the EXACT text from the document where possible
+- Provide section/clause references where the information was found
+- If an entity is not found, state "Not specified in the document"
+- For dates, standardize to ISO format (YYYY-MM-DD) if possible
+- For contract value, include the currency
+
+Output the results in a structured JSON format that follows this schema:
+{schema_str}
+"""
+
+    human_message = """Please extract the requested metadata from the following contract:
+
+{contract_text}
+"""
+
+    from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", system_message),
+        MessagesPlaceholder(variable_name="chat_history"),
+        ("human", human_message),
+    ])
+
+    return prompt
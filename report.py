@@ -0,0 +1,95 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from policy import PolicyIndex, PolicySection
+
+# Weight of a clause's policy_alignment in the overall score, by its policy section's Risk Rating
+RISK_WEIGHTS = {"High": 3.0, "Medium": 2.0, "Low": 1.0}
+# Weight of clauses whose policy reference has no Risk Rating
+DEFAULT_RISK_LEVEL = "Medium"
+
+APPROVAL_SECTION = "Approval Requirements"
+APPROVAL_ROW_PATTERN = re.compile(r"^\|[^|\w]*(High|Medium|Low)\s*\|\s*(.+?)\s*\|\s*$", re.MULTILINE)
+
+@dataclass
+class ReportAggregate:
+    """Overall score and summary lists computed from the structured stage outputs"""
+    overall_score: int
+    key_strengths: List[str] = field(default_factory=list)
+    key_issues: List[str] = field(default_factory=list)
+    recommendations: List[str] = field(default_factory=list)
+
+def approval_requirements(index: PolicyIndex) -> Dict[str, str]:
+    """Approval needed per risk level, from the policy's Approval Requirements table"""
+    section = index.lookup(APPROVAL_SECTION)
+    if section is None:
+        return {}
+    return {level: approval for level, approval in APPROVAL_ROW_PATTERN.findall(section.text)}
+
+def _risk_level(section: Optional[PolicySection]) -> str:
+    level = section.risk_level if section is not None else None
+    return level if level in RISK_WEIGHTS else DEFAULT_RISK_LEVEL
+
+def aggregate_report(index: PolicyIndex, policy_matches: Sequence, clause_suggestions: Sequence = ()) -> ReportAggregate:
+    """Aggregate PolicyMatches and ClauseSuggestions into the final report
+
+    overall_score is the mean policy_alignment weighted by the Risk Rating
+    of each clause's policy section, so a weak High-risk clause costs three
+    times as much as a weak Low-risk one. Strengths and issues are listed
+    by risk, then alignment; recommendations come from the suggestions,
+    the preferred positions of unaddressed sections and the approval the
+    remaining risk requires.
+    """
+    if not policy_matches:
+        return ReportAggregate(
+            overall_score=0,
+            key_issues=["No clauses found that could be assessed against the policy"],
+            recommendations=["Review the contract manually"],
+        )
+
+    rated = []
+    for match in policy_matches:
+        section = index.lookup(match.policy_reference)
+        level = _risk_level(section)
+        rated.append((match, section, level, RISK_WEIGHTS[level]))
+
+    total_weight = sum(weight for *_, weight in rated)
+    overall_score = round(sum(match.policy_alignment * weight for match, *_, weight in rated) / total_weight)
+
+    def heading(match, section) -> str:
+        return section.heading if section is not None else match.policy_reference
+
+    strengths = sorted((r for r in rated if r[0].compliant), key=lambda r: (-r[3], -r[0].policy_alignment))
+    key_strengths = [
+        f"{match.clause_name} complies with {heading(match, section)} ({match.policy_alignment}/100)"
+        for match, section, _, _ in strengths
+    ]
+
+    issues = sorted((r for r in rated if not r[0].compliant), key=lambda r: (-r[3], r[0].policy_alignment))
+    key_issues = [
+        f"{match.clause_name} ({level} risk, {match.policy_alignment}/100): "
+        + ("; ".join(match.issues) if match.issues else f"does not comply with {heading(match, section)}")
+        for match, section, level, _ in issues
+    ]
+
+    suggested = {s.clause_name: s for s in clause_suggestions}
+    recommendations = [
+        f"Revise {s.clause_name}: {s.explanation}"
+        for s in sorted(clause_suggestions, key=lambda s: -s.importance)
+    ]
+    for match, section, _, _ in issues:
+        if match.clause_name not in suggested and section is not None and section.preferred_position:
+            recommendations.append(f"Align {match.clause_name} with {section.heading}: {section.preferred_position}")
+    if issues:
+        highest = issues[0][2]
+        approval = approval_requirements(index).get(highest)
+        if approval:
+            recommendations.append(f"{approval} while {highest} risk issues remain")
+
+    return ReportAggregate(
+        overall_score=overall_score,
+        key_strengths=key_strengths,
+        key_issues=key_issues,
+        recommendations=recommendations,
+    )
@@ -0,0 +1,381 @@
+import json
+import operator
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Column kinds: fixed-width numbers in typed arrays, repeated strings
+# dictionary-encoded as category codes, free text and string lists as
+# JSON-encoded values in one byte buffer with an array of offsets
+INT, FLOAT, BOOL, CATEGORY, TEXT, LIST = "int", "float", "bool", "category", "text", "list"
+ARRAY_TYPECODES = {INT: "q", FLOAT: "d", BOOL: "b", CATEGORY: "I"}
+# Stand-in for None in int columns, e.g. a missing score
+NULL_INT = -(2 ** 63)
+
+def _processes_personal_data(metadata) -> Optional[bool]:
+    if metadata.personal_data is None:
+        return None
+    return metadata.personal_data.processing.strip().lower().startswith("y")
+
+def _get(attribute: str, default=None) -> Callable:
+    """Column getter for a (possibly dotted, possibly None) attribute path"""
+    def get(row):
+        for name in attribute.split("."):
+            row = getattr(row, name, None)
+            if row is None:
+                return default
+        return row
+    return get
+
+# Columns of each table: (name, kind, getter). Every table also has a leading `contract` category column.
+TABLES: Dict[str, List[Tuple[str, str, Callable]]] = {
+    "clauses": [
+        ("clause_name", CATEGORY, _get("clause_name")),
+        ("section_reference", CATEGORY, _get("section_reference")),
+        ("importance", INT, _get("importance")),
+        ("clause_text", TEXT, _get("clause_text")),
+    ],
+    "policy_matches": [
+        ("clause_name", CATEGORY, _get("clause_name")),
+        ("policy_alignment", INT, _get("policy_alignment")),
+        ("policy_reference", CATEGORY, _get("policy_reference")),
+        ("compliant", BOOL, _get("compliant")),
+        ("issues", LIST, _get("issues", [])),
+    ],
+    "suggestions": [
+        ("clause_name", CATEGORY, _get("clause_name")),
+        ("importance", INT, _get("importance")),
+        ("suggested_text", TEXT, _get("suggested_text")),
+        ("explanation", TEXT, _get("explanation")),
+    ],
+    "reports": [
+        ("overall_score", INT, _get("overall_score")),
+        ("key_strengths", LIST, _get("key_strengths", [])),
+        ("key_issues", LIST, _get("key_issues", [])),
+        ("recommendations", LIST, _get("recommendations", [])),
+    ],
+    "metadata": [
+        ("parties", LIST, lambda m: [party.name for party in m.parties]),
+        ("notice_date", CATEGORY, _get("notice_date.date")),
+        ("termination_date", CATEGORY, _get("termination_date.date")),
+        ("contract_value", TEXT, _get("contract_value.amount")),
+        ("currency", CATEGORY, _get("contract_value.currency")),
+        ("personal_data", BOOL, _processes_personal_data),
+        ("personal_data_details", TEXT, _get("personal_data.details")),
+    ],
+}
+
+class Comparison:
+    """Predicate comparing a value with a bound; number columns apply it to all rows at once"""
+
+    def __init__(self, compare: Callable, value):
+        self.compare = compare
+        self.value = value
+
+    def __call__(self, v) -> bool:
+        return v is not None and self.compare(v, self.value)
+
+# Query predicates; a plain value in a query means equality
+def lt(value) -> Callable[[Any], bool]:
+    return Comparison(operator.lt, value)
+
+def le(value) -> Callable[[Any], bool]:
+    return Comparison(operator.le, value)
+
+def gt(value) -> Callable[[Any], bool]:
+    return Comparison(operator.gt, value)
+
+def ge(value) -> Callable[[Any], bool]:
+    return Comparison(operator.ge, value)
+
+def one_of(*values) -> Callable[[Any], bool]:
+    allowed = set(values)
+    return lambda v: v in allowed
+
+def contains(text: str) -> Callable[[Any], bool]:
+    """Case-insensitive substring match for string columns, or membership for list columns"""
+    needle = text.lower()
+    def test(v):
+        if v is None:
+            return False
+        if isinstance(v, list):
+            return any(needle in item.lower() for item in v)
+        return needle in v.lower()
+    return test
+
+def _segment_index(file: Path) -> int:
+    return int(file.stem.split("-")[1])
+
+def _as_test(predicate) -> Callable[[Any], bool]:
+    return predicate if callable(predicate) else (lambda v: v == predicate)
+
+class Column:
+    """One column of a table, backed by a typed array or a byte buffer"""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        if kind in ARRAY_TYPECODES:
+            self.data = array(ARRAY_TYPECODES[kind])
+        else:
+            # Value i is buffer[offsets[i]:offsets[i + 1]]
+            self.buffer = bytearray()
+            self.offsets = array("Q", [0])
+        # Dictionary of a category column; code i stands for values[i]
+        self.values: List[Optional[str]] = []
+        self.codes: Dict[Optional[str], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.data) if self.kind in ARRAY_TYPECODES else len(self.offsets) - 1
+
+    def encode(self, value) -> Any:
+        if self.kind == CATEGORY:
+            code = self.codes.get(value)
+            if code is None:
+                code = self.codes[value] = len(self.values)
+                self.values.append(value)
+            return code
+        if self.kind == INT:
+            return NULL_INT if value is None else value
+        if self.kind == BOOL:
+            # -1 stands for None
+            return -1 if value is None else int(value)
+        return value
+
+    def append(self, value) -> None:
+        if self.kind in ARRAY_TYPECODES:
+            self.data.append(self.encode(value))
+        else:
+            self.buffer += json.dumps(value).encode()
+            self.offsets.append(len(self.buffer))
+
+    def get(self, i: int) -> Any:
+        if self.kind not in ARRAY_TYPECODES:
+            return json.loads(self.buffer[self.offsets[i]:self.offsets[i + 1]])
+        return self.decode(self.data[i])
+
+    def decode(self, value) -> Any:
+        """Value stored as `value` in a typed array"""
+        if self.kind == CATEGORY:
+            return self.values[value]
+        if self.kind == INT:
+            return None if value == NULL_INT else value
+        if self.kind == BOOL:
+            return None if value < 0 else bool(value)
+        return value
+
+    def filter(self, predicate, rows: Optional[Sequence[int]]) -> List[int]:
+        """Indices of `rows` (or of all rows) whose value satisfies the predicate"""
+        test = _as_test(predicate)
+        if self.kind not in ARRAY_TYPECODES:
+            indices = range(len(self)) if rows is None else rows
+            return [i for i in indices if test(self.get(i))]
+        import numpy as np
+
+        # The view is dropped before returning, so the array can still grow
+        values = np.frombuffer(self.data, dtype=self.data.typecode)
+        if rows is not None:
+            rows = np.asarray(rows, dtype=np.intp)
+            values = values[rows]
+        mask = self._mask(predicate, test, values)
+        return (np.flatnonzero(mask) if rows is None else rows[mask]).tolist()
+
+    def _mask(self, predicate, test: Callable, values: "np.ndarray") -> "np.ndarray":
+        import numpy as np
+
+        if self.kind == CATEGORY:
+            # Test each distinct value once, then match the codes
+            matching = [code for code, value in enumerate(self.values) if test(value)]
+        elif self.kind == BOOL:
+            matching = [code for code in (-1, 0, 1) if test(self.decode(code))]
+        elif not callable(predicate):
+            return values == self.encode(predicate)
+        elif isinstance(predicate, Comparison):
+            mask = predicate.compare(values, predicate.value)
+            return mask & (values != NULL_INT) if self.kind == INT else mask
+        else:
+            matching = [value for value in np.unique(values).tolist() if test(self.decode(value))]
+        return np.isin(values, matching)
+
+    def segment(self, start: int) -> Tuple[Dict, bytes]:
+        """Header entry and bytes of the values from row `start` on"""
+        entry = {"kind": self.kind}
+        if self.kind in ARRAY_TYPECODES:
+            blob = self.data[start:].tobytes()
+            if self.kind == CATEGORY:
+                entry["values"] = self.values
+        else:
+            base = self.offsets[start]
+            offsets = array("Q", (offset - base for offset in self.offsets[start + 1:]))
+            entry["offset_bytes"] = len(offsets) * offsets.itemsize
+            blob = offsets.tobytes() + bytes(self.buffer[base:])
+        entry["bytes"] = len(blob)
+        return entry, blob
+
+    def load_segment(self, entry: Dict, blob: bytes) -> None:
+        if self.kind in ARRAY_TYPECODES:
+            data = array(ARRAY_TYPECODES[self.kind])
+            data.frombytes(blob)
+            if self.kind == CATEGORY and data:
+                import numpy as np
+
+                # Segments have their own dictionaries; remap to the column's
+                remap = np.array([self.encode(value) for value in entry["values"]], dtype=data.typecode)
+                data = array("I", remap[np.frombuffer(blob, dtype=data.typecode)].tobytes())
+            self.data.extend(data)
+        else:
+            offsets = array("Q")
+            offsets.frombytes(blob[:entry["offset_bytes"]])
+            base = len(self.buffer)
+            self.offsets.extend(base + offset for offset in offsets)
+            self.buffer += blob[entry["offset_bytes"]:]
+
+class Table:
+    """Append-only columnar table; rows are never materialized as review objects"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.schema = [("contract", CATEGORY, None), *TABLES[name]]
+        self.columns = {column: Column(kind) for column, kind, _ in self.schema}
+        # Rows below this index have been written to disk
+        self.flushed = 0
+
+    def __len__(self) -> int:
+        return len(self.columns["contract"])
+
+    def append(self, contract_id: str, row) -> None:
+        self.columns["contract"].append(contract_id)
+        for column, _, get in self.schema[1:]:
+            self.columns[column].append(get(row))
+
+    def select(self, **predicates) -> List[int]:
+        """Row indices matching every predicate, cheapest columns first"""
+        order = {BOOL: 0, CATEGORY: 1, INT: 2, FLOAT: 2, TEXT: 3, LIST: 3}
+        rows = None
+        for column in sorted(predicates, key=lambda c: order[self.columns[c].kind]):
+            rows = self.columns[column].filter(predicates[column], rows)
+            if not rows:
+                return []
+        return list(range(len(self))) if rows is None else rows
+
+    def rows(self, indices: Iterable[int], columns: Optional[Sequence[str]] = None) -> List[Dict]:
+        names = list(columns) if columns is not None else list(self.columns)
+        return [{name: self.columns[name].get(i) for name in names} for i in indices]
+
+    def segment(self, start: int) -> Tuple[Dict, List[bytes]]:
+        """Header and column blobs of the rows from `start` on"""
+        header = {"table": self.name, "rows": len(self) - start, "columns": []}
+        blobs = []
+        for name, column in self.columns.items():
+            entry, blob = column.segment(start)
+            header["columns"].append({"name": name, **entry})
+            blobs.append(blob)
+        return header, blobs
+
+    def load_segment(self, header: Dict, body: bytes) -> None:
+        offset = 0
+        for entry in header["columns"]:
+            self.columns[entry["name"]].load_segment(entry, body[offset:offset + entry["bytes"]])
+            offset += entry["bytes"]
+        self.flushed = len(self)
+
+class ResultStore:
+    """Compact, append-only columnar store of review results for portfolio queries
+
+    Each review is split into rows of the clauses, policy_matches,
+    suggestions, reports and metadata tables. Numbers and flags are kept in
+    typed arrays and repeated strings (clause names, references, contract
+    ids) as dictionary codes, so a portfolio of reviews takes a fraction of
+    the memory of the Pydantic objects, and filtered queries scan only the
+    columns they test:
+
+        store.query("policy_matches", compliant=False, clause_name=contains("term"), policy_alignment=lt(50))
+        store.contracts("metadata", personal_data=True)
+
+    With a `path`, existing segments are loaded and flush() appends the rows
+    added since the last flush as new segment files.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path is not None else None
+        self.tables = {name: Table(name) for name in TABLES}
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            for file in sorted(self.path.glob("segment-*.bin"), key=_segment_index):
+                self._load(file)
+
+    def append(self, contract_id: str, review: Optional[Dict] = None, metadata=None) -> None:
+        """Add a review (as returned by the review pipeline) and/or ContractMetadata for a contract"""
+        if review is not None:
+            for row in review["extracted_clauses"] or []:
+                self.tables["clauses"].append(contract_id, row)
+            for row in review["policy_matches"] or []:
+                self.tables["policy_matches"].append(contract_id, row)
+            for row in review["clause_suggestions"] or []:
+                self.tables["suggestions"].append(contract_id, row)
+            self.tables["reports"].append(contract_id, review["final_report"])
+        if metadata is not None:
+            self.tables["metadata"].append(contract_id, metadata)
+
+    def extend(self, reviews: Iterable[Tuple[str, Dict]]) -> None:
+        """Bulk-add (contract_id, review) pairs"""
+        for contract_id, review in reviews:
+            self.append(contract_id, review)
+
+    def select(self, table: str, **predicates) -> List[int]:
+        """Row indices of a table matching every predicate"""
+        return self.tables[table].select(**predicates)
+
+    def query(self, table: str, columns: Optional[Sequence[str]] = None, **predicates) -> List[Dict]:
+        """Matching rows of a table as dicts, with all or the given columns"""
+        t = self.tables[table]
+        return t.rows(t.select(**predicates), columns)
+
+    def count(self, table: str, **predicates) -> int:
+        return len(self.select(table, **predicates))
+
+    def contracts(self, table: str, **predicates) -> Set[str]:
+        """Ids of the contracts with at least one matching row"""
+        column = self.tables[table].columns["contract"]
+        return {column.get(i) for i in self.select(table, **predicates)}
+
+    def flush(self) -> None:
+        """Append the rows added since the last flush to the store directory as one segment"""
+        if self.path is None or all(t.flushed == len(t) for t in self.tables.values()):
+            return
+        parts = []
+        for table in self.tables.values():
+            if table.flushed < len(table):
+                parts.append(table.segment(table.flushed))
+        # Numbered after the last segment, so a gap in the numbering never overwrites one
+        last = max((_segment_index(f) for f in self.path.glob("segment-*.bin")), default=-1)
+        file = self.path / f"segment-{last + 1:06d}.bin"
+        tmp = file.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            for header, blobs in parts:
+                encoded = json.dumps(header).encode()
+                f.write(len(encoded).to_bytes(4, "little"))
+                f.write(encoded)
+                for blob in blobs:
+                    f.write(blob)
+        # Readers only ever see complete segments
+        tmp.rename(file)
+        for table in self.tables.values():
+            table.flushed = len(table)
+
+    def _load(self, file: Path) -> None:
+        data = file.read_bytes()
+        offset = 0
+        while offset < len(data):
+            size = int.from_bytes(data[offset:offset + 4], "little")
+            header = json.loads(data[offset + 4:offset + 4 + size])
+            offset += 4 + size
+            body_size = sum(entry["bytes"] for entry in header["columns"])
+            self.tables[header["table"]].load_segment(header, data[offset:offset + body_size])
+            offset += body_size
+
+    def __len__(self) -> int:
+        """Number of reviews in the store"""
+        return len(self.tables["reports"])
@@ -0,0 +1,80 @@
+import math
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from policy import PolicyIndex, PolicySection, get_policy_index, tokenize
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English prose)"""
+    return (len(text) + 3) // 4
+
+@dataclass
+class ContextSavings:
+    """Policy context tokens sent to the models versus pasting the full policy"""
+    full_tokens: int = 0
+    selected_tokens: int = 0
+    calls: int = 0
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.full_tokens - self.selected_tokens
+
+    def record(self, full_text: str, selected_text: str) -> None:
+        self.full_tokens += estimate_tokens(full_text)
+        self.selected_tokens += estimate_tokens(selected_text)
+        self.calls += 1
+
+class PolicyRetriever:
+    """BM25 retriever over the numbered sections of a policy
+
+    Each section (title, description and position table) is one document.
+    Queries are clause names and texts, so a Term clause pulls in
+    "3. Term of Agreement" and "4. Termination" instead of the whole policy.
+    """
+
+    def __init__(self, policy_index: PolicyIndex, k1: float = 1.5, b: float = 0.75):
+        self.sections: List[PolicySection] = [s for s in policy_index if s.number is not None]
+        self.k1 = k1
+        self.b = b
+        # Titles are repeated so a title hit outweighs an incidental mention in the body
+        documents = [tokenize(f"{s.title} {s.title} {s.text}") for s in self.sections]
+        self._term_counts = [Counter(doc) for doc in documents]
+        self._lengths = [len(doc) for doc in documents]
+        self._average_length = sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+        document_frequency = Counter(term for doc in documents for term in set(doc))
+        n = len(documents)
+        self._idf: Dict[str, float] = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in document_frequency.items()
+        }
+
+    def search(self, query: str, top_k: int = 3) -> List[Tuple[PolicySection, float]]:
+        """Return the top_k sections for a query with their BM25 scores"""
+        terms = [t for t in tokenize(query) if t in self._idf]
+        scores = []
+        for section, counts, length in zip(self.sections, self._term_counts, self._lengths):
+            score = 0.0
+            for term in terms:
+                frequency = counts.get(term, 0)
+                if frequency:
+                    norm = self.k1 * (1 - self.b + self.b * length / self._average_length)
+                    score += self._idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+            if score > 0:
+                scores.append((section, score))
+        scores.sort(key=lambda item: item[1], reverse=True)
+        return scores[:top_k]
+
+    def select(self, queries: List[str], top_k: int = 3) -> List[PolicySection]:
+        """Union of the top_k sections for each query, in policy order"""
+        selected = {id(section) for query in queries for section, _ in self.search(query, top_k)}
+        return [section for section in self.sections if id(section) in selected]
+
+    def context(self, queries: List[str], top_k: int = 3) -> str:
+        """Markdown of the sections selected for the queries"""
+        return "\n\n".join(section.text for section in self.select(queries, top_k))
+
+@lru_cache(maxsize=8)
+def get_policy_retriever(policy_text: str) -> PolicyRetriever:
+    """Return the PolicyRetriever for a policy text, shared across all reviews using it"""
+    return PolicyRetriever(get_policy_index(policy_text))
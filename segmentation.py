@@ -0,0 +1,154 @@
+import argparse
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+# "## 3. Term of Agreement" in contracts and in the policy playbook
+SECTION_HEADING_PATTERN = re.compile(r"^##\s+(?:(\d+)\.\s*)?(.+?)\s*$", re.MULTILINE)
+# Numbered sub-clauses such as "5.1 The term..." or "**2.1 "Confidential Information"** means..."
+CLAUSE_NUMBER_PATTERN = re.compile(r"^[ \t]*\**(\d+\.\d+)\b", re.MULTILINE)
+PREAMBLE_TITLE = "Preamble"
+DEFAULT_CHUNK_SIZE = 8000
+# Smaller chunks leave no room for a clause next to the repeated section heading
+MIN_CHUNK_SIZE = 500
+
+@dataclass
+class ContractSection:
+    """A top-level `## ` section of a contract"""
+    title: str
+    text: str
+    number: Optional[int] = None
+
+    @property
+    def reference(self) -> str:
+        """Section reference as the extractor would cite it, e.g. "5" or "RECITALS" """
+        return str(self.number) if self.number is not None else self.title
+
+    @property
+    def body(self) -> str:
+        """Section text without its heading line"""
+        if not self.text.startswith("##"):
+            return self.text
+        return self.text.partition("\n")[2].strip()
+
+    @property
+    def key(self) -> str:
+        """Identity used to match a section across revisions, independent of numbering"""
+        return normalize_text(self.title)
+
+@dataclass
+class ContractClause:
+    """A numbered sub-clause of a contract section, e.g. "5.1" """
+    reference: str
+    text: str
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace and markdown emphasis so formatting-only edits compare equal"""
+    text = re.sub(r"[*_`]", "", text)
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+def split_contract(contract_text: str) -> List[ContractSection]:
+    """Split a markdown contract into its `## ` sections
+
+    Text before the first heading (title, parties, recitals) becomes a
+    "Preamble" section, so every character of the contract belongs to
+    exactly one section.
+    """
+    headings = list(SECTION_HEADING_PATTERN.finditer(contract_text))
+    sections = []
+    preamble = contract_text[:headings[0].start()] if headings else contract_text
+    if preamble.strip():
+        sections.append(ContractSection(title=PREAMBLE_TITLE, text=preamble.strip()))
+    for i, heading in enumerate(headings):
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(contract_text)
+        sections.append(ContractSection(
+            title=heading.group(2).strip(),
+            text=contract_text[heading.start():end].strip(),
+            number=int(heading.group(1)) if heading.group(1) else None,
+        ))
+    return sections
+
+def split_clauses(section: ContractSection) -> List[ContractClause]:
+    """Split a section into its numbered sub-clauses
+
+    Any text between the heading and the first numbered clause is kept with
+    the first clause. A section without numbered clauses is one clause
+    referenced by the section itself.
+    """
+    body = section.body
+    matches = list(CLAUSE_NUMBER_PATTERN.finditer(body))
+    if not matches:
+        return [ContractClause(reference=section.reference, text=body)]
+    clauses = []
+    for i, match in enumerate(matches):
+        start = 0 if i == 0 else match.start()
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(body)
+        clauses.append(ContractClause(reference=match.group(1), text=body[start:end].strip()))
+    return clauses
+
+def _split_paragraphs(text: str, max_chars: int) -> List[str]:
+    """Split text on blank lines, then wrap any paragraph still longer than max_chars at whitespace
+
+    Only a word longer than max_chars is cut in the middle.
+    """
+    if max_chars < 1:
+        raise ValueError(f"max_chars must be positive, got {max_chars}")
+    parts = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        while len(paragraph) > max_chars:
+            cut = max(paragraph.rfind(" ", 0, max_chars + 1), paragraph.rfind("\n", 0, max_chars + 1))
+            if cut <= 0:
+                cut = max_chars
+            parts.append(paragraph[:cut].rstrip())
+            paragraph = paragraph[cut:].lstrip()
+        if paragraph.strip():
+            parts.append(paragraph)
+    return parts
+
+def _pack(pieces: List[str], max_chars: int, prefix: str = "") -> List[str]:
+    """Greedily pack pieces in order into chunks of at most max_chars"""
+    chunks, current = [], []
+    size = len(prefix)
+    for piece in pieces:
+        if current and size + len(piece) + 2 > max_chars:
+            chunks.append(prefix + "\n\n".join(current))
+            current, size = [], len(prefix)
+        current.append(piece)
+        size += len(piece) + 2
+    if current:
+        chunks.append(prefix + "\n\n".join(current))
+    return chunks
+
+def chunk_size(text: str) -> int:
+    """argparse type for --chunk-size, rejecting sizes below MIN_CHUNK_SIZE"""
+    value = int(text)
+    if value < MIN_CHUNK_SIZE:
+        raise argparse.ArgumentTypeError(f"must be at least {MIN_CHUNK_SIZE} characters, got {value}")
+    return value
+
+def chunk_contract(contract_text: str, max_chars: int = DEFAULT_CHUNK_SIZE) -> List[str]:
+    """Split a contract into chunks of whole sections for parallel extraction
+
+    Sections are packed in document order and are only split when a single
+    section is longer than max_chars. In that case it is split between
+    numbered clauses (or paragraphs), and every part repeats the section
+    heading so section references stay stable. The result depends only on
+    the text and max_chars, which must be at least MIN_CHUNK_SIZE.
+    """
+    if max_chars < MIN_CHUNK_SIZE:
+        raise ValueError(f"Chunk size must be at least {MIN_CHUNK_SIZE} characters, got {max_chars}")
+    pieces = []
+    for section in split_contract(contract_text):
+        if len(section.text) <= max_chars:
+            pieces.append(section.text)
+            continue
+        heading = section.text.partition("\n")[0] if section.text.startswith("##") else ""
+        prefix = f"{heading}\n\n" if heading else ""
+        budget = max_chars - len(prefix)
+        if budget < MIN_CHUNK_SIZE // 2:
+            raise ValueError(f"Chunk size {max_chars} leaves too little room after the heading {heading!r}")
+        clause_texts = []
+        for clause in split_clauses(section):
+            clause_texts.extend(_split_paragraphs(clause.text, budget) if len(clause.text) > budget else [clause.text])
+        pieces.extend(_pack(clause_texts, max_chars, prefix))
+    return _pack(pieces, max_chars)
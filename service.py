@@ -0,0 +1,350 @@
+"""Long-running review service
+
+Keeps the review agents warm and runs them on one pooled HTTP client, so
+connections to the model providers are reused across contracts instead of
+being set up for every script run. Contracts are accepted over a small JSON
+HTTP API and reviewed by a fixed pool of workers:
+
+    python service.py --port 8000 --concurrency 16 --queue-size 64
+    curl -X POST localhost:8000/reviews -d '{"contract_id": "a", "contract_text": "..."}'
+
+When the queue is full new contracts are rejected with 503 and a
+Retry-After header instead of piling up in memory.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from batch import BatchResult, review_contract
+from cache import LLMCache, model_name
+from cascade import CascadeConfig
+from checkpoint import CheckpointStore
+from clause_index import ClauseIndex
+from hedging import HedgeConfig
+from policy import get_policy_index
+from prescreen import get_policy_rules
+from retrieval import get_policy_retriever
+from segmentation import chunk_size
+from utils import load_markdown_file
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+class BadRequest(ValueError):
+    """Raised by read_http_request for a request that is not valid HTTP/1.1"""
+
+# (method, path, headers, body) -> (status, JSON body, extra headers)
+HttpHandler = Callable[[str, str, Dict[str, str], bytes], Awaitable[Tuple[int, Dict, Dict[str, str]]]]
+
+async def read_http_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    """Read one HTTP/1.1 request, or return None when the client closed the connection"""
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    parts = request_line.decode("latin-1").split()
+    if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+        raise BadRequest(f"Malformed request line {request_line.strip()[:100]!r}")
+    method, path, _ = parts
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = headers.get("content-length", "0")
+    if not length.isdigit():
+        raise BadRequest(f"Invalid Content-Length {length[:100]!r}")
+    body = await reader.readexactly(int(length))
+    return method, path, headers, body
+
+async def write_http_response(writer: asyncio.StreamWriter, status: int, body: Dict, headers: Optional[Dict[str, str]] = None) -> None:
+    payload = json.dumps(body).encode()
+    lines = [
+        f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(payload)}",
+        *(f"{name}: {value}" for name, value in (headers or {}).items()),
+    ]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + payload)
+    await writer.drain()
+
+async def serve_http(
+    handler: HttpHandler, host: str, port: int, on_connect: Optional[Callable[[], Awaitable]] = None
+) -> asyncio.Server:
+    """Start a minimal keep-alive HTTP/1.1 JSON server
+
+    Each connection serves requests until the client closes it, so pooled
+    clients reuse it. A malformed request gets a 400 and the connection is
+    closed. `on_connect` is awaited once per new connection.
+    """
+    async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            if on_connect is not None:
+                await on_connect()
+            while (request := await read_http_request(reader)) is not None:
+                status, body, headers = await handler(*request)
+                await write_http_response(writer, status, body, headers)
+                if request[2].get("connection", "").lower() == "close":
+                    break
+        except BadRequest as e:
+            await write_http_response(writer, 400, {"error": str(e)}, {"Connection": "close"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle_connection, host, port)
+
+def pooled_models(http_client, base_url: Optional[str] = None) -> Callable:
+    """Return a function converting a model into one sharing `http_client`
+
+    OpenAI models share one provider on `http_client`, optionally pointed at
+    an OpenAI-compatible endpoint at `base_url`; Gemini models get a provider
+    on the same client. Other models are returned as they are.
+    """
+    from pydantic_ai.providers.openai import OpenAIProvider
+
+    openai_provider = OpenAIProvider(base_url=base_url, http_client=http_client)
+
+    def pooled(model):
+        provider, _, name = model_name(model).partition(":")
+        if provider == "openai":
+            from pydantic_ai.models.openai import OpenAIModel
+
+            return OpenAIModel(name, provider=openai_provider)
+        if provider == "google-gla":
+            from pydantic_ai.models.gemini import GeminiModel
+            from pydantic_ai.providers.google_gla import GoogleGLAProvider
+
+            return GeminiModel(name, provider=GoogleGLAProvider(http_client=http_client))
+        return model
+
+    return pooled
+
+def review_agent_models(convert: Callable) -> Dict[str, object]:
+    """The review agents' models converted by `convert`, by agent name, for ContractReviewDeps.models
+
+    The shared agents are left untouched, so services and batches in one
+    process can each run them on their own client.
+    """
+    import agents
+
+    return {
+        agent.name: convert(agent.model)
+        for agent in (agents.get_extractor_agent(), agents.get_policy_agent(), agents.get_suggestion_agent(), agents.get_narrator())
+    }
+
+class ServiceBusy(Exception):
+    """Raised by ReviewService.submit when the review queue is full"""
+
+@dataclass
+class ServiceStats:
+    """Counters and recent end-to-end latencies (queueing included) of a ReviewService"""
+    accepted: int = 0
+    rejected: int = 0
+    completed: int = 0
+    failed: int = 0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=10_000), repr=False)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def to_dict(self) -> Dict:
+        return {
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "failed": self.failed,
+            **{f"p{round(q * 100)}": self.percentile(q) for q in (0.5, 0.95, 0.99)},
+        }
+
+class ReviewService:
+    """Review worker pool with warm agents and one pooled async HTTP client
+
+    `concurrency` workers take contracts from a queue of at most
+    `queue_size` waiting contracts and share one limiter, so no more than
+    `concurrency` agent calls are in flight. The agents, the policy index,
+    rules and retriever are prepared once in start() and reused for every
+    contract. Extra keyword arguments (prescreen, policy_top_k,
+    per_clause_policy, max_retries, ...) are passed on to
+    batch.review_contract.
+
+    Use as an async context manager, then submit() or review() contracts,
+    or expose them over HTTP with serve().
+    """
+
+    def __init__(
+        self,
+        policy_text: str,
+        concurrency: int = 16,
+        queue_size: int = 64,
+        base_url: Optional[str] = None,
+        cascade: Optional[CascadeConfig] = None,
+        cache: Optional[LLMCache] = None,
+        hedge: Optional[HedgeConfig] = None,
+        **options,
+    ):
+        self.policy_text = policy_text
+        self.concurrency = concurrency
+        self.base_url = base_url
+        self.cascade = cascade
+        self.cache = cache
+        self.hedge = hedge
+        self.options = options
+        self.stats = ServiceStats()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.http_client = None
+        self._limiter: Optional[asyncio.Semaphore] = None
+        self.models: Dict[str, object] = {}
+        self._workers = []
+
+    async def start(self) -> None:
+        """Open the pooled HTTP client, bind the agents to it and start the workers"""
+        import httpx
+
+        # Enough keep-alive connections for every in-flight call, so none is re-established under load
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        self.http_client = httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(600, connect=10))
+        pooled = pooled_models(self.http_client, self.base_url)
+        self.models = review_agent_models(pooled)
+        if self.cascade is not None:
+            self.cascade = replace(self.cascade, small_model=pooled(self.cascade.small_model))
+        if self.hedge is not None:
+            self.hedge = replace(self.hedge, secondary_model=pooled(self.hedge.secondary_model))
+        # Warm the per-policy state every review would otherwise build on first use
+        get_policy_index(self.policy_text)
+        if self.options.get("prescreen"):
+            get_policy_rules(self.policy_text)
+        if self.options.get("policy_top_k") is not None:
+            get_policy_retriever(self.policy_text)
+        self._limiter = asyncio.Semaphore(self.concurrency)
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+
+    async def close(self) -> None:
+        """Stop the workers, failing queued contracts, and close the HTTP client"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        while not self.queue.empty():
+            _, _, future, _ = self.queue.get_nowait()
+            future.cancel()
+        if self.http_client is not None:
+            await self.http_client.aclose()
+
+    async def __aenter__(self) -> "ReviewService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def submit(self, job_id: str, contract_text: str) -> asyncio.Future:
+        """Queue a contract for review and return a future of its BatchResult
+
+        Raises ServiceBusy without queueing if the queue is full.
+        """
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((job_id, contract_text, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.stats.rejected += 1
+            raise ServiceBusy(f"Review queue is full ({self.queue.maxsize} contracts waiting)") from None
+        self.stats.accepted += 1
+        return future
+
+    async def review(self, job_id: str, contract_text: str) -> BatchResult:
+        """Submit a contract and wait for its review"""
+        return await self.submit(job_id, contract_text)
+
+    async def _work(self) -> None:
+        while True:
+            job_id, contract_text, future, submitted_at = await self.queue.get()
+            result = await review_contract(
+                job_id, contract_text, self.policy_text, limiter=self._limiter,
+                cache=self.cache, cascade=self.cascade, hedge=self.hedge, models=self.models, **self.options,
+            )
+            self.stats.latencies.append(time.perf_counter() - submitted_at)
+            if result.ok:
+                self.stats.completed += 1
+            else:
+                self.stats.failed += 1
+            if not future.done():
+                future.set_result(result)
+
+    async def handle(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> Tuple[int, Dict, Dict[str, str]]:
+        """HTTP API: POST /reviews with {"contract_id", "contract_text"}, GET /health"""
+        if method == "GET" and path == "/health":
+            health = {"status": "ok", "queued": self.queue.qsize(), **self.stats.to_dict()}
+            if self.options.get("clause_index") is not None:
+                health["clause_index"] = self.options["clause_index"].stats.to_dict()
+            return 200, health, {}
+        if method != "POST" or path != "/reviews":
+            return 404, {"error": f"No route for {method} {path}"}, {}
+        try:
+            request = json.loads(body)
+            contract_text = request["contract_text"]
+        except (ValueError, KeyError, TypeError):
+            return 400, {"error": "Expected a JSON object with contract_text"}, {}
+        job_id = request.get("contract_id") or f"contract-{self.stats.accepted + 1}"
+        try:
+            future = self.submit(job_id, contract_text)
+        except ServiceBusy as e:
+            return 503, {"error": str(e)}, {"Retry-After": "1"}
+        result = await future
+        return (200 if result.ok else 500), result.to_dict(), {}
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8000) -> asyncio.Server:
+        """Expose the service over HTTP; port 0 picks a free port"""
+        return await serve_http(self.handle, host, port)
+
+async def _run_cli(args) -> int:
+    cascade = CascadeConfig(small_model=args.cascade_model) if args.cascade_model else None
+    cache = LLMCache(args.cache) if args.cache else None
+    checkpoints = CheckpointStore(args.checkpoints) if args.checkpoints else None
+    hedge = HedgeConfig(secondary_model=args.hedge_model, percentile=args.hedge_percentile) if args.hedge_model else None
+    clause_index = ClauseIndex(args.clause_index, threshold=args.clause_similarity) if args.clause_index else None
+    service = ReviewService(
+        load_markdown_file(args.policy), concurrency=args.concurrency, queue_size=args.queue_size,
+        base_url=args.base_url, cascade=cascade, cache=cache, prescreen=args.prescreen,
+        policy_top_k=args.policy_top_k, per_clause_policy=args.per_clause_policy, chunk_size=args.chunk_size,
+        checkpoints=checkpoints, hedge=hedge, clause_index=clause_index,
+    )
+    async with service:
+        server = await service.serve(args.host, args.port)
+        print(f"Reviewing contracts on http://{args.host}:{server.sockets[0].getsockname()[1]}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+    return 0
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve contract reviews over HTTP with warm agents")
+    parser.add_argument("--policy", default="data/nda_policy.md", help="Path to the NDA policy")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument("--concurrency", type=int, default=16, help="Maximum concurrent contracts and agent calls")
+    parser.add_argument("--queue-size", type=int, default=64, help="Contracts that may wait before requests are rejected")
+    parser.add_argument("--base-url", help="OpenAI-compatible endpoint to send OpenAI model calls to")
+    parser.add_argument("--per-clause-policy", action="store_true", help="Check each clause in its own call")
+    parser.add_argument("--chunk-size", type=chunk_size, help="Extract clauses from chunks of this many characters")
+    parser.add_argument("--policy-top-k", type=int, help="Send only the top-k relevant policy sections per clause")
+    parser.add_argument("--prescreen", action="store_true", help="Resolve mechanically checkable clauses with policy rules")
+    parser.add_argument("--cascade-model", help="Check policy on this small model first, e.g. openai:gpt-4.1-mini")
+    parser.add_argument("--hedge-model", help="Also send slow calls to this model, e.g. google-gla:gemini-2.5-flash-preview-04-17")
+    parser.add_argument("--hedge-percentile", type=float, default=0.95, help="Latency percentile after which calls are hedged")
+    parser.add_argument("--cache", help="Path to an SQLite cache for agent outputs")
+    parser.add_argument("--clause-index", help="Path to an SQLite index of reviewed clauses whose verdicts near-duplicates reuse")
+    parser.add_argument("--clause-similarity", type=float, default=0.8, help="Minimum similarity for a clause to reuse a verdict")
+    parser.add_argument("--checkpoints", help="Path to an SQLite store of completed stages, to resume interrupted runs")
+    args = parser.parse_args(argv)
+    try:
+        return asyncio.run(_run_cli(args))
+    except KeyboardInterrupt:
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
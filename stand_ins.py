@@ -0,0 +1,386 @@
+"""Deterministic stand-ins for the review agents and metadata chains.
+
+The stand-ins derive their outputs from the prompt text alone and sleep for
+a configurable simulated latency, so the full pipeline can be exercised
+offline (benchmarks, local services) without API keys or network noise.
+"""
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, DeltaToolCall, FunctionModel
+
+from models import ContractMetadata, Party
+from retrieval import estimate_tokens, get_policy_retriever
+from segmentation import split_clauses, split_contract
+
+CLAUSE_PATTERN = re.compile(r"^Clause: ([^\n]+)\nReference: ([^\n]*)\nText: (.*?)(?=\n\nClause: |\Z)", re.MULTILINE | re.DOTALL)
+POLICY_PATTERN = re.compile(r"Company NDA Policy:\n(.*?)\n\nAnalyze these contract clauses", re.DOTALL)
+SUGGESTION_CLAUSE_PATTERN = re.compile(r"^Clause: (.+)$", re.MULTILINE)
+JSON_BLOCK_PATTERN = re.compile(r"```json\n(.*?)\n```", re.DOTALL)
+PARTY_PATTERN = re.compile(r"^\*\*([A-Z0-9][^*]+?)\*\*,", re.MULTILINE)
+
+@dataclass
+class SimulatedLatency:
+    """Latency model for a stand-in call
+
+    Each call sleeps base + per_output_token * output tokens seconds, plus a
+    jitter of up to +/- `jitter` seconds drawn from a generator seeded with
+    the prompt, so the same prompt always gets the same latency. A
+    `tail_rate` share of calls is `tail_factor` times slower; give two
+    providers different seeds so their slow calls are independent.
+    """
+    base: float = 0.0
+    per_output_token: float = 0.0
+    jitter: float = 0.0
+    tail_rate: float = 0.0
+    tail_factor: float = 10.0
+    seed: int = 0
+
+    def delay(self, prompt: str, output_tokens: int) -> float:
+        seed = int.from_bytes(hashlib.sha256(prompt.encode()).digest()[:8], "big") + self.seed
+        rng = random.Random(seed)
+        noise = rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        delay = max(0.0, self.base + self.per_output_token * output_tokens + noise)
+        if self.tail_rate and rng.random() < self.tail_rate:
+            delay *= self.tail_factor
+        return delay
+
+def _score(text: str) -> int:
+    """Deterministic 0-99 score derived from the text"""
+    return int.from_bytes(hashlib.sha256(text.encode()).digest()[:4], "big") % 100
+
+def _last_prompt(messages: List[ModelMessage]) -> str:
+    return "\n".join(str(part.content) for part in messages[-1].parts if part.part_kind == "user-prompt")
+
+def extract_clauses(prompt: str) -> List[Dict]:
+    """One clause per numbered contract section, citing its first sub-clause"""
+    clauses = []
+    for section in split_contract(prompt):
+        if section.number is None:
+            continue
+        first = split_clauses(section)[0]
+        clauses.append({
+            "clause_name": section.title.title(),
+            "section_reference": first.reference,
+            "clause_text": first.text[:400],
+            "importance": 1 + _score(section.title) % 10,
+        })
+    return clauses
+
+def check_policy(prompt: str) -> List[Dict]:
+    """Score each clause and cite the best matching section of the policy in the prompt"""
+    policy = POLICY_PATTERN.search(prompt)
+    retriever = get_policy_retriever(policy.group(1) if policy else "")
+    clauses = prompt.partition("Contract Clauses:")[2]
+    matches = []
+    for name, reference, text in CLAUSE_PATTERN.findall(clauses):
+        alignment = 40 + _score(name + text) % 61
+        best = retriever.search(f"{name} {text}", top_k=1)
+        compliant = alignment >= 70
+        matches.append({
+            "clause_name": name,
+            "policy_alignment": alignment,
+            "policy_reference": f"Section {best[0][0].number}" if best else "Not found",
+            "issues": [] if compliant else [f"{name} deviates from the preferred position"],
+            "compliant": compliant,
+        })
+    return matches
+
+def suggest_improvements(prompt: str) -> List[Dict]:
+    return [
+        {
+            "clause_name": name,
+            "suggested_text": f"Revised {name} clause aligned with the preferred policy position.",
+            "explanation": f"Brings {name} in line with company policy.",
+            "importance": 1 + _score(name) % 10,
+        }
+        for name in SUGGESTION_CLAUSE_PATTERN.findall(prompt)
+    ]
+
+def summarize_review(prompt: str) -> Dict:
+    block = JSON_BLOCK_PATTERN.search(prompt)
+    data = json.loads(block.group(1)) if block else {}
+    matches = data.get("policy_matches", [])
+    score = round(sum(m["policy_alignment"] for m in matches) / len(matches)) if matches else 0
+    return {
+        "overall_score": score,
+        "key_strengths": [m["clause_name"] for m in matches if m["compliant"]],
+        "key_issues": [issue for m in matches for issue in m["issues"]],
+        "recommendations": [f"Revise {s['clause_name']}" for s in data.get("suggestions", [])],
+    }
+
+def fail_first(respond):
+    """Wrap a responder so the first call with each distinct prompt fails, like a transient provider error"""
+    seen = set()
+
+    def flaky(prompt: str):
+        if prompt not in seen:
+            seen.add(prompt)
+            raise RuntimeError("stand-in transient failure")
+        return respond(prompt)
+    return flaky
+
+class PromptCache:
+    """Simulated provider-side prompt cache
+
+    Like OpenAI's automatic prompt caching, a request is served the longest
+    prefix it shares with an earlier request, counted in blocks of
+    `block_tokens` and only from `min_tokens` on. Tokens are the
+    whitespace-separated words of the system prompts and user prompt.
+    """
+
+    def __init__(self, min_tokens: int = 1024, block_tokens: int = 128):
+        self.min_tokens = min_tokens
+        self.block_tokens = block_tokens
+        self._prefixes = set()
+
+    def lookup(self, text: str) -> int:
+        """Cached tokens for a request, remembering its prefixes for later requests"""
+        tokens = text.split()
+        prefix = hashlib.sha256()
+        cached = 0
+        for end in range(self.block_tokens, len(tokens) + 1, self.block_tokens):
+            prefix.update(" ".join(tokens[end - self.block_tokens:end]).encode() + b" ")
+            digest = prefix.digest()
+            if digest in self._prefixes:
+                cached = end
+            self._prefixes.add(digest)
+        return cached if cached >= self.min_tokens else 0
+
+def _request_text(messages: List[ModelMessage]) -> str:
+    return "\n".join(
+        str(part.content)
+        for message in messages if isinstance(message, ModelRequest)
+        for part in message.parts if part.part_kind in ("system-prompt", "user-prompt")
+    )
+
+class StandInModel(FunctionModel):
+    """FunctionModel that reports prompt cache hits in its usage details, as OpenAI does"""
+
+    def __init__(self, *args, prompt_cache: Optional[PromptCache] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prompt_cache = prompt_cache
+
+    async def request(self, messages, model_settings, model_request_parameters):
+        response, usage = await super().request(messages, model_settings, model_request_parameters)
+        if self.prompt_cache is not None:
+            usage.details = {"cached_tokens": self.prompt_cache.lookup(_request_text(messages))}
+        return response, usage
+
+def _output_args(output, info: AgentInfo) -> Dict:
+    # List outputs are wrapped in a {"response": [...]} object by pydantic-ai
+    return {"response": output} if isinstance(output, list) else output
+
+def stand_in_model(
+    respond, latency: SimulatedLatency = SimulatedLatency(), name: str = "stand-in", prompt_cache: Optional[PromptCache] = None
+) -> FunctionModel:
+    """Wrap a prompt -> output function as a FunctionModel with simulated latency and streaming
+
+    With a prompt_cache, non-streamed calls report the tokens it would serve.
+    """
+    async def function(messages: List[ModelMessage], info: AgentInfo) -> ModelResponse:
+        prompt = _last_prompt(messages)
+        args = _output_args(respond(prompt), info)
+        await asyncio.sleep(latency.delay(prompt, estimate_tokens(json.dumps(args))))
+        return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, args)], model_name=name)
+
+    async def stream_function(messages: List[ModelMessage], info: AgentInfo) -> AsyncIterator[Dict[int, DeltaToolCall]]:
+        prompt = _last_prompt(messages)
+        payload = json.dumps(_output_args(respond(prompt), info))
+        chunks = [payload[i:i + 64] for i in range(0, len(payload), 64)]
+        delay = latency.delay(prompt, estimate_tokens(payload)) / max(len(chunks), 1)
+        for i, chunk in enumerate(chunks):
+            await asyncio.sleep(delay)
+            yield {0: DeltaToolCall(name=info.output_tools[0].name if i == 0 else None, json_args=chunk)}
+
+    return StandInModel(function, stream_function=stream_function, model_name=name, prompt_cache=prompt_cache)
+
+def _responders() -> Dict[str, Callable]:
+    """Stand-in responder of each review agent, by its system prompt"""
+    import agents
+
+    return {
+        agents.EXTRACTOR_SYSTEM_PROMPT: extract_clauses,
+        agents.POLICY_SYSTEM_PROMPT: check_policy,
+        agents.SUGGESTION_SYSTEM_PROMPT: suggest_improvements,
+        agents.ORCHESTRATOR_SYSTEM_PROMPT: summarize_review,
+        agents.NARRATOR_SYSTEM_PROMPT: summarize_review,
+    }
+
+def stand_in_provider(latency: SimulatedLatency = SimulatedLatency(), name: str = "stand-in-secondary") -> FunctionModel:
+    """One stand-in model for all four review agents, routed by system prompt, like a second provider"""
+    responders = _responders()
+
+    async def function(messages: List[ModelMessage], info: AgentInfo) -> ModelResponse:
+        system = "\n".join(
+            part.content
+            for message in messages if isinstance(message, ModelRequest)
+            for part in message.parts if part.part_kind == "system-prompt"
+        )
+        prompt = _last_prompt(messages)
+        args = _output_args(responders[system](prompt), info)
+        await asyncio.sleep(latency.delay(prompt, estimate_tokens(json.dumps(args))))
+        return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, args)], model_name=name)
+
+    return StandInModel(function, model_name=name)
+
+@contextmanager
+def _swap_model(agent, model):
+    previous = agent.model
+    agent.model = model
+    try:
+        yield
+    finally:
+        agent.model = previous
+
+@contextmanager
+def stand_in_agents(
+    latency: SimulatedLatency = SimulatedLatency(), prompt_cache: Optional[PromptCache] = None, flaky: Iterable[str] = (),
+):
+    """Run the four review agents on deterministic stand-ins for the duration of the block
+
+    The agents' default models are swapped rather than using Agent.override,
+    so a per-run `model=` (e.g. the cascade's small model) still takes effect.
+    Stages named in `flaky` ("extract", "policy", "suggest", "narrative") fail
+    their first call with each prompt.
+    """
+    import agents
+
+    with ExitStack() as stack:
+        for stage, agent, respond, name in (
+            ("extract", agents.get_extractor_agent(), extract_clauses, "stand-in-extractor"),
+            ("policy", agents.get_policy_agent(), check_policy, "stand-in-policy"),
+            ("suggest", agents.get_suggestion_agent(), suggest_improvements, "stand-in-suggestion"),
+            ("narrative", agents.get_narrator(), summarize_review, "stand-in-narrator"),
+        ):
+            if stage in flaky:
+                respond = fail_first(respond)
+            stack.enter_context(_swap_model(agent, stand_in_model(respond, latency, name, prompt_cache)))
+        yield
+
+class StandInEndpoint:
+    """OpenAI-compatible chat completions server backed by the stand-in responders
+
+    Serves POST /v1/chat/completions over keep-alive HTTP, so the real
+    OpenAI client stack runs against it. Calls are routed to a responder by
+    the agent's system prompt. Each new connection first costs
+    `connect_latency` seconds, standing in for the TCP and TLS handshakes
+    that a pooled client only pays once.
+    """
+
+    def __init__(
+        self, latency: SimulatedLatency = SimulatedLatency(), connect_latency: float = 0.0,
+        prompt_cache: Optional[PromptCache] = None,
+    ):
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.prompt_cache = prompt_cache
+        self.connections = 0
+        self.requests = 0
+        self._server = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the base URL to give OpenAIProvider"""
+        from service import serve_http
+
+        self._responders = _responders()
+        self._server = await serve_http(self.handle, host, port, on_connect=self._connect)
+        return f"http://{host}:{self._server.sockets[0].getsockname()[1]}/v1"
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _connect(self) -> None:
+        self.connections += 1
+        await asyncio.sleep(self.connect_latency)
+
+    async def handle(self, method: str, path: str, headers: Dict[str, str], body: bytes):
+        if method != "POST" or not path.endswith("/chat/completions"):
+            return 404, {"error": {"message": f"No route for {method} {path}"}}, {}
+        self.requests += 1
+        request = json.loads(body)
+        messages = request["messages"]
+        system = "\n".join(m["content"] for m in messages if m["role"] == "system")
+        prompt = next(m["content"] for m in reversed(messages) if m["role"] == "user")
+        respond = self._responders.get(system)
+        if respond is None:
+            return 400, {"error": {"message": "No stand-in responder for this system prompt"}}, {}
+        tools = [t["function"]["name"] for t in request.get("tools", [])]
+        tool_name = "final_result" if "final_result" in tools else tools[-1]
+        arguments = json.dumps(_output_args(respond(prompt), None))
+        output_tokens = estimate_tokens(arguments)
+        await asyncio.sleep(self.latency.delay(prompt, output_tokens))
+        prompt_tokens = estimate_tokens(system + prompt)
+        cached = self.prompt_cache.lookup(system + "\n" + prompt) if self.prompt_cache is not None else 0
+        return 200, {
+            "id": f"chatcmpl-{self.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request["model"],
+            "choices": [{
+                "index": 0,
+                "finish_reason": "tool_calls",
+                "message": {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [{
+                        "id": f"call-{self.requests}",
+                        "type": "function",
+                        "function": {"name": tool_name, "arguments": arguments},
+                    }],
+                },
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": output_tokens,
+                "total_tokens": prompt_tokens + output_tokens,
+                "prompt_tokens_details": {"cached_tokens": cached},
+            },
+        }, {}
+
+def extract_metadata(contract_text: str) -> ContractMetadata:
+    """Deterministic ContractMetadata with the bold-named parties of the contract"""
+    return ContractMetadata(parties=[Party(name=name.strip()) for name in PARTY_PATTERN.findall(contract_text)])
+
+class StandInChatModel:
+    """Stand-in for ChatOpenAI / ChatGoogleGenerativeAI in `prompt | llm.with_structured_output(...)` chains"""
+
+    def __init__(self, model_name: str = "stand-in-chat", latency: SimulatedLatency = SimulatedLatency()):
+        self.model_name = model_name
+        self.latency = latency
+
+    def with_structured_output(self, schema, **kwargs):
+        from langchain_core.runnables import RunnableLambda
+
+        # ContractMetadata itself or a subset of its fields, as built by metadata.partial_metadata_model
+        fields = list(getattr(schema, "model_fields", {}))
+        if not fields or any(name not in ContractMetadata.model_fields for name in fields):
+            raise NotImplementedError(f"No stand-in output for {schema!r}")
+
+        def respond(prompt_value):
+            text = prompt_value.to_string()
+            metadata = extract_metadata(text)
+            output = metadata if schema is ContractMetadata else schema(**{name: getattr(metadata, name) for name in fields})
+            return output, self.latency.delay(text, estimate_tokens(output.model_dump_json()))
+
+        def invoke(prompt_value):
+            output, delay = respond(prompt_value)
+            time.sleep(delay)
+            return output
+
+        async def ainvoke(prompt_value):
+            output, delay = respond(prompt_value)
+            await asyncio.sleep(delay)
+            return output
+
+        return RunnableLambda(invoke, afunc=ainvoke)
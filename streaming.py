@@ -0,0 +1,266 @@
+import asyncio
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
+
+from agents import (
+    ClauseExtraction,
+    ClauseSuggestion,
+    ContractReviewDeps,
+    FinalReview,
+    PolicyMatch,
+    SYSTEM_PROMPTS,
+    build_policy_prompt,
+    build_review_results,
+    build_suggestion_prompt,
+    get_extractor_agent,
+    get_policy_agent,
+    get_suggestion_agent,
+    order_matches,
+    prescreen_clauses,
+    run_extraction_stage,
+    run_final_stage,
+    run_policy_stage,
+    select_policy_context,
+)
+from cache import CachedResult, agent_cache_key
+from instrumentation import stage_timer
+
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
+
+# Events yielded by stream_contract_review. `elapsed` is seconds since the review started.
+@dataclass
+class ReviewEvent:
+    elapsed: float
+
+@dataclass
+class StageStarted(ReviewEvent):
+    stage: str
+
+@dataclass
+class ClauseExtracted(ReviewEvent):
+    clause: ClauseExtraction
+
+@dataclass
+class PolicyChecked(ReviewEvent):
+    match: PolicyMatch
+
+@dataclass
+class SuggestionGenerated(ReviewEvent):
+    suggestion: ClauseSuggestion
+
+@dataclass
+class ItemRetracted(ReviewEvent):
+    """A clause, match or suggestion from an earlier event that the validated agent output replaced"""
+    item: Any
+
+@dataclass
+class ReviewCompleted(ReviewEvent):
+    final_report: FinalReview
+    results: Dict
+    time_to_first_clause: Optional[float] = None
+
+@dataclass
+class Retracted:
+    """An item stream_agent_items yielded earlier that the validated output does not contain"""
+    item: Any
+
+def collect(items: List, item) -> None:
+    """Apply an item from stream_agent_items to the list of items so far"""
+    if isinstance(item, Retracted):
+        items.remove(item.item)
+    else:
+        items.append(item)
+
+def _advance(emitted: List, items: List, final: bool = False) -> List:
+    """Bring the yielded items in line with `items`: Retracted for those that differ, then the new ones
+
+    A partial output shorter than what was yielded only retracts items that
+    changed; the final output also retracts items it no longer contains.
+    """
+    agreed = 0
+    while agreed < min(len(emitted), len(items)) and emitted[agreed] == items[agreed]:
+        agreed += 1
+    if not final and agreed == len(items):
+        return []
+    changes = [Retracted(item) for item in emitted[agreed:]] + list(items[agreed:])
+    emitted[agreed:] = items[agreed:]
+    return changes
+
+async def stream_agent_items(agent: "Agent", prompt: str, deps: ContractReviewDeps, stage: str) -> AsyncIterator:
+    """Yield the items of a list-typed agent output as soon as each one is complete
+
+    While the response streams in, every item except the last is usually
+    final, so it is yielded immediately; the last is yielded once the
+    output has been validated. If a later partial or the validated output
+    differs from the items already yielded (e.g. an output validator
+    reordered them), those items are withdrawn with a Retracted before the
+    changed ones follow.
+    The agent is called, and cache hits, the deps' limiter and metrics are
+    handled, as in run_agent.
+    """
+    queued_at = time.perf_counter()
+    model = deps.models.get(agent.name)
+    key = None
+    if deps.cache is not None:
+        key = agent_cache_key(agent, SYSTEM_PROMPTS[agent.name], prompt, model)
+        output = await asyncio.to_thread(deps.cache.get_output, key, agent.output_type)
+        if output is not None:
+            if deps.metrics is not None:
+                deps.metrics.record_run(stage, agent, CachedResult(output), wall_time=time.perf_counter() - queued_at, model=model)
+            for item in output:
+                yield item
+            return
+
+    async with deps.limiter or nullcontext():
+        started_at = time.perf_counter()
+        async with agent.run_stream(prompt, model=model) as result:
+            emitted = []
+            async for partial in result.stream(debounce_by=None):
+                for item in _advance(emitted, partial[:-1]):
+                    yield item
+            output = await result.get_output()
+    for item in _advance(emitted, output, final=True):
+        yield item
+
+    if deps.metrics is not None:
+        deps.metrics.record_run(
+            stage, agent, result,
+            wall_time=time.perf_counter() - started_at,
+            queue_time=started_at - queued_at,
+            model=model,
+        )
+
+    if key is not None:
+        await asyncio.to_thread(deps.cache.set_output, key, output, agent.output_type)
+
+async def _stream_clauses(deps: ContractReviewDeps, chunk_size, max_concurrency) -> AsyncIterator[ClauseExtraction]:
+    if chunk_size and len(deps.contract_text) > chunk_size:
+        # Chunked extraction deduplicates across chunks, so clauses are only final once all chunks finish
+        for clause in await run_extraction_stage(deps, chunk_size=chunk_size, max_concurrency=max_concurrency):
+            yield clause
+        return
+
+    clauses = []
+    prompt = f"Extract the key clauses from this NDA contract:\n\n{deps.contract_text}"
+    async for clause in stream_agent_items(get_extractor_agent(), prompt, deps, stage="extract"):
+        collect(clauses, clause)
+        yield clause
+    deps.extracted_clauses = clauses
+
+async def _stream_policy_matches(deps: ContractReviewDeps, per_clause, max_concurrency) -> AsyncIterator[PolicyMatch]:
+    if deps.cascade is not None:
+        # Escalation can replace any small-model verdict, so matches are only final after both passes
+        for match in await run_policy_stage(deps, per_clause=per_clause, max_concurrency=max_concurrency):
+            yield match
+        return
+
+    clauses = deps.extracted_clauses
+    matches: List[PolicyMatch] = []
+    if deps.prescreen:
+        # Rule verdicts are certain, so they are yielded before any model call
+        with stage_timer(deps.metrics, "prescreen"):
+            matches, clauses = prescreen_clauses(deps, clauses)
+        for match in matches:
+            yield match
+
+    if clauses and not per_clause:
+        prompt = build_policy_prompt(clauses, select_policy_context(deps, clauses))
+        async for match in stream_agent_items(get_policy_agent(), prompt, deps, stage="policy"):
+            collect(matches, match)
+            yield match
+    elif clauses:
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def check_clause(clause: ClauseExtraction):
+            prompt = build_policy_prompt([clause], select_policy_context(deps, [clause]))
+            clause_matches = []
+            async with semaphore:
+                async for match in stream_agent_items(get_policy_agent(), prompt, deps, stage="policy"):
+                    collect(clause_matches, match)
+            return [m.model_copy(update={"clause_name": clause.clause_name}) for m in clause_matches]
+
+        # Yield in completion order; matches are put back in clause order below like run_policy_stage
+        for next_done in asyncio.as_completed([check_clause(c) for c in clauses]):
+            for match in await next_done:
+                matches.append(match)
+                yield match
+    deps.policy_matches = order_matches(deps.extracted_clauses, matches) if deps.prescreen or per_clause else matches
+
+def _event(elapsed: float, item, event_type) -> ReviewEvent:
+    return ItemRetracted(elapsed, item.item) if isinstance(item, Retracted) else event_type(elapsed, item)
+
+async def stream_contract_review(
+    contract_text,
+    policy_text,
+    per_clause_policy=False,
+    max_concurrency=8,
+    cache=None,
+    chunk_size=None,
+    policy_top_k=None,
+    metrics=None,
+    cascade=None,
+    prescreen=False,
+) -> AsyncIterator[ReviewEvent]:
+    """Run the multi-agent review, yielding typed events as results are produced
+
+    Yields a StageStarted event before each stage, each ClauseExtraction,
+    PolicyMatch and ClauseSuggestion as soon as it is complete, an
+    ItemRetracted for any of those the validated agent output replaced, and finally
+    a ReviewCompleted event with the FinalReview and the same results dict
+    review_contract_with_agents returns.
+
+    Args:
+        contract_text: The contract text to analyze
+        policy_text: The policy text to compare against
+        per_clause_policy: Check each clause against policy in its own concurrent call
+        max_concurrency: Maximum number of concurrent per-clause or per-chunk calls
+        cache: Optional LLMCache used to serve repeated agent calls
+        chunk_size: Extract clauses from section-aligned chunks of this many characters
+        policy_top_k: Send only the top-k retrieved policy sections per clause
+        metrics: Optional ReviewMetrics that records every agent call; stage wall
+            times include the time the consumer spends handling each event
+        cascade: Optional CascadeConfig to check policy on a small model first
+        prescreen: Resolve mechanically checkable clauses with policy rules first
+    """
+    start = time.perf_counter()
+
+    def elapsed() -> float:
+        return time.perf_counter() - start
+
+    time_to_first_clause = None
+    deps = ContractReviewDeps(
+        contract_text=contract_text, policy_text=policy_text, cache=cache,
+        policy_top_k=policy_top_k, metrics=metrics, cascade=cascade, prescreen=prescreen,
+    )
+
+    yield StageStarted(elapsed(), "extract")
+    with stage_timer(metrics, "extract"):
+        async for clause in _stream_clauses(deps, chunk_size, max_concurrency):
+            if time_to_first_clause is None and not isinstance(clause, Retracted):
+                time_to_first_clause = elapsed()
+            yield _event(elapsed(), clause, ClauseExtracted)
+
+    yield StageStarted(elapsed(), "policy")
+    with stage_timer(metrics, "policy"):
+        async for match in _stream_policy_matches(deps, per_clause_policy, max_concurrency):
+            yield _event(elapsed(), match, PolicyChecked)
+
+    yield StageStarted(elapsed(), "suggest")
+    suggestions = []
+    with stage_timer(metrics, "suggest"):
+        prompt = build_suggestion_prompt(deps)
+        if prompt is not None:
+            async for suggestion in stream_agent_items(get_suggestion_agent(), prompt, deps, stage="suggest"):
+                collect(suggestions, suggestion)
+                yield _event(elapsed(), suggestion, SuggestionGenerated)
+    deps.clause_suggestions = suggestions
+
+    yield StageStarted(elapsed(), "final")
+    with stage_timer(metrics, "final"):
+        final_report = await run_final_stage(deps)
+    yield ReviewCompleted(
+        elapsed(), final_report, build_review_results(deps, final_report), time_to_first_clause
+    )
@@ -0,0 +1,409 @@
+"""Synthetic NDA corpus generator for load, scaling and accuracy tests
+
+Contracts are assembled from the clause structures of data/sample_nda.md and
+data/complex_nda.md: each policy topic (definition, term, termination,
+return of materials, non-use, personal data, governing law, remedies and
+contract value) has compliant and deliberately non-compliant variants
+relative to data/nda_policy.md, mixed with boilerplate sections. Every
+contract comes with its ground truth, so benchmarks can score accuracy as
+well as speed:
+
+    python synthetic.py corpus/ --count 1000 --non-compliant 0.3 --target-length 20000
+    python batch.py corpus/ --output results.jsonl
+"""
+import argparse
+import json
+import random
+import re
+import sys
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+NUMBER_WORDS = {
+    1: "one", 2: "two", 3: "three", 4: "four", 5: "five", 6: "six", 7: "seven",
+    10: "ten", 15: "fifteen", 30: "thirty", 60: "sixty", 90: "ninety",
+}
+
+COMPANIES = [
+    ("ACME CORPORATION", "a corporation organized and existing under the laws of Delaware", "123 Main Street, San Francisco, CA 94105"),
+    ("TECH INNOVATIONS INC.", "a corporation organized and existing under the laws of California", "456 Innovation Way, Palo Alto, CA 94301"),
+    ("QUANTUM DYNAMICS GLOBAL, LTD.", "an entity organized under the laws of Ireland", "Innovation Park, Block C, Dublin, D02 X285, Ireland"),
+    ("NORTHWIND ANALYTICS LLC", "a limited liability company organized under the laws of New York", "88 Hudson Yards, New York, NY 10001"),
+    ("BLUEFJORD SYSTEMS AB", "a company organized under the laws of Sweden", "Kungsgatan 12, 111 43 Stockholm, Sweden"),
+    ("HELIX BIOSCIENCES GMBH", "a company organized under the laws of Germany", "Leopoldstrasse 40, 80802 Munich, Germany"),
+    ("SUMMIT LEGAL TECHNOLOGIES CORP.", "a corporation organized and existing under the laws of Texas", "500 Congress Avenue, Austin, TX 78701"),
+    ("ORION DATA SERVICES PTE. LTD.", "a company organized under the laws of Singapore", "1 Raffles Place, Singapore 048616"),
+]
+
+PURPOSES = [
+    "artificial intelligence solutions for legal document processing",
+    "a potential joint venture focused on developing legal intelligence systems",
+    "the integration of predictive analytics into contract management software",
+    "a potential acquisition of certain software assets",
+    "a pilot deployment of document automation services",
+]
+
+@dataclass
+class ClauseVariant:
+    """One way of drafting a policy topic, as sub-clause templates"""
+    clauses: List[str]
+    compliant: bool
+    # Values the variant puts into the contract, recorded in the ground truth
+    facts: Dict = field(default_factory=dict)
+
+@dataclass
+class Topic:
+    """A policy-relevant contract section with its compliant and non-compliant drafts"""
+    key: str
+    titles: List[str]
+    policy_section: int
+    compliant: List[ClauseVariant]
+    non_compliant: List[ClauseVariant]
+
+def _years(n: int) -> str:
+    return f"{NUMBER_WORDS[n]} ({n}) years"
+
+def _days(n: int) -> str:
+    return f"{NUMBER_WORDS[n]} ({n}) days"
+
+TOPICS = [
+    Topic("definition", ["DEFINITIONS", "CONFIDENTIAL INFORMATION"], 2, [
+        ClauseVariant([
+            '"Confidential Information" means any and all non-public information, in whatever form or medium, disclosed or otherwise made available by one Party to the other Party, whether orally, in writing, electronically or by any other means, regardless of whether it is marked as "confidential" or "proprietary".',
+            "Confidential Information shall not include any information that: (i) is or becomes publicly available through no fault of the receiving Party; (ii) was rightfully in the receiving Party's possession prior to disclosure; (iii) is rightfully obtained from a third party without restriction; or (iv) is independently developed without use of or reference to the disclosing Party's Confidential Information.",
+        ], True),
+    ], [
+        ClauseVariant([
+            '"Confidential Information" means only information that is clearly marked as "Confidential" at the time of disclosure. Information disclosed orally shall not be Confidential Information.',
+        ], False, {"issue": "marking required, oral disclosures excluded"}),
+        ClauseVariant([
+            '"Confidential Information" means the technical specifications listed in Schedule A and no other information.',
+        ], False, {"issue": "narrow definition"}),
+    ]),
+    Topic("term", ["TERM", "TERM OF AGREEMENT"], 3, [
+        ClauseVariant([
+            "The term of this Agreement shall commence on the Effective Date and continue for a period of {term}, unless earlier terminated as provided herein.",
+            "The obligations of confidentiality and non-use under this Agreement shall survive any termination of this Agreement and shall continue for a period of five (5) years from the date of disclosure of the Confidential Information.",
+        ], True),
+    ], [
+        ClauseVariant([
+            "This Agreement shall commence on the Effective Date and shall continue in effect for a period of {long_term}.",
+            "The obligations of confidentiality shall continue in perpetuity.",
+        ], False, {"issue": "term too long, perpetual obligations"}),
+        ClauseVariant([
+            "The term of this Agreement shall commence on the Effective Date and continue for a period of {term}.",
+            "All obligations under this Agreement shall cease upon its expiration or termination.",
+        ], False, {"issue": "no survival of confidentiality obligations"}),
+    ]),
+    Topic("termination", ["TERMINATION"], 4, [
+        ClauseVariant([
+            "Either Party may terminate this Agreement upon {notice} prior written notice to the other Party.",
+            "The obligations of confidentiality set forth herein shall survive termination of this Agreement for the survival period defined in this Agreement.",
+        ], True),
+    ], [
+        ClauseVariant([
+            "Either Party may terminate this Agreement immediately upon oral notice to the other Party.",
+        ], False, {"issue": "no written notice period", "notice_days": 0}),
+        ClauseVariant([
+            "Either Party may terminate this Agreement upon {short_notice} notice to the other Party.",
+        ], False, {"issue": "notice period below 15 days"}),
+    ]),
+    Topic("return", ["RETURN OF MATERIALS", "RETURN OR DESTRUCTION OF INFORMATION"], 5, [
+        ClauseVariant([
+            "Upon termination of this Agreement or upon the disclosing Party's written request, the receiving Party shall promptly return or destroy all Confidential Information, including all copies, notes and extracts thereof, and shall certify such destruction in writing within thirty (30) days if requested.",
+            "Notwithstanding the foregoing, the receiving Party may retain one copy of Confidential Information solely as required by applicable law or regulation, subject to the confidentiality obligations of this Agreement.",
+        ], True),
+    ], [
+        ClauseVariant([
+            "The receiving Party may retain copies of Confidential Information for its records indefinitely and shall have no obligation to return or destroy such information.",
+        ], False, {"issue": "no return or destruction obligation"}),
+    ]),
+    Topic("non_use", ["NON-DISCLOSURE AND NON-USE", "OBLIGATIONS OF NON-DISCLOSURE AND NON-USE"], 6, [
+        ClauseVariant([
+            "Each Party agrees not to use any Confidential Information of the other Party for any purpose except to evaluate and engage in discussions concerning the Purpose.",
+            "Neither Party shall reverse engineer, disassemble, or decompile any software, prototypes or other tangible objects which embody the other Party's Confidential Information.",
+            "Each Party shall protect the other Party's Confidential Information using at least the same degree of care it uses to protect its own confidential information, but in no case less than reasonable care.",
+        ], True),
+    ], [
+        ClauseVariant([
+            "The receiving Party may use Confidential Information for any purpose, including use in the development, manufacture and sale of its own products and services.",
+        ], False, {"issue": "use not limited to the Purpose"}),
+        ClauseVariant([
+            "Notwithstanding the restrictions in this Agreement, the receiving Party may use Residual Knowledge retained in the unaided memory of its personnel for any purpose.",
+        ], False, {"issue": "residuals clause"}),
+    ]),
+    Topic("personal_data", ["PERSONAL DATA PROTECTION", "PERSONAL DATA PROCESSING"], 7, [
+        ClauseVariant([
+            "In the event that Confidential Information includes personal data as defined under applicable data protection laws, including without limitation the European General Data Protection Regulation (GDPR) and the California Consumer Privacy Act (CCPA), each Party shall comply with all applicable data protection laws and regulations when processing such personal data.",
+            "Neither Party shall process any personal data contained in the other Party's Confidential Information for any purpose other than the Purpose of this Agreement.",
+        ], True, {"personal_data": True}),
+    ], [
+        ClauseVariant([
+            "The receiving Party may process any personal data included in the Confidential Information for its own lawful business purposes.",
+        ], False, {"issue": "processing beyond the Purpose", "personal_data": True}),
+    ]),
+    Topic("governing_law", ["GOVERNING LAW AND JURISDICTION", "GOVERNING LAW"], 8, [
+        ClauseVariant([
+            "This Agreement shall be governed by and construed in accordance with the laws of the State of California, without regard to its conflicts of law principles. The Parties hereby consent to the exclusive jurisdiction of the state and federal courts located in San Francisco County, California for any dispute arising out of this Agreement.",
+        ], True, {"governing_law": "California"}),
+    ], [
+        ClauseVariant([
+            "This Agreement shall be governed by and construed in accordance with the laws of England and Wales. Any dispute arising out of or relating to this Agreement shall be finally resolved by arbitration in London under the Rules of Arbitration of the International Chamber of Commerce.",
+        ], False, {"issue": "foreign law and arbitration", "governing_law": "England and Wales"}),
+        ClauseVariant([
+            "This Agreement shall be governed by the laws of the State of New York, and the Parties submit to the non-exclusive jurisdiction of the courts of New York County.",
+        ], False, {"issue": "non-preferred law, non-exclusive jurisdiction", "governing_law": "New York"}),
+    ]),
+    Topic("remedies", ["REMEDIES"], 9, [
+        ClauseVariant([
+            "Each Party acknowledges that unauthorized use or disclosure of Confidential Information would cause irreparable harm for which monetary damages would be an inadequate remedy. Accordingly, the disclosing Party shall be entitled to seek injunctive relief without the necessity of proving actual damages or posting bond.",
+        ], True),
+    ], [
+        ClauseVariant([
+            "The disclosing Party's sole and exclusive remedy for any breach of this Agreement shall be monetary damages, which shall not exceed {cap}.",
+        ], False, {"issue": "damages cap, no injunctive relief"}),
+    ]),
+    Topic("contract_value", ["CONTRACT VALUE"], 10, [
+        ClauseVariant([
+            "The Parties acknowledge that this Agreement has no monetary value and no payment shall be made by either Party to the other Party in consideration for entering into this Agreement.",
+        ], True, {"contract_value": 0}),
+        ClauseVariant([
+            "In consideration of the mutual covenants herein, each Party shall pay the other the nominal sum of one US dollar ($1).",
+        ], True, {"contract_value": 1}),
+    ], [
+        ClauseVariant([
+            "In consideration of the mutual covenants contained herein, the second Party agrees to pay the first Party the sum of {fee} upon execution of this Agreement.",
+        ], False, {"issue": "payment beyond nominal consideration"}),
+    ]),
+]
+
+BOILERPLATE = {
+    "NO LICENSE": "Nothing in this Agreement is intended to grant any rights to either Party under any patent, copyright, trade secret or other intellectual property right, except the limited right to use Confidential Information for the Purpose.",
+    "NO WARRANTY": 'ALL CONFIDENTIAL INFORMATION IS PROVIDED "AS IS." NEITHER PARTY MAKES ANY WARRANTY, EXPRESS OR IMPLIED, REGARDING THE ACCURACY OR COMPLETENESS OF ANY CONFIDENTIAL INFORMATION.',
+    "ASSIGNMENT": "Neither Party may assign or transfer this Agreement without the prior written consent of the other Party, except to a successor in connection with a merger, acquisition or sale of all or substantially all of its assets.",
+    "SEVERABILITY": "If any provision of this Agreement is held to be invalid, illegal or unenforceable, the validity, legality and enforceability of the remaining provisions shall not in any way be affected or impaired.",
+    "NOTICES": "All notices under this Agreement shall be in writing and delivered by hand, by courier, by email with confirmation of receipt, or by registered mail to the addresses set forth in the preamble.",
+    "EXPORT CONTROL": "Neither Party shall export or re-export any Confidential Information in violation of applicable export control laws or regulations.",
+    "WAIVER": "No failure or delay by either Party in exercising any right under this Agreement shall operate as a waiver of such right.",
+    "COUNTERPARTS": "This Agreement may be executed in counterparts, each of which shall be deemed an original. Electronic signatures shall be deemed original signatures for all purposes.",
+    "ENTIRE AGREEMENT": "This Agreement constitutes the entire agreement between the Parties with respect to the subject matter hereof and supersedes all prior or contemporaneous agreements concerning such subject matter.",
+}
+
+@dataclass
+class ExpectedClause:
+    """Ground truth for one policy-relevant section of a synthetic contract"""
+    topic: str
+    title: str
+    section_reference: str
+    policy_section: int
+    compliant: bool
+    issue: Optional[str] = None
+
+@dataclass
+class SyntheticContract:
+    """A generated contract with its ground truth"""
+    contract_id: str
+    text: str
+    clauses: List[ExpectedClause]
+    parties: List[str]
+    effective_date: str
+    metadata: Dict = field(default_factory=dict)
+
+    @property
+    def non_compliant(self) -> List[ExpectedClause]:
+        return [c for c in self.clauses if not c.compliant]
+
+    def ground_truth(self) -> Dict:
+        """JSON-serializable ground truth, without the contract text"""
+        truth = asdict(self)
+        truth.pop("text")
+        return truth
+
+def _fill(template: str, values: Dict) -> str:
+    return template.format(**values) if "{" in template else template
+
+def _preamble(rng: random.Random, parties, effective_date: date, purpose: str) -> str:
+    names = []
+    for name, organization, address in parties:
+        names.append(f"**{name}**, {organization}, with its principal place of business at {address}")
+    when = f"{effective_date:%B} {effective_date.day}, {effective_date.year}"
+    kind = rng.choice(["MUTUAL NON-DISCLOSURE AGREEMENT", "MUTUAL CONFIDENTIALITY AND NON-DISCLOSURE AGREEMENT"])
+    return (
+        f"# {kind}\n\n"
+        f'THIS {kind} (the "Agreement") is made and entered into as of {when} (the "Effective Date") by and between:\n\n'
+        + "\n\nand\n\n".join(names)
+        + '\n\n(each a "Party" and collectively the "Parties").\n\n'
+        f"## 1. PURPOSE\n\nThe Parties wish to explore a potential business relationship concerning {purpose} (the \"Purpose\")."
+    )
+
+def _signatures(parties, effective_date: date) -> str:
+    blocks = [
+        f"**{name}**\n\nBy: ___________________________\nName: Authorized Signatory\nDate: {effective_date:%B} {effective_date.day}, {effective_date.year}"
+        for name, _, _ in parties
+    ]
+    return "IN WITNESS WHEREOF, the Parties have executed this Agreement as of the Effective Date.\n\n" + "\n\n".join(blocks)
+
+def _section(number: int, title: str, clauses: List[str]) -> str:
+    if len(clauses) == 1:
+        return f"## {number}. {title}\n\n{clauses[0]}"
+    body = "\n\n".join(f"**{number}.{i}** {text}" for i, text in enumerate(clauses, 1))
+    return f"## {number}. {title}\n\n{body}"
+
+def generate_contract(
+    contract_id: str,
+    seed: int = 0,
+    sections: int = 12,
+    non_compliant_rate: float = 0.3,
+    target_length: Optional[int] = None,
+) -> SyntheticContract:
+    """Generate one contract; the same arguments always give the same contract
+
+    Args:
+        contract_id: Identifier recorded in the ground truth
+        seed: Random seed for this contract
+        sections: Number of numbered sections, including the purpose section.
+            Policy topics are included first, so fewer than 10 sections
+            samples a subset of them; boilerplate fills the rest up to the
+            size of the BOILERPLATE pool
+        non_compliant_rate: Probability that each policy topic uses a non-compliant variant
+        target_length: Pad the general provisions with boilerplate until the
+            contract has at least this many characters
+    """
+    rng = random.Random(seed)
+    parties = rng.sample(COMPANIES, 2)
+    effective_date = date(2024, 1, 1) + timedelta(days=rng.randrange(730))
+    values = {
+        "term": _years(rng.choice([2, 3])),
+        "long_term": _years(rng.choice([7, 10])),
+        "notice": _days(30),
+        "short_notice": _days(rng.choice([1, 5, 7, 10])),
+        "cap": rng.choice(["ten thousand US dollars ($10,000)", "one thousand Euros (€1,000)", "the fees paid hereunder"]),
+        "fee": rng.choice(["one thousand Euros (€1,000)", "five thousand US dollars ($5,000)", "twenty-five thousand US dollars ($25,000)"]),
+    }
+
+    topics = list(TOPICS)
+    if sections - 1 < len(topics):
+        topics = sorted(rng.sample(topics, max(sections - 1, 0)), key=TOPICS.index)
+    else:
+        # Definitions stay first, the remaining topics are shuffled like real drafting orders vary
+        rest = topics[1:]
+        rng.shuffle(rest)
+        topics = topics[:1] + rest
+    fillers = rng.sample(list(BOILERPLATE), min(max(sections - 1 - len(topics), 0), len(BOILERPLATE)))
+
+    parts = [_preamble(rng, parties, effective_date, rng.choice(PURPOSES))]
+    expected = []
+    metadata: Dict = {"term_years": None, "notice_days": None, "personal_data": False}
+    number = 1
+    for topic in topics:
+        number += 1
+        compliant = rng.random() >= non_compliant_rate
+        variant = rng.choice(topic.compliant if compliant else topic.non_compliant)
+        title = rng.choice(topic.titles)
+        clauses = [_fill(text, values) for text in variant.clauses]
+        parts.append(_section(number, title, clauses))
+        text = " ".join(clauses)
+        expected.append(ExpectedClause(
+            topic=topic.key, title=title, section_reference=str(number),
+            policy_section=topic.policy_section, compliant=compliant, issue=variant.facts.get("issue"),
+        ))
+        metadata.update({k: v for k, v in variant.facts.items() if k != "issue"})
+        if topic.key == "term":
+            metadata["term_years"] = int(re.search(r"\((\d+)\) years", text).group(1))
+        if topic.key == "termination" and "notice_days" not in variant.facts:
+            metadata["notice_days"] = int(re.search(r"\((\d+)\) days", text).group(1))
+
+    for title in fillers:
+        number += 1
+        parts.append(_section(number, title, [BOILERPLATE[title]]))
+
+    contract_text = "\n\n".join(parts)
+    if target_length and len(contract_text) < target_length:
+        number += 1
+        padding, pool = [], list(BOILERPLATE.values())
+        while len(contract_text) + sum(len(p) + 12 for p in padding) < target_length:
+            padding.append(pool[len(padding) % len(pool)])
+        contract_text += "\n\n" + _section(number, "GENERAL PROVISIONS", padding)
+
+    return SyntheticContract(
+        contract_id=contract_id,
+        text=contract_text + "\n\n" + _signatures(parties, effective_date),
+        clauses=expected,
+        parties=[name for name, _, _ in parties],
+        effective_date=effective_date.isoformat(),
+        metadata=metadata,
+    )
+
+def generate_corpus(count: int, seed: int = 0, **options) -> Iterator[SyntheticContract]:
+    """Lazily generate `count` contracts; options are passed to generate_contract"""
+    for i in range(count):
+        yield generate_contract(f"synthetic-{i:05d}", seed=seed * 1_000_003 + i, **options)
+
+def write_corpus(directory, contracts) -> int:
+    """Write each contract as <contract_id>.md and all ground truth to ground_truth.jsonl"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with open(directory / "ground_truth.jsonl", "w") as truth:
+        for contract in contracts:
+            (directory / f"{contract.contract_id}.md").write_text(contract.text)
+            truth.write(json.dumps(contract.ground_truth()) + "\n")
+            written += 1
+    return written
+
+def load_ground_truth(path) -> Dict[str, Dict]:
+    """Read ground_truth.jsonl into a dict keyed by contract file name (as used for batch job ids)"""
+    with open(path) as f:
+        return {f"{t['contract_id']}.md": t for t in map(json.loads, f)}
+
+def _section_number(reference: str) -> Optional[str]:
+    match = re.match(r"\D*(\d+)", reference or "")
+    return match.group(1) if match else None
+
+def evaluate_review(review: Dict, contract: SyntheticContract) -> Dict:
+    """Score a review results dict against a contract's ground truth
+
+    Clauses and policy matches are aligned with the expected clauses by
+    section number. Returns the share of expected policy topics that were
+    extracted (recall) and, of those, the share whose compliance verdict
+    matches the ground truth (accuracy).
+    """
+    clauses = {c.clause_name: _section_number(c.section_reference) for c in review["extracted_clauses"]}
+    verdicts = {}
+    for match in review["policy_matches"]:
+        section = clauses.get(match.clause_name)
+        if section is not None:
+            # A section is non-compliant if any clause extracted from it is
+            verdicts[section] = verdicts.get(section, True) and match.compliant
+
+    found = [c for c in contract.clauses if c.section_reference in verdicts]
+    correct = [c for c in found if verdicts[c.section_reference] == c.compliant]
+    flagged = [c for c in contract.non_compliant if verdicts.get(c.section_reference) is False]
+    return {
+        "expected": len(contract.clauses),
+        "recall": len(found) / len(contract.clauses) if contract.clauses else 1.0,
+        "accuracy": len(correct) / len(found) if found else 0.0,
+        "non_compliant_detected": len(flagged) / len(contract.non_compliant) if contract.non_compliant else 1.0,
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic NDA corpus with ground truth")
+    parser.add_argument("directory", help="Directory to write the contracts and ground_truth.jsonl to")
+    parser.add_argument("--count", type=int, default=100, help="Number of contracts")
+    parser.add_argument("--seed", type=int, default=0, help="Corpus random seed")
+    parser.add_argument("--sections", type=int, default=12, help="Numbered sections per contract")
+    parser.add_argument("--non-compliant", type=float, default=0.3, help="Share of non-compliant policy clauses")
+    parser.add_argument("--target-length", type=int, help="Minimum contract length in characters")
+    args = parser.parse_args(argv)
+
+    written = write_corpus(args.directory, generate_corpus(
+        args.count, seed=args.seed, sections=args.sections,
+        non_compliant_rate=args.non_compliant, target_length=args.target_length,
+    ))
+    print(f"Wrote {written} contracts to {args.directory}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import os
+
+# Provider clients are built against local stand-ins, but still require a key to be set
+os.environ.setdefault("OPENAI_API_KEY", "stand-in")
+os.environ.setdefault("GEMINI_API_KEY", "stand-in")
@@ -0,0 +1,35 @@
+import json
+from pathlib import Path
+
+from benchmarks import BenchmarkResult, compare, main
+from stand_ins import SimulatedLatency
+
+def test_simulated_latency_is_deterministic():
+    latency = SimulatedLatency(base=0.1, per_output_token=0.001, jitter=0.05, tail_rate=0.5)
+    delays = [latency.delay(f"prompt {i}", 100) for i in range(20)]
+    assert delays == [latency.delay(f"prompt {i}", 100) for i in range(20)]
+    assert all(0.15 <= d <= 0.25 or 1.5 <= d <= 2.5 for d in delays)
+    assert delays != [SimulatedLatency(0.1, 0.001, 0.05, 0.5, seed=1).delay(f"prompt {i}", 100) for i in range(20)]
+
+def test_compare_flags_regressions_beyond_the_tolerance():
+    results = [BenchmarkResult("fast", 1, 0.11, 0.11), BenchmarkResult("slow", 1, 0.2, 0.2), BenchmarkResult("new", 1, 1.0, 1.0)]
+    baseline = {"fast": {"median": 0.1}, "slow": {"median": 0.1}}
+    assert compare(results, baseline, tolerance=0.25) == ["slow: 0.2000s vs baseline 0.1000s"]
+
+def test_suite_runs_offline(tmp_path, monkeypatch):
+    # The sample contracts and the default policy are paths relative to the repository
+    monkeypatch.chdir(Path(__file__).parent.parent)
+    output = tmp_path / "results.json"
+    argv = [
+        "--runs", "1", "--latency", "0.005", "--small-latency", "0.002", "--contracts", "4", "--store-contracts", "20",
+        "--concurrency", "1", "4", "--connect-latency", "0.01", "--json", str(output),
+    ]
+    assert main(argv) == 0
+    results = json.loads(output.read_text())
+    assert {"overhead data/complex_nda.md", "latency sample x5", "cascade data/sample_nda.md", "throughput c=4", "service warm"} <= set(results)
+    assert results["overhead data/sample_nda.md"]["extra"]["agent_calls"] == 3
+    assert results["throughput c=4"]["extra"]["recall"] == 1.0
+    # Checkpoints make the retry after a failed suggestion call resume instead of starting over
+    calls = results["resume after failure"]["extra"]["calls_per_contract"]
+    assert (calls["extract"], calls["policy"], calls["suggest"]) == (1.0, 1.0, 1.0)
+    assert results["service warm"]["extra"]["connections"] < results["service cold"]["extra"]["connections"]
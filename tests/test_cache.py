@@ -0,0 +1,75 @@
+import asyncio
+from pathlib import Path
+from typing import List
+
+import pytest
+
+import agents
+from agents import ContractReviewDeps, PolicyMatch, run_agent
+from cache import LLMCache, agent_cache_key
+from instrumentation import ReviewMetrics
+from stand_ins import stand_in_agents
+
+POLICY = (Path(__file__).parent.parent / "data" / "nda_policy.md").read_text()
+CONTRACT = (Path(__file__).parent.parent / "data" / "sample_nda.md").read_text()
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = LLMCache(tmp_path / "cache.sqlite", max_entries=2)
+    yield cache
+    cache.close()
+
+def test_hits_misses_and_typed_outputs(cache):
+    match = PolicyMatch(clause_name="Term", policy_alignment=80, policy_reference="3", issues=[], compliant=True)
+    assert cache.get_output("key", List[PolicyMatch]) is None
+    cache.set_output("key", [match], List[PolicyMatch])
+    assert cache.get_output("key", List[PolicyMatch]) == [match]
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.writes) == (1, 1, 1)
+
+def test_least_recently_used_entry_is_evicted(cache):
+    cache.set("a", "1")
+    cache.set("b", "2")
+    # The hit's access time is buffered, but still counts when the next write evicts
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("1", "3")
+    assert cache.stats.evictions == 1
+
+def test_access_times_survive_reopening(tmp_path):
+    cache = LLMCache(tmp_path / "cache.sqlite", max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.close()
+    cache = LLMCache(tmp_path / "cache.sqlite", max_entries=2)
+    cache.set("c", "3")
+    assert (cache.get("a"), cache.get("b")) == ("1", None)
+    cache.close()
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = LLMCache(tmp_path / "cache.sqlite", ttl=-1)
+    cache.set("a", "1")
+    assert cache.get("a") is None and cache.stats.expirations == 1
+    cache.close()
+
+def test_agent_key_follows_system_prompt_and_model():
+    agent = agents.get_policy_agent()
+    key = agent_cache_key(agent, agents.POLICY_SYSTEM_PROMPT, "prompt")
+    assert key == agent_cache_key(agent, agents.POLICY_SYSTEM_PROMPT, "prompt")
+    assert key != agent_cache_key(agent, agents.POLICY_SYSTEM_PROMPT + " Be strict.", "prompt")
+    assert key != agent_cache_key(agent, agents.POLICY_SYSTEM_PROMPT, "prompt", model="openai:gpt-4.1-mini")
+
+def test_repeated_agent_call_is_served_from_cache(cache):
+    async def call():
+        deps = ContractReviewDeps(contract_text=CONTRACT, policy_text=POLICY, cache=cache, metrics=ReviewMetrics())
+        prompt = f"Extract the key clauses from this NDA contract:\n\n{CONTRACT}"
+        result = await run_agent(agents.get_extractor_agent(), prompt, deps, stage="extract")
+        return result, deps.metrics.records[0]
+
+    with stand_in_agents():
+        live, live_record = asyncio.run(call())
+        cached, cached_record = asyncio.run(call())
+    assert cached.output == live.output
+    assert not live_record.cached and cached_record.cached
+    assert (cache.stats.hits, cache.stats.writes) == (1, 1)
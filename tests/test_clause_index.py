@@ -0,0 +1,59 @@
+import pytest
+
+from agents import ClauseSuggestion, PolicyMatch
+from clause_index import ClauseIndex, ClauseIndexStats
+
+GOVERNING_LAW = (
+    "This Agreement and any dispute arising out of or in connection with it shall be governed by and construed in accordance "
+    "with the laws of the State of California, without regard to its conflict of laws principles. Each Party irrevocably submits "
+    "to the exclusive jurisdiction of the state and federal courts located in San Francisco, California for the resolution of any "
+    "such dispute, and waives any objection to venue in those courts."
+)
+COMPLIANT = [PolicyMatch(
+    clause_name="Governing Law", policy_alignment=90, policy_reference="9. Governing Law", issues=[], compliant=True,
+)]
+
+@pytest.fixture
+def index():
+    index = ClauseIndex(":memory:")
+    index.add("policy", GOVERNING_LAW, COMPLIANT)
+    yield index
+    index.close()
+
+def lookup(index, text, stats=None):
+    return index.lookup("policy", text, PolicyMatch, ClauseSuggestion, stats)
+
+@pytest.mark.parametrize("text", [
+    GOVERNING_LAW.replace("exclusive jurisdiction", "**exclusive jurisdiction**").replace(". ", ".\n\n"),
+    GOVERNING_LAW.replace("waives any objection to venue in those courts", "waives any objection to the venue of such courts"),
+])
+def test_near_identical_clause_reuses_verdict(index, text):
+    stats = ClauseIndexStats()
+    verdict = lookup(index, text, stats)
+    assert verdict is not None and verdict.matches == COMPLIANT
+    assert verdict.similarity >= index.threshold
+    assert (stats.lookups, stats.hits) == (1, 1)
+
+@pytest.mark.parametrize("text", [
+    # Other jurisdiction and venue
+    GOVERNING_LAW.replace("California", "Delaware").replace("San Francisco", "Wilmington"),
+    # Negated submission to jurisdiction
+    GOVERNING_LAW.replace("irrevocably submits", "does not submit"),
+    GOVERNING_LAW.replace("without regard to", "with regard to"),
+    # An added number
+    GOVERNING_LAW.replace("the State of California", "the State of California or two other states"),
+], ids=["jurisdiction", "negation", "dropped-negation", "numbers"])
+def test_clause_differing_in_substance_is_not_reused(index, text):
+    stats = ClauseIndexStats()
+    assert lookup(index, text, stats) is None
+    assert (stats.lookups, stats.hits) == (1, 0)
+
+def test_verdicts_are_per_policy(index):
+    assert index.lookup("other policy", GOVERNING_LAW, PolicyMatch, ClauseSuggestion) is None
+
+def test_clause_reviewed_again_is_stored_once(index):
+    index.add("policy", GOVERNING_LAW, COMPLIANT)
+    index.add("policy", "  " + GOVERNING_LAW.replace("State", "**State**"), COMPLIANT)
+    assert len(index) == 1
+    index.add("other policy", GOVERNING_LAW, COMPLIANT)
+    assert len(index) == 2
@@ -0,0 +1,91 @@
+import asyncio
+import time
+
+import pytest
+
+from agents import ContractReviewDeps, run_review_pipeline
+from hedging import HedgeConfig, HedgeStats, hedge, hedge_sync
+from stand_ins import SimulatedLatency, stand_in_agents, stand_in_provider
+from utils import load_markdown_file
+
+def _call(result, delay: float, calls: list, error: Exception = None):
+    async def call():
+        calls.append("started")
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            calls.append("cancelled")
+            raise
+        if error is not None:
+            raise error
+        calls.append("finished")
+        return result
+    return call
+
+def test_fast_primary_is_not_hedged():
+    primary, secondary = [], []
+    stats = HedgeStats()
+    result, secondary_won = asyncio.run(hedge(
+        _call("primary", 0.01, primary), _call("secondary", 0.01, secondary), HedgeConfig(initial_delay=0.2), "stage", stats,
+    ))
+    assert (result, secondary_won) == ("primary", False)
+    assert primary == ["started", "finished"] and secondary == []
+    assert (stats.calls, stats.hedged, stats.secondary_wins) == (1, 0, 0)
+
+def test_slow_primary_is_hedged_and_cancelled():
+    primary, secondary = [], []
+    stats = HedgeStats()
+    start = time.perf_counter()
+    result, secondary_won = asyncio.run(hedge(
+        _call("primary", 5.0, primary), _call("secondary", 0.01, secondary), HedgeConfig(initial_delay=0.05), "stage", stats,
+    ))
+    assert (result, secondary_won) == ("secondary", True)
+    assert time.perf_counter() - start < 1.0
+    assert primary == ["started", "cancelled"] and secondary == ["started", "finished"]
+    assert (stats.calls, stats.hedged, stats.secondary_wins) == (1, 1, 1)
+
+def test_failed_secondary_falls_back_to_slow_primary():
+    primary, secondary = [], []
+    result, secondary_won = asyncio.run(hedge(
+        _call("primary", 0.1, primary), _call("secondary", 0.0, secondary, RuntimeError("secondary down")),
+        HedgeConfig(initial_delay=0.05), "stage",
+    ))
+    assert (result, secondary_won) == ("primary", False)
+
+def test_error_is_raised_when_both_providers_fail():
+    with pytest.raises(RuntimeError, match="primary down"):
+        asyncio.run(hedge(
+            _call(None, 0.1, [], RuntimeError("primary down")), _call(None, 0.0, [], RuntimeError("secondary down")),
+            HedgeConfig(initial_delay=0.05), "stage",
+        ))
+
+def test_hedge_delay_follows_the_observed_percentile():
+    config = HedgeConfig(percentile=0.9, initial_delay=10.0, min_samples=10)
+    for latency in range(1, 10):
+        config.observe("stage", latency / 100)
+    assert config.delay("stage") == 10.0
+    config.observe("stage", 0.10)
+    assert config.delay("stage") == pytest.approx(0.10)
+
+def test_hedge_sync_returns_the_faster_secondary():
+    stats = HedgeStats()
+    result, secondary_won = hedge_sync(
+        lambda: time.sleep(1.0) or "primary", lambda: "secondary", HedgeConfig(initial_delay=0.05), "chain", stats,
+    )
+    assert (result, secondary_won) == ("secondary", True)
+    assert stats.secondary_wins == 1
+
+def test_review_agent_calls_are_hedged_on_the_stand_in_provider():
+    policy = load_markdown_file("data/nda_policy.md")
+    contract = load_markdown_file("data/sample_nda.md")
+    secondary = stand_in_provider(SimulatedLatency(0.0), "stand-in-secondary")
+    deps = ContractReviewDeps(
+        contract_text=contract, policy_text=policy,
+        hedge=HedgeConfig(secondary_model=secondary, initial_delay=0.05),
+    )
+    with stand_in_agents(SimulatedLatency(2.0)):
+        start = time.perf_counter()
+        results = asyncio.run(run_review_pipeline(deps))
+    assert time.perf_counter() - start < 2.0
+    assert results["hedge"].calls == results["hedge"].hedged == results["hedge"].secondary_wins == 3
+    assert results["policy_matches"]
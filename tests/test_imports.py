@@ -0,0 +1,8 @@
+from benchmarks import IMPORT_BUDGET, probe_import
+
+def test_pipeline_import_is_light_and_fast():
+    # Best of three cold imports, so one slow interpreter start does not fail the check
+    probes = [probe_import() for _ in range(3)]
+    assert all(not heavy for _, heavy in probes), f"importing the pipeline loads {probes[0][1]}"
+    elapsed = min(elapsed for elapsed, _ in probes)
+    assert elapsed < IMPORT_BUDGET, f"importing the pipeline takes {elapsed:.2f}s, over {IMPORT_BUDGET:.2f}s"
@@ -0,0 +1,62 @@
+import re
+from pathlib import Path
+
+import pytest
+
+from agents import review_contract_with_agents
+from incremental import diff_contracts, rereview_contract
+from instrumentation import ReviewMetrics
+from stand_ins import stand_in_agents
+
+POLICY = (Path(__file__).parent.parent / "data" / "nda_policy.md").read_text()
+CONTRACT = (Path(__file__).parent.parent / "data" / "sample_nda.md").read_text()
+NEW_SECTION = "## 2. Term\n\n2.1 The term of this Agreement shall be two (2) years.\n\n"
+
+def insert_section(contract: str) -> str:
+    """Insert NEW_SECTION as section 2 and renumber the sections and sub-clauses after it"""
+    def bump(match):
+        return f"{match.group(1)}{int(match.group(2)) + 1}{match.group(3)}" if int(match.group(2)) >= 2 else match.group(0)
+
+    renumbered = re.sub(r"(?m)^(## )(\d+)(\. )", bump, contract)
+    renumbered = re.sub(r"(?m)^()(\d+)(\.\d )", bump, renumbered)
+    second = re.search(r"(?m)^## 3\. ", renumbered).start()
+    return renumbered[:second] + NEW_SECTION + renumbered[second:]
+
+@pytest.fixture(scope="module")
+def previous():
+    with stand_in_agents():
+        return review_contract_with_agents(CONTRACT, POLICY, verbose=False)
+
+def test_renumbering_alone_is_not_a_change():
+    revised = insert_section(CONTRACT).replace(NEW_SECTION, "")
+    assert not diff_contracts(CONTRACT, revised).has_changes
+
+def test_unchanged_contract_reuses_the_previous_review(previous):
+    metrics = ReviewMetrics()
+    with stand_in_agents():
+        results = rereview_contract(CONTRACT, POLICY, CONTRACT, previous, metrics=metrics)
+    assert results["final_report"] == previous["final_report"]
+    assert results["incremental"].reused_clauses == len(previous["extracted_clauses"])
+    assert not metrics.records
+
+def test_inserted_section_reruns_only_its_clauses(previous):
+    metrics = ReviewMetrics()
+    with stand_in_agents():
+        results = rereview_contract(insert_section(CONTRACT), POLICY, CONTRACT, previous, metrics=metrics)
+    stats = results["incremental"]
+    assert stats.changed_sections == ["Term"] and not stats.removed_sections
+    assert (stats.reused_clauses, stats.rerun_clauses) == (len(previous["extracted_clauses"]), 1)
+    # One call per stage, on the new section only
+    assert [record.stage for record in metrics.records] == ["extract", "policy", "suggest"]
+
+    clauses = results["extracted_clauses"]
+    references = [clause.section_reference for clause in clauses]
+    # Document order, with the reused clauses pointing at their renumbered sections
+    assert references[:3] == ["1", "2.1", "3.1"] and clauses[1].clause_name == "Term"
+    old = {c.clause_name: c.section_reference for c in previous["extracted_clauses"]}
+    for clause in clauses[2:]:
+        assert int(re.match(r"\d+", clause.section_reference).group()) == int(re.match(r"\d+", old[clause.clause_name]).group()) + 1
+    # Names stay unique and matches follow the clause order
+    names = [clause.clause_name for clause in clauses]
+    assert len(set(names)) == len(names)
+    assert [match.clause_name for match in results["policy_matches"]] == names
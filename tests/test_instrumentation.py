@@ -0,0 +1,38 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+import agents
+from agents import ContractReviewDeps, run_agent
+from cache import LLMCache
+from instrumentation import ReviewMetrics, canonical_model
+from stand_ins import stand_in_agents
+
+CONTRACT = (Path(__file__).parent.parent / "data" / "sample_nda.md").read_text()
+
+@pytest.mark.parametrize("configured, responded, expected", [
+    ("openai:gpt-4.1", "gpt-4.1-2025-04-14", "openai:gpt-4.1"),
+    ("openai:gpt-4.1", None, "openai:gpt-4.1"),
+    ("openai:gpt-4.1-mini", "gpt-4.1-mini-2025-04-14", "openai:gpt-4.1-mini"),
+    ("google-gla:gemini-2.5-flash-preview-04-17", "gemini-2.5-flash-preview-04-17", "google-gla:gemini-2.5-flash-preview-04-17"),
+    ("gpt-4o", "gpt-4o-2024-08-06", "gpt-4o"),
+])
+def test_canonical_model(configured, responded, expected):
+    assert canonical_model(configured, responded) == expected
+
+def test_live_and_cached_calls_share_a_model_row(tmp_path):
+    cache = LLMCache(tmp_path / "cache.sqlite")
+    metrics = ReviewMetrics()
+
+    async def call():
+        deps = ContractReviewDeps(contract_text=CONTRACT, policy_text="", cache=cache, metrics=metrics)
+        await run_agent(agents.get_extractor_agent(), f"Extract the key clauses:\n\n{CONTRACT}", deps, stage="extract")
+
+    with stand_in_agents():
+        asyncio.run(call())
+        asyncio.run(call())
+    cache.close()
+    assert [r.cached for r in metrics.records] == [False, True]
+    (row,) = metrics.by_model().values()
+    assert row.calls == 2 and row.cache_hits == 1
@@ -0,0 +1,54 @@
+import re
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from deadlines import ContractDates, DeadlineIndex, normalize_dates, resolve_date
+from metadata import effective_date, extract_local_metadata, extract_metadata_hybrid
+from stand_ins import StandInChatModel
+
+CONTRACT = (Path(__file__).parent.parent / "data" / "sample_nda.md").read_text()
+
+def test_local_metadata():
+    local = extract_local_metadata(CONTRACT)
+    metadata = local.metadata
+    assert [party.name for party in metadata.parties] == ["ACME CORPORATION", "TECH INNOVATIONS INC."]
+    assert metadata.notice_date.date == "30 days prior written notice"
+    assert metadata.termination_date.date == "2028-05-15"
+    assert metadata.personal_data.processing == "Yes"
+    assert not local.unresolved()
+
+def test_only_unresolved_fields_go_to_the_llm():
+    assert extract_metadata_hybrid(CONTRACT, StandInChatModel()).llm_fields == []
+    without_value = re.sub(r"(?ms)^## 9\. CONTRACT VALUE.*?(?=^## )", "", CONTRACT)
+    hybrid = extract_metadata_hybrid(without_value, StandInChatModel())
+    assert hybrid.llm_fields == ["contract_value"] and hybrid.confidence["contract_value"] == 1.0
+
+@pytest.mark.parametrize("text, expected", [
+    ("2028-05-15", date(2028, 5, 15)),
+    ("May 15, 2028", date(2028, 5, 15)),
+    ("three (3) years after the Effective Date", date(2028, 5, 15)),
+    ("18 months from the Effective Date", date(2026, 11, 15)),
+    ("upon mutual agreement", None),
+])
+def test_resolve_date(text, expected):
+    assert resolve_date(text, date(2025, 5, 15)) == expected
+
+def test_notice_period_counts_back_from_termination():
+    dates = normalize_dates(extract_local_metadata(CONTRACT).metadata, effective_date(CONTRACT))
+    assert (dates.termination_date, dates.notice_days) == (date(2028, 5, 15), 30)
+    assert dates.notice_deadline == date(2028, 4, 15)
+
+def test_deadline_queries():
+    index = DeadlineIndex()
+    index.add("a", ContractDates(termination_date=date(2026, 3, 1), notice_days=30))
+    index.add("b", ContractDates(notice_date=date(2026, 1, 20)))
+    index.add("c", ContractDates(termination_date=date(2026, 2, 1)))
+    assert index.due_within(30, today=date(2026, 1, 15)) == [("b", date(2026, 1, 20)), ("a", date(2026, 1, 30))]
+    assert index.between(date(2026, 1, 1), date(2026, 12, 31), kind="termination") == [
+        ("c", date(2026, 2, 1)), ("a", date(2026, 3, 1)),
+    ]
+    # Adding a contract again replaces its dates
+    index.add("b", ContractDates(notice_date=date(2027, 1, 20)))
+    assert len(index) == 3 and index.due_within(30, today=date(2026, 1, 15)) == [("a", date(2026, 1, 30))]
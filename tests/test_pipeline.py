@@ -0,0 +1,82 @@
+import asyncio
+from pathlib import Path
+
+from pydantic_ai.messages import ModelResponse, ToolCallPart
+from pydantic_ai.models.function import FunctionModel
+
+from agents import ContractReviewDeps, FinalReview, review_contract_with_agents, run_review_pipeline
+from batch import review_contract
+from cascade import CascadeConfig
+from checkpoint import CheckpointStore
+from instrumentation import ReviewMetrics
+from stand_ins import check_policy, stand_in_agents, stand_in_model
+
+POLICY = (Path(__file__).parent.parent / "data" / "nda_policy.md").read_text()
+CONTRACT = (Path(__file__).parent.parent / "data" / "sample_nda.md").read_text()
+COMPLEX_CONTRACT = (Path(__file__).parent.parent / "data" / "complex_nda.md").read_text()
+
+def review(contract_text, **options):
+    pipeline = {name: options.pop(name) for name in ("per_clause_policy", "max_concurrency") if name in options}
+    deps = ContractReviewDeps(contract_text=contract_text, policy_text=POLICY, metrics=ReviewMetrics(), **options)
+    return deps, asyncio.run(run_review_pipeline(deps, **pipeline))
+
+def test_contract_without_clauses_gets_a_report():
+    deps = ContractReviewDeps(contract_text="Thank you for your letter of 3 March.", policy_text=POLICY)
+    with stand_in_agents():
+        results = asyncio.run(run_review_pipeline(deps))
+    assert results["extracted_clauses"] == [] and results["policy_matches"] == [] and results["clause_suggestions"] == []
+    report = results["final_report"]
+    assert report.overall_score == 0
+    assert report.key_issues == ["No clauses found that could be assessed against the policy"]
+
+def test_failed_narrative_does_not_fail_the_review(caplog):
+    with stand_in_agents(flaky=("narrative",)):
+        failed = review_contract_with_agents(CONTRACT, POLICY, verbose=False, narrative=True)
+        # The stand-in narrator only fails its first call with a prompt
+        finished = review_contract_with_agents(CONTRACT, POLICY, verbose=False, narrative=True)
+    assert failed["narrative"] is None and failed["final_report"].overall_score > 0
+    assert "Narrative review failed" in caplog.text
+    assert isinstance(finished["narrative"], FinalReview)
+
+def test_per_clause_checks_match_the_single_call_within_the_concurrency_limit():
+    in_flight = peak = 0
+
+    async def policy(messages, info):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        prompt = "\n".join(str(part.content) for part in messages[-1].parts if part.part_kind == "user-prompt")
+        return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, {"response": check_policy(prompt)})])
+
+    with stand_in_agents():
+        _, single = review(COMPLEX_CONTRACT)
+        deps, fanned_out = review(
+            COMPLEX_CONTRACT, per_clause_policy=True, max_concurrency=3, models={"policy_agent": FunctionModel(policy)},
+        )
+    assert fanned_out["policy_matches"] == single["policy_matches"]
+    assert [r.stage for r in deps.metrics.records].count("policy") == len(single["extracted_clauses"]) > 3
+    assert peak == 3
+
+def test_cascade_escalates_only_borderline_clauses():
+    cascade = CascadeConfig(small_model=stand_in_model(check_policy, name="stand-in-policy-small"))
+    with stand_in_agents():
+        deps, results = review(COMPLEX_CONTRACT, cascade=cascade)
+    borderline = [m for m in results["policy_matches"] if cascade.low <= m.policy_alignment < cascade.high]
+    stats = deps.cascade_stats
+    assert stats.clauses == len(results["policy_matches"])
+    assert stats.escalated == len(borderline) > 0 and stats.reasons == {"borderline": len(borderline)}
+    assert [r.stage for r in deps.metrics.records] == ["extract", "policy", "policy_escalation", "suggest"]
+
+def test_retry_resumes_from_the_failed_stage():
+    checkpoints = CheckpointStore(":memory:")
+    with stand_in_agents(flaky=("suggest",)):
+        failed = asyncio.run(review_contract("nda", CONTRACT, POLICY, max_retries=0, checkpoints=checkpoints))
+        resumed = asyncio.run(review_contract(
+            "nda", CONTRACT, POLICY, max_retries=0, checkpoints=checkpoints, collect_metrics=True,
+        ))
+    checkpoints.close()
+    assert not failed.ok and "transient failure" in failed.error
+    assert resumed.ok and resumed.review["resumed_stages"] == ["extract", "policy"]
+    assert [r.stage for r in resumed.metrics.records] == ["suggest"]
@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import pytest
+
+from prescreen import YEARS_PATTERN, get_policy_rules, parse_count, year_periods
+
+POLICY = (Path(__file__).parent.parent / "data" / "nda_policy.md").read_text()
+
+@pytest.fixture(scope="module")
+def rules():
+    return get_policy_rules(POLICY)
+
+@pytest.mark.parametrize("text, years", [("three (3) years", 3), ("3 years", 3), ("five years", 5), ("(7) calendar years", 7)])
+def test_years_pattern(text, years):
+    assert parse_count(YEARS_PATTERN.search(text)) == years
+
+def test_term_and_survival_in_one_sentence_are_told_apart():
+    text = "This Agreement shall remain in effect for two (2) years, and the obligations shall survive for five (5) years after termination."
+    assert year_periods(text) == ([2], [5], 0)
+
+@pytest.mark.parametrize("name, text", [
+    ("Term of Confidentiality", "The Receiving Party's obligations under this Agreement shall survive for seven (7) years from the date of disclosure."),
+    ("Term and Termination", "This Agreement shall continue until terminated by either Party. The obligations of confidentiality shall survive for six (6) years."),
+    # A count that is neither the term nor a survival period
+    ("Term", "The Receiving Party shall keep records of its disclosures for ten (10) years."),
+])
+def test_survival_or_unclear_periods_are_left_to_the_model(rules, name, text):
+    assert rules.evaluate(name, text) is None
+
+def test_term_and_survival_within_preferred_position(rules):
+    verdict = rules.evaluate("Term", (
+        "The term of this Agreement shall commence on the Effective Date and continue for a period of three (3) years. "
+        "The obligations of confidentiality shall survive any termination of this Agreement for five (5) years from the date of disclosure."
+    ))
+    assert verdict.compliant and verdict.rule == "term" and not verdict.issues
+
+@pytest.mark.parametrize("text, issue", [
+    ("This Agreement shall commence on the Effective Date and shall continue in effect for a period of seven (7) years.", "Term of 7 years"),
+    ("The term of this Agreement is three (3) years. Confidentiality obligations survive for one (1) year thereafter.", "Survival of 1 years"),
+    ("The obligations of confidentiality shall continue in perpetuity.", "Perpetual"),
+])
+def test_certain_deviations(rules, text, issue):
+    verdict = rules.evaluate("Term", text)
+    assert not verdict.compliant and verdict.issues[0].startswith(issue)
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import pytest
+
+from agents import ClauseSuggestion, PolicyMatch
+from policy import get_policy_index
+from report import aggregate_report, approval_requirements
+from retrieval import ContextSavings, get_policy_retriever
+
+POLICY = (Path(__file__).parent.parent / "data" / "nda_policy.md").read_text()
+
+@pytest.fixture(scope="module")
+def index():
+    return get_policy_index(POLICY)
+
+@pytest.mark.parametrize("reference, heading", [
+    ("3", "3. Term of Agreement"),
+    ("Section 3", "3. Term of Agreement"),
+    ("Term of Agreement", "3. Term of Agreement"),
+    ("3. Term of Agreement", "3. Term of Agreement"),
+    ("term clause", "3. Term of Agreement"),
+    ("Governing law", "8. Governing Law and Jurisdiction"),
+    ("Remedys", "9. Remedies"),
+])
+def test_policy_lookup(index, reference, heading):
+    assert index.lookup(reference).heading == heading
+
+@pytest.mark.parametrize("reference", ["", "Indemnity", "Section 42"])
+def test_unknown_references_do_not_resolve(index, reference):
+    assert index.lookup(reference) is None
+
+def test_risk_levels_and_approvals(index):
+    assert [index.get(n).risk_level for n in (2, 3, 4)] == ["High", "Medium", "Low"]
+    assert approval_requirements(index)["High"] == "Legal Department Head approval required"
+
+def test_score_is_weighted_by_risk(index):
+    matches = [
+        PolicyMatch(clause_name="Definitions", policy_alignment=40, policy_reference="Section 2", issues=["Too broad"], compliant=False),
+        PolicyMatch(clause_name="Termination", policy_alignment=100, policy_reference="Section 4", issues=[], compliant=True),
+        PolicyMatch(clause_name="Term", policy_alignment=60, policy_reference="3. Term of Agreement", issues=[], compliant=False),
+    ]
+    suggestions = [ClauseSuggestion(clause_name="Definitions", suggested_text="...", explanation="Narrow the definition", importance=8)]
+    report = aggregate_report(index, matches, suggestions)
+    # (40 * 3 + 100 * 1 + 60 * 2) / (3 + 1 + 2)
+    assert report.overall_score == 57
+    assert report.key_strengths == ["Termination complies with 4. Termination (100/100)"]
+    assert report.key_issues == [
+        "Definitions (High risk, 40/100): Too broad",
+        "Term (Medium risk, 60/100): does not comply with 3. Term of Agreement",
+    ]
+    assert report.recommendations[0] == "Revise Definitions: Narrow the definition"
+    assert report.recommendations[1].startswith("Align Term with 3. Term of Agreement: ")
+    assert report.recommendations[2] == "Legal Department Head approval required while High risk issues remain"
+
+def test_retrieval_selects_the_relevant_sections():
+    retriever = get_policy_retriever(POLICY)
+    assert retriever.search("The term of this Agreement is three years", top_k=1)[0][0].heading == "3. Term of Agreement"
+    selected = retriever.select(["Personal data shall be processed under the GDPR", "Return or destroy all materials"], top_k=1)
+    assert [s.heading for s in selected] == ["5. Return or Destruction of Information", "7. Personal Data Protection"]
+    savings = ContextSavings()
+    savings.record(POLICY, retriever.context(["Governing law and jurisdiction"], top_k=1))
+    assert 0 < savings.selected_tokens < savings.full_tokens and savings.calls == 1
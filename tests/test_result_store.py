@@ -0,0 +1,82 @@
+import pytest
+
+from agents import ClauseExtraction, ClauseSuggestion, FinalReview, PolicyMatch
+from result_store import ResultStore, contains, ge, gt, le, lt, one_of
+
+def review(*matches):
+    return {
+        "extracted_clauses": [
+            ClauseExtraction(clause_name=name, clause_text=f"{name} text", section_reference=str(i), importance=5)
+            for i, (name, _, _) in enumerate(matches)
+        ],
+        "policy_matches": [
+            PolicyMatch(clause_name=name, policy_alignment=alignment, policy_reference="3", issues=[] if compliant else ["Deviates"], compliant=compliant)
+            for name, alignment, compliant in matches
+        ],
+        "clause_suggestions": [
+            ClauseSuggestion(clause_name=name, suggested_text="New text", explanation="Align", importance=7)
+            for name, _, compliant in matches if not compliant
+        ],
+        "final_report": FinalReview(overall_score=60, key_strengths=[], key_issues=[], recommendations=[], summary="Summary"),
+    }
+
+@pytest.fixture
+def store():
+    store = ResultStore()
+    store.append("a", review(("Term", 40, False), ("Governing Law", 90, True)))
+    store.append("b", review(("Term of Confidentiality", 70, False), ("Remedies", 20, False)))
+    store.append("c", review(("Term", 95, True)))
+    return store
+
+@pytest.mark.parametrize("predicates, expected", [
+    ({"compliant": False}, [0, 2, 3]),
+    ({"compliant": False, "policy_alignment": lt(50)}, [0, 3]),
+    ({"policy_alignment": le(40)}, [0, 3]),
+    ({"policy_alignment": gt(90)}, [4]),
+    ({"policy_alignment": ge(90)}, [1, 4]),
+    ({"policy_alignment": 70}, [2]),
+    ({"policy_alignment": one_of(20, 95)}, [3, 4]),
+    ({"policy_alignment": lambda v: v % 20 == 0}, [0, 3]),
+    ({"clause_name": contains("term")}, [0, 2, 4]),
+    ({"clause_name": "Term", "compliant": True}, [4]),
+    ({"issues": contains("deviates"), "policy_alignment": lt(50)}, [0, 3]),
+])
+def test_select(store, predicates, expected):
+    assert store.select("policy_matches", **predicates) == expected
+
+def test_query_and_contracts(store):
+    rows = store.query("policy_matches", ["contract", "clause_name"], compliant=False, clause_name=contains("term"), policy_alignment=lt(50))
+    assert rows == [{"contract": "a", "clause_name": "Term"}]
+    assert store.contracts("suggestions", clause_name=contains("term")) == {"a", "b"}
+    assert store.count("clauses") == 5 and len(store) == 3
+
+def test_missing_numbers_never_satisfy_comparisons():
+    store = ResultStore()
+    store.append("a", review(("Term", 40, False)))
+    store.tables["reports"].columns["overall_score"].append(None)
+    store.tables["reports"].columns["contract"].append("b")
+    assert store.select("reports", overall_score=lt(100)) == [0]
+    assert store.select("reports", overall_score=None) == [1]
+
+def test_segments_round_trip(tmp_path, store):
+    store.path = tmp_path
+    store.flush()
+    store.append("d", review(("Remedies", 30, False)))
+    store.flush()
+    reloaded = ResultStore(tmp_path)
+    assert len(reloaded) == 4
+    assert reloaded.query("policy_matches", ["contract", "policy_alignment"], clause_name="Remedies") == [
+        {"contract": "b", "policy_alignment": 20}, {"contract": "d", "policy_alignment": 30},
+    ]
+
+def test_new_segment_after_a_gap_keeps_existing_ones(tmp_path, store):
+    store.path = tmp_path
+    store.flush()
+    store.append("d", review(("Remedies", 30, False)))
+    store.flush()
+    (tmp_path / "segment-000000.bin").unlink()
+    reloaded = ResultStore(tmp_path)
+    reloaded.append("e", review(("Term", 10, False)))
+    reloaded.flush()
+    assert sorted(f.name for f in tmp_path.iterdir()) == ["segment-000001.bin", "segment-000002.bin"]
+    assert ResultStore(tmp_path).contracts("reports") == {"d", "e"}
@@ -0,0 +1,40 @@
+import argparse
+from pathlib import Path
+
+import pytest
+
+from segmentation import MIN_CHUNK_SIZE, _split_paragraphs, chunk_contract, chunk_size, split_contract
+
+CONTRACT = (Path(__file__).parent.parent / "data" / "sample_nda.md").read_text()
+
+def test_chunk_size_option_reports_the_minimum():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunk-size", type=chunk_size)
+    assert parser.parse_args(["--chunk-size", "2000"]).chunk_size == 2000
+    with pytest.raises(argparse.ArgumentTypeError, match=f"at least {MIN_CHUNK_SIZE}"):
+        chunk_size("100")
+
+def test_long_paragraphs_wrap_between_words():
+    text = " ".join(f"word{i}" for i in range(200))
+    parts = _split_paragraphs(text, 100)
+    assert all(len(part) <= 100 for part in parts)
+    assert " ".join(parts) == text
+
+def test_word_longer_than_the_limit_is_cut():
+    assert _split_paragraphs("x" * 250, 100) == ["x" * 100, "x" * 100, "x" * 50]
+
+def test_chunks_keep_sections_whole_and_in_order():
+    sections = split_contract(CONTRACT)
+    chunks = chunk_contract(CONTRACT, max_chars=2000)
+    assert len(chunks) > 1 and all(len(chunk) <= 2000 for chunk in chunks)
+    joined = "\n\n".join(chunks)
+    positions = [joined.index(section.text) for section in sections]
+    assert positions == sorted(positions)
+
+def test_oversized_section_is_split_with_its_heading():
+    section = "## 5. Term\n\n" + "\n\n".join(f"5.{i} " + "The term continues. " * 20 for i in range(1, 8))
+    chunks = chunk_contract(section, max_chars=MIN_CHUNK_SIZE)
+    assert len(chunks) > 1
+    assert all(chunk.startswith("## 5. Term\n\n") and len(chunk) <= MIN_CHUNK_SIZE for chunk in chunks)
+    words = " ".join(chunk.removeprefix("## 5. Term\n\n") for chunk in chunks).split()
+    assert words == section.removeprefix("## 5. Term\n\n").split()
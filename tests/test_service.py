@@ -0,0 +1,109 @@
+import asyncio
+
+import httpx
+
+import agents
+from batch import review_contract
+from service import ReviewService, pooled_models, review_agent_models
+from stand_ins import SimulatedLatency, StandInEndpoint
+from utils import load_markdown_file
+
+POLICY = load_markdown_file("data/nda_policy.md")
+CONTRACT = load_markdown_file("data/sample_nda.md")
+
+async def _post_reviews(count: int, queue_size: int):
+    endpoint = StandInEndpoint(SimulatedLatency(0.2))
+    base_url = await endpoint.start()
+    try:
+        async with ReviewService(POLICY, concurrency=1, queue_size=queue_size, base_url=base_url) as service:
+            server = await service.serve("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60) as api:
+                posts = []
+                for i in range(count):
+                    posts.append(asyncio.create_task(api.post("/reviews", json={"contract_id": f"nda-{i}", "contract_text": CONTRACT})))
+                    # Let each request reach the queue before sending the next one
+                    await asyncio.sleep(0.05)
+                responses = await asyncio.gather(*posts)
+                health = (await api.get("/health")).json()
+            server.close()
+    finally:
+        await endpoint.close()
+    return responses, health, endpoint
+
+def test_service_reviews_over_the_stand_in_endpoint():
+    responses, health, endpoint = asyncio.run(_post_reviews(1, queue_size=4))
+    assert responses[0].status_code == 200
+    review = responses[0].json()
+    assert review["ok"] and review["job_id"] == "nda-0"
+    assert review["review"]["final_report"]["overall_score"] > 0
+    assert health["completed"] == 1 and health["rejected"] == 0
+    assert endpoint.requests == 3
+
+def test_service_rejects_with_503_when_the_queue_is_full():
+    # One contract in review, one waiting, the third finds the queue full
+    responses, health, _ = asyncio.run(_post_reviews(3, queue_size=1))
+    assert [r.status_code for r in responses] == [200, 200, 503]
+    assert responses[2].headers["Retry-After"] == "1"
+    assert "queue is full" in responses[2].json()["error"]
+    assert health["accepted"] == 2 and health["rejected"] == 1 and health["completed"] == 2
+
+async def _raw_request(port: int, data: bytes) -> bytes:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return response
+
+def test_malformed_request_gets_400():
+    async def run():
+        async with ReviewService(POLICY, concurrency=1) as service:
+            server = await service.serve("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            responses = [
+                await _raw_request(port, b"GARBAGE\r\n\r\n"),
+                await _raw_request(port, b"POST /reviews HTTP/1.1\r\nContent-Length: many\r\n\r\n"),
+            ]
+            server.close()
+        return responses
+
+    for response in asyncio.run(run()):
+        assert response.startswith(b"HTTP/1.1 400 Bad Request")
+        assert b"Connection: close" in response
+
+def test_warm_service_reuses_connections_and_cuts_latency():
+    """Without keep-alive every agent call pays the connect latency; the service pays it once"""
+    async def run():
+        endpoint = StandInEndpoint(SimulatedLatency(0.0), connect_latency=0.2)
+        base_url = await endpoint.start()
+        try:
+            async with httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=0), timeout=60) as client:
+                models = review_agent_models(pooled_models(client, base_url))
+                cold = [await review_contract(f"cold-{i}", CONTRACT, POLICY, models=models) for i in range(3)]
+            cold_connections = endpoint.connections
+            async with ReviewService(POLICY, concurrency=1, base_url=base_url) as service:
+                warm = [await service.review(f"warm-{i}", CONTRACT) for i in range(3)]
+            warm_connections = endpoint.connections - cold_connections
+        finally:
+            await endpoint.close()
+        return cold, cold_connections, warm, warm_connections
+
+    cold, cold_connections, warm, warm_connections = asyncio.run(run())
+    assert all(r.ok for r in cold + warm)
+    assert cold_connections == 9 and warm_connections == 1
+    assert max(r.elapsed for r in warm) < min(r.elapsed for r in cold)
+
+def test_service_leaves_the_shared_agents_untouched():
+    shared = [agents.get_extractor_agent(), agents.get_policy_agent(), agents.get_suggestion_agent(), agents.get_narrator()]
+    defaults = [agent.model for agent in shared]
+
+    async def run():
+        async with ReviewService(POLICY, concurrency=1, base_url="http://127.0.0.1:9/v1") as service:
+            # A batch or another service in the same process still sees the agents' own models
+            assert [agent.model for agent in shared] == defaults
+            return {name: str(model.client.base_url) for name, model in service.models.items()}
+
+    base_urls = asyncio.run(run())
+    assert set(base_urls) == {"extractor_agent", "policy_agent", "suggestion_agent", "narrator"}
+    assert all(url.startswith("http://127.0.0.1:9") for url in base_urls.values())
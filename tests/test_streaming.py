@@ -0,0 +1,64 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import List
+
+from pydantic_ai import Agent
+from pydantic_ai.models.function import DeltaToolCall, FunctionModel
+
+from agents import ClauseExtraction, ContractReviewDeps
+from stand_ins import stand_in_agents
+from streaming import (
+    ClauseExtracted, ItemRetracted, PolicyChecked, Retracted, ReviewCompleted, collect, stream_agent_items,
+    stream_contract_review,
+)
+
+POLICY = (Path(__file__).parent.parent / "data" / "nda_policy.md").read_text()
+CONTRACT = (Path(__file__).parent.parent / "data" / "sample_nda.md").read_text()
+
+def _clause(name: str, importance: int = 5) -> dict:
+    return {"clause_name": name, "clause_text": f"{name} text", "section_reference": "1", "importance": importance}
+
+def _streaming_agent(clauses: List[dict]) -> Agent:
+    async def stream(messages, info):
+        payload = json.dumps({"response": clauses})
+        for i in range(0, len(payload), 16):
+            yield {0: DeltaToolCall(name=info.output_tools[0].name if i == 0 else None, json_args=payload[i:i + 16])}
+
+    return Agent(FunctionModel(stream_function=stream), output_type=List[ClauseExtraction])
+
+async def _items(agent: Agent) -> list:
+    deps = ContractReviewDeps(contract_text="", policy_text="")
+    return [item async for item in stream_agent_items(agent, "Extract", deps, stage="extract")]
+
+def test_items_are_yielded_once_each():
+    items = asyncio.run(_items(_streaming_agent([_clause("Term"), _clause("Purpose"), _clause("Remedies")])))
+    assert [c.clause_name for c in items] == ["Term", "Purpose", "Remedies"]
+
+def test_items_changed_by_validation_are_retracted():
+    agent = _streaming_agent([_clause("Term", 3), _clause("Purpose", 9), _clause("Remedies", 10)])
+
+    @agent.output_validator
+    def most_important_first(output: List[ClauseExtraction]) -> List[ClauseExtraction]:
+        return sorted(output, key=lambda c: -c.importance)
+
+    items = asyncio.run(_items(agent))
+    # Purpose led the partial output, but the complete output starts with Remedies
+    assert [type(i).__name__ for i in items] == ["ClauseExtraction", "Retracted", "ClauseExtraction", "ClauseExtraction", "ClauseExtraction"]
+    assert items[0].clause_name == items[1].item.clause_name == "Purpose"
+    collected = []
+    for item in items:
+        collect(collected, item)
+    assert [c.clause_name for c in collected] == ["Remedies", "Purpose", "Term"]
+
+def test_streamed_events_agree_with_the_results():
+    async def run():
+        return [event async for event in stream_contract_review(CONTRACT, POLICY)]
+
+    with stand_in_agents():
+        events = asyncio.run(run())
+    completed = events[-1]
+    assert isinstance(completed, ReviewCompleted) and not any(isinstance(e, ItemRetracted) for e in events)
+    assert [e.clause for e in events if isinstance(e, ClauseExtracted)] == completed.results["extracted_clauses"]
+    assert [e.match for e in events if isinstance(e, PolicyChecked)] == completed.results["policy_matches"]
+    assert completed.time_to_first_clause < completed.elapsed